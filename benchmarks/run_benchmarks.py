@@ -0,0 +1,349 @@
+# benchmarks/run_benchmarks.py
+#
+# Запуск из корня репозитория:
+#   python -m benchmarks.run_benchmarks --scale night
+#   python -m benchmarks.run_benchmarks --scale season --repeat 5 --save
+#   python -m benchmarks.run_benchmarks --scale decade --save --results /tmp/bench.jsonl
+
+from __future__ import annotations
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.synthetic import SCALES, write_league
+from core.data_store import DataStore
+from core.export.export_dist import write_distributions
+from core.export.export_html import write_html
+from core.export.export_json import write_json
+from core.export.export_xlsx import stream_xlsx, write_xlsx
+from core.export.rows import build_export_table
+from core.fatigue_engine import ArenaDistanceMatrix
+from core.model.samplers import SAMPLERS
+from core.model.simulation import SimulationConfig, SimulationModel
+from core.profiling import PipelineProfiler
+from engine.backtest import _record_to_game, iter_backtest_days, load_backtest_schedule
+from engine.game_processor import GameProcessor
+from parsers.arenas_parser import load_arenas
+from parsers.pace_parser import load_team_pace
+from parsers.players_parser import load_player_impacts
+from parsers.standings_parser import load_standings
+from parsers.xpts_parser import load_team_xpts
+
+
+# История прогонов (в .gitignore): читается для сравнения всегда,
+# дописывается только с --save
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+
+# Минимальная длительность одного замера, сек (короткие операции
+# повторяются в цикле, как в timeit.autorange)
+MIN_SAMPLE_SEC = 0.2
+
+
+# ========================================
+# ЗАМЕРЫ
+# ========================================
+
+def _timeit(fn: Callable[[], Any], repeat: int) -> List[float]:
+    """Время одного вызова fn в каждом из repeat замеров, сек."""
+    started = time.perf_counter()
+    fn()  # прогрев
+    first = time.perf_counter() - started
+    number = max(1, int(MIN_SAMPLE_SEC / first) + 1) if first < MIN_SAMPLE_SEC else 1
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    return samples
+
+
+def _result(samples: List[float], items: int) -> Dict[str, Any]:
+    best = min(samples)
+    return {
+        "best_sec": round(best, 6),
+        "median_sec": round(statistics.median(samples), 6),
+        "items": items,
+        "ms_per_item": round(1000 * best / items, 4) if items else None,
+    }
+
+
+def _build_processor(paths: Dict[str, str], seed: int) -> GameProcessor:
+    store = DataStore({
+        "player_impacts": (paths["players.json"], load_player_impacts),
+        "team_pace": (paths["team_pace.json"], load_team_pace),
+        "standings": (paths["standings.json"], load_standings),
+        "team_xpts": (paths["team_xpts.json"], load_team_xpts),
+    })
+    processor = GameProcessor(SimulationConfig(seed=seed), store=store)
+    processor.fatigue.load_games(load_backtest_schedule(paths["games.jsonl"]),
+                                 ArenaDistanceMatrix(load_arenas(paths["arenas.json"])))
+    return processor
+
+
+def _sampler_efficiency(contexts: List[Any], seed: int, replications: int
+                        ) -> Dict[str, Dict[str, Any]]:
+    """
+    Снижение дисперсии по сэмплерам SimulationModel: каждый матч
+    симулируется replications раз с разными seed, дисперсия оценок
+    (победа, фора, тотал over) считается по повторам.
+
+    ess_gain — во сколько раз меньше симуляций нужно сэмплеру для той же
+    ошибки, что у "pseudo" (эквивалентный размер выборки / n).
+    """
+    def estimates(context) -> List[float]:
+        out = context.model_outputs
+        values = [out["mc_win_prob_home"]]
+        for key, dist in (("spread_line", "mc_diff_distribution"),
+                          ("total_line", "mc_total_distribution")):
+            line = context.features.get(key)
+            if line is not None:
+                values.append(float(out[dist].prob_over(line)))
+        return values
+
+    variances: Dict[str, float] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+    for kind in SAMPLERS:
+        samples: List[float] = []
+        runs: List[List[float]] = []
+        for r in range(replications):
+            model = SimulationModel(SimulationConfig(seed=seed + r, sampler=kind, keep_samples=False))
+            started = time.perf_counter()
+            for context in contexts:
+                model.process(context)
+            samples.append(time.perf_counter() - started)
+            runs.append([v for context in contexts for v in estimates(context)])
+
+        variances[kind] = float(np.var(np.asarray(runs), axis=0, ddof=1).mean())
+        results[f"sampler:{kind}"] = {
+            **_result(samples, len(contexts)),
+            "prob_se": round(math.sqrt(variances[kind]), 6),
+            "ess_gain": round(variances["pseudo"] / variances[kind], 2) if variances[kind] else None,
+        }
+    return results
+
+
+def run_benchmarks(scale: str = "night", seed: int = 0, repeat: int = 3,
+                   export_games: int = 300, work_dir: Optional[str] = None,
+                   sampler_games: int = 100, sampler_replications: int = 20) -> Dict[str, Any]:
+    """
+    Прогон всех бенчмарков на синтетической лиге масштаба scale.
+
+    Пайплайн:
+      GameProcessor.process        — по одному матчу
+      GameProcessor.process_batch  — слейтами по дням
+      module:<Имя>                 — каждый модуль (PipelineProfiler, лучший проход)
+    Экспорт (на первых export_games матчах):
+      build_export_table, write_json / write_html / write_xlsx,
+      stream_xlsx, write_distributions
+    Сэмплеры SimulationModel (на первых sampler_games матчах):
+      sampler:<вид> — время и ess_gain, см. _sampler_efficiency
+    """
+    work_dir = work_dir or os.path.join(tempfile.gettempdir(), "nba_benchmarks")
+    data_dir = os.path.join(work_dir, f"{scale}_{seed}")
+    paths = write_league(data_dir, scale, seed)
+
+    processor = _build_processor(paths, seed)
+    days = [[_record_to_game(r) for r in records]
+            for _, records in iter_backtest_days(paths["games.jsonl"])]
+    games = [game for day in days for game in day]
+    n_games = len(games)
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    # ---- ПАЙПЛАЙН ----
+    def process_each():
+        for game in games:
+            processor.process(game)
+
+    def process_batches():
+        for day in days:
+            processor.process_batch(day)
+
+    results["GameProcessor.process"] = _result(_timeit(process_each, repeat), n_games)
+    results["GameProcessor.process_batch"] = _result(_timeit(process_batches, repeat), n_games)
+
+    # ---- МОДУЛИ ----
+    best_stages: Dict[str, Any] = {}
+    for _ in range(repeat):
+        profiler = PipelineProfiler()
+        processor.pipeline.profiler = profiler
+        process_batches()
+        for name, stats in profiler.stages.items():
+            if name not in best_stages or stats.wall < best_stages[name].wall:
+                best_stages[name] = stats
+    processor.pipeline.profiler = None
+
+    for name, stats in best_stages.items():
+        results[f"module:{name}"] = _result([stats.wall], stats.items)
+
+    # ---- ЭКСПОРТ ----
+    export_days: List[List[Any]] = []
+    count = 0
+    for day in days:
+        if count >= export_games:
+            break
+        export_days.append(day[:export_games - count])
+        count += len(export_days[-1])
+    contexts = [c for day in export_days for c in processor.process_batch(day)]
+    n_export = len(contexts)
+
+    out_dir = os.path.join(work_dir, "exports")
+    os.makedirs(out_dir, exist_ok=True)
+    summary = build_export_table(contexts, profile="summary")
+    full = build_export_table(contexts, profile="full", sidecar="value.dist.bin")
+
+    exporters: Dict[str, Callable[[], Any]] = {
+        "build_export_table[summary]": lambda: build_export_table(contexts, profile="summary"),
+        "build_export_table[debug]": lambda: build_export_table(contexts, profile="debug"),
+        "write_json": lambda: write_json(summary, os.path.join(out_dir, "value.json")),
+        "write_html": lambda: write_html(summary, os.path.join(out_dir, "value.html")),
+        "write_xlsx": lambda: write_xlsx(summary, os.path.join(out_dir, "value.xlsx")),
+        "stream_xlsx": lambda: stream_xlsx(contexts, os.path.join(out_dir, "stream.xlsx")),
+        "write_distributions": lambda: write_distributions(full, os.path.join(out_dir, "value.dist.bin")),
+    }
+    for name, fn in exporters.items():
+        results[f"export:{name}"] = _result(_timeit(fn, repeat), n_export)
+
+    # ---- СНИЖЕНИЕ ДИСПЕРСИИ ----
+    # после экспорта: симуляция перезаписывает mc_* в контекстах
+    results.update(_sampler_efficiency(contexts[:sampler_games], seed, sampler_replications))
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        **_git_info(),
+        "scale": scale,
+        "seed": seed,
+        "repeat": repeat,
+        "games": n_games,
+        "export_games": n_export,
+        "machine": _machine_info(),
+        "results": results,
+    }
+
+
+# ========================================
+# ИСТОРИЯ РЕЗУЛЬТАТОВ
+# ========================================
+
+def _git_info() -> Dict[str, Any]:
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    try:
+        return {
+            "commit": git("rev-parse", "--short", "HEAD"),
+            "subject": git("log", "-1", "--format=%s"),
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        }
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "subject": None, "dirty": None}
+
+
+def _machine_info() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_results(path: str = RESULTS_FILE) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_result(record: Dict[str, Any], path: str = RESULTS_FILE):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def find_baseline(record: Dict[str, Any], history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Последний сохранённый прогон того же масштаба/seed с другого коммита."""
+    for old in reversed(history):
+        if (old.get("scale") == record["scale"] and old.get("seed") == record["seed"]
+                and old.get("commit") != record.get("commit")):
+            return old
+    return None
+
+
+def compare(record: Dict[str, Any], baseline: Optional[Dict[str, Any]],
+            threshold: float = 0.10) -> List[str]:
+    """Печатает таблицу результатов; возвращает бенчмарки, замедлившиеся больше threshold."""
+    regressions = []
+    title = f"Бенчмарки: {record['scale']}, {record['games']} матч(ей), коммит {record.get('commit')}"
+    if baseline is not None:
+        title += f" vs {baseline.get('commit')}"
+    print(title)
+
+    old_results = baseline["results"] if baseline else {}
+    for name, res in record["results"].items():
+        line = f"  {name:<40} {res['best_sec'] * 1000:10.2f} мс"
+        if res["ms_per_item"] is not None:
+            line += f"  {res['ms_per_item']:9.4f} мс/матч"
+        if res.get("ess_gain") is not None:
+            line += f"  ESS ×{res['ess_gain']:.1f}"
+        old = old_results.get(name)
+        if old and old.get("best_sec"):
+            change = res["best_sec"] / old["best_sec"] - 1.0
+            line += f"  {change:+7.1%}"
+            if change > threshold:
+                line += "  ⚠"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="NBA VALUE SYSTEM — бенчмарки пайплайна")
+    parser.add_argument("--scale", default="night", choices=tuple(SCALES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--export-games", type=int, default=300,
+                        help="сколько матчей выгружать в бенчмарках экспорта")
+    parser.add_argument("--sampler-games", type=int, default=100,
+                        help="сколько матчей в сравнении сэмплеров")
+    parser.add_argument("--sampler-reps", type=int, default=20,
+                        help="повторов с разными seed в сравнении сэмплеров")
+    parser.add_argument("--work-dir", default=None, help="папка для синтетических данных")
+    parser.add_argument("--results", default=RESULTS_FILE,
+                        help="файл истории прогонов (сравнение и --save)")
+    parser.add_argument("--save", action="store_true", help="дописать результат в историю")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="порог замедления относительно прошлого коммита")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    record = run_benchmarks(args.scale, args.seed, args.repeat, args.export_games, args.work_dir,
+                            args.sampler_games, args.sampler_reps)
+    baseline = find_baseline(record, load_results(args.results))
+    regressions = compare(record, baseline, args.threshold)
+
+    if args.save:
+        save_result(record, args.results)
+        print(f"Результат сохранён: {args.results}")
+
+    if regressions:
+        print(f"⚠ Замедление больше {args.threshold:.0%}: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+# benchmarks/synthetic.py
+
+from __future__ import annotations
+import json
+import math
+import os
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+from core.model_probabilities import normal_cdf
+from parsers.arenas_parser import load_arenas
+
+
+# Масштаб: (сезонов, матчей в сезоне)
+#   night  — один игровой день, играют все 30 команд
+#   season — регулярный сезон
+#   decade — десять сезонов подряд
+SCALES: Dict[str, Tuple[int, int]] = {
+    "night": (1, 15),
+    "season": (1, 1230),
+    "decade": (10, 1230),
+}
+
+PLAYERS_PER_TEAM = 8
+
+
+@dataclass
+class SyntheticConfig:
+    """
+    Параметры синтетической лиги.
+    - strength_sd: разброс силы команд, очков форы
+    - pace_mean / pace_sd: темп
+    - score_sd: разброс очков команды в матче
+    - vig: маржа букмекера
+    - injury_prob: вероятность травмы у команды в матче
+    """
+    strength_sd: float = 4.0
+    pace_mean: float = 99.0
+    pace_sd: float = 2.5
+    avg_points: float = 113.0
+    home_court: float = 2.5
+    score_sd: float = 11.0
+    vig: float = 0.045
+    injury_prob: float = 0.3
+    season_start: date = date(2015, 10, 27)
+
+
+class SyntheticLeague:
+    """
+    Синтетическая лига из 30 команд (коды — из data/arenas.json)
+    для бенчмарков: справочники в форматах data/*.json и датасет
+    сезонов в формате бэктеста (JSON Lines, см. iter_backtest_days)
+    с линиями на все рынки, включая командные тоталы и лестницы.
+
+    Всё детерминировано по seed.
+    """
+
+    def __init__(self, seed: int = 0, config: SyntheticConfig | None = None,
+                 arenas_path: str = "data/arenas.json"):
+        self.cfg = config or SyntheticConfig()
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.arenas = load_arenas(arenas_path)
+        self.teams: List[str] = sorted(self.arenas)
+
+        rng = self.rng
+        self.strength = {t: rng.gauss(0.0, self.cfg.strength_sd) for t in self.teams}
+        self.pace = {t: round(rng.gauss(self.cfg.pace_mean, self.cfg.pace_sd), 1) for t in self.teams}
+        self.players = {
+            t: {f"{t} Player {i + 1}": round(rng.uniform(0.3, 5.0) / (1 + 0.3 * i), 2)
+                for i in range(PLAYERS_PER_TEAM)}
+            for t in self.teams
+        }
+        # условное деление на конференции: восточное время — «Восток»
+        self.conference = {t: "east" if self.arenas[t]["utc_offset"] >= -5 else "west"
+                           for t in self.teams}
+
+    # -------------------------------------------------------
+    # Справочники
+    # -------------------------------------------------------
+
+    def team_xpts(self) -> Dict[str, Dict[str, float]]:
+        avg = self.cfg.avg_points
+        return {
+            t: {"off_xpts_per_game": round(avg + 0.6 * s, 1),
+                "def_xpts_per_game": round(avg - 0.4 * s, 1)}
+            for t, s in self.strength.items()
+        }
+
+    def standings(self, record: Dict[str, List[int]]) -> Dict[str, Dict[str, int]]:
+        """Таблица по текущим победам/поражениям, места — внутри конференции."""
+        table: Dict[str, Dict[str, int]] = {}
+        for conference in ("east", "west"):
+            teams = [t for t in self.teams if self.conference[t] == conference]
+            teams.sort(key=lambda t: (-(record[t][0] / max(1, sum(record[t]))), t))
+            for rank, t in enumerate(teams, start=1):
+                table[t] = {"conference_rank": rank, "wins": record[t][0], "losses": record[t][1]}
+        return table
+
+    # -------------------------------------------------------
+    # Линии
+    # -------------------------------------------------------
+
+    def _price(self, p: float) -> float:
+        # decimal odds с маржой; не ниже 1.01
+        return round(max(1.01, 1.0 / (min(max(p, 0.01), 0.99) * (1 + self.cfg.vig))), 2)
+
+    def _two_way(self, p_first: float) -> Tuple[float, float]:
+        return self._price(p_first), self._price(1.0 - p_first)
+
+    def odds(self, margin: float, total: float, noise: float = 0.0) -> Dict[str, Any]:
+        """Линии на все рынки вокруг ожидаемых margin (хозяева − гости) и total."""
+        rng = self.rng
+        margin += rng.gauss(0.0, noise)
+        total += rng.gauss(0.0, noise)
+        sd_diff = self.cfg.score_sd * 2 ** 0.5
+        sd_team = self.cfg.score_sd
+
+        # половинчатые линии — без возвратов;
+        # spread — порог по диффу (хозяева проходят, если margin > spread),
+        # в запись идёт фора хозяев, как у букмекера: −spread
+        spread = math.floor(margin) + 0.5
+        total_line = math.floor(total) + 0.5
+        home_tt = math.floor((total + margin) / 2) + 0.5
+        away_tt = math.floor((total - margin) / 2) + 0.5
+
+        home, away = self._two_way(normal_cdf(margin, 0, sd_diff))
+        entry: Dict[str, Any] = {"home": home, "away": away}
+
+        entry["spread_line"] = -spread
+        entry["spread_odds_home"], entry["spread_odds_away"] = \
+            self._two_way(1 - normal_cdf(spread, margin, sd_diff))
+        entry["total_line"] = total_line
+        entry["total_over_odds"], entry["total_under_odds"] = \
+            self._two_way(1 - normal_cdf(total_line, total, sd_diff))
+        entry["home_team_total"] = home_tt
+        entry["home_team_total_over_odds"], entry["home_team_total_under_odds"] = \
+            self._two_way(1 - normal_cdf(home_tt, (total + margin) / 2, sd_team))
+        entry["away_team_total"] = away_tt
+        entry["away_team_total_over_odds"], entry["away_team_total_under_odds"] = \
+            self._two_way(1 - normal_cdf(away_tt, (total - margin) / 2, sd_team))
+
+        steps = (-6, -3, 3, 6)
+        entry["alt_spreads"] = [
+            dict(zip(("home", "away"), self._two_way(1 - normal_cdf(spread + s, margin, sd_diff))),
+                 line=-(spread + s))
+            for s in steps
+        ]
+        entry["alt_totals"] = [
+            dict(zip(("over", "under"), self._two_way(1 - normal_cdf(total_line + s, total, sd_diff))),
+                 line=total_line + s)
+            for s in steps
+        ]
+        entry["alt_home_team_totals"] = [
+            dict(zip(("over", "under"),
+                     self._two_way(1 - normal_cdf(home_tt + s, (total + margin) / 2, sd_team))),
+                 line=home_tt + s)
+            for s in steps[1:3]
+        ]
+        entry["alt_away_team_totals"] = [
+            dict(zip(("over", "under"),
+                     self._two_way(1 - normal_cdf(away_tt + s, (total - margin) / 2, sd_team))),
+                 line=away_tt + s)
+            for s in steps[1:3]
+        ]
+        return entry
+
+    # -------------------------------------------------------
+    # Сезоны
+    # -------------------------------------------------------
+
+    def _injuries(self, team: str) -> List[str]:
+        if self.rng.random() >= self.cfg.injury_prob:
+            return []
+        return [self.rng.choice(list(self.players[team]))]
+
+    def iter_games(self, seasons: int = 1, games_per_season: int = 1230
+                   ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Dict[str, int]]]]:
+        """
+        Матчи в формате датасета бэктеста, по дате.
+        Вместе с матчем отдаётся таблица на утро дня матча.
+        """
+        rng = self.rng
+        cfg = self.cfg
+        game_no = 0
+
+        for season in range(seasons):
+            day = cfg.season_start.replace(year=cfg.season_start.year + season)
+            record = {t: [0, 0] for t in self.teams}
+            played = 0
+
+            while played < games_per_season:
+                n_games = min(games_per_season - played,
+                              len(self.teams) // 2 if games_per_season <= len(self.teams) // 2
+                              else rng.randint(4, 13))
+                teams = rng.sample(self.teams, 2 * n_games)
+                table = self.standings(record)
+                results = []
+
+                for home, away in zip(teams[::2], teams[1::2]):
+                    game_no += 1
+                    margin = self.strength[home] - self.strength[away] + cfg.home_court
+                    total = 2 * cfg.avg_points + (self.pace[home] + self.pace[away] - 2 * cfg.pace_mean)
+                    home_pts = round(rng.gauss((total + margin) / 2, cfg.score_sd))
+                    away_pts = round(rng.gauss((total - margin) / 2, cfg.score_sd))
+                    if home_pts == away_pts:
+                        home_pts += 1
+
+                    game = {
+                        "game_id": f"{season + 1:02d}{game_no:06d}",
+                        "date": day.isoformat(),
+                        "home": home,
+                        "away": away,
+                        "rating_home": round(1500 + 25 * self.strength[home], 1),
+                        "rating_away": round(1500 + 25 * self.strength[away], 1),
+                        "injuries_home": self._injuries(home),
+                        "injuries_away": self._injuries(away),
+                        "odds": self.odds(margin, total, noise=1.5),
+                        "closing_odds": self.odds(margin, total, noise=0.5),
+                        "home_pts": home_pts,
+                        "away_pts": away_pts,
+                    }
+                    results.append((home, away, home_pts > away_pts))
+                    yield game, table
+
+                for home, away, home_won in results:
+                    record[home][0 if home_won else 1] += 1
+                    record[away][1 if home_won else 0] += 1
+
+                played += n_games
+                day += timedelta(days=1)
+
+
+def write_league(out_dir: str, scale: str = "season", seed: int = 0,
+                 config: SyntheticConfig | None = None) -> Dict[str, str]:
+    """
+    Пишет синтетические данные масштаба scale в out_dir:
+      games.jsonl            — датасет бэктеста (матчи + линии + счёт)
+      schedule.json          — расписание (формат data/schedule.json)
+      standings_history.json — таблица на каждую игровую дату
+      standings.json, players.json, team_pace.json, team_xpts.json, arenas.json
+
+    Возвращает {имя: путь}.
+    """
+    if scale not in SCALES:
+        raise ValueError(f"write_league: unknown scale '{scale}'")
+    seasons, games_per_season = SCALES[scale]
+
+    league = SyntheticLeague(seed, config)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {
+        name: os.path.join(out_dir, name)
+        for name in ("games.jsonl", "schedule.json", "standings_history.json", "standings.json",
+                     "players.json", "team_pace.json", "team_xpts.json", "arenas.json")
+    }
+
+    schedule: List[Dict[str, str]] = []
+    history: Dict[str, Dict[str, Dict[str, int]]] = {}
+    with open(paths["games.jsonl"], "w", encoding="utf-8") as f:
+        for game, table in league.iter_games(seasons, games_per_season):
+            f.write(json.dumps(game, ensure_ascii=False) + "\n")
+            schedule.append({"date": game["date"], "home": game["home"], "away": game["away"]})
+            history.setdefault(game["date"], table)
+
+    last_table = history[max(history)]
+    for name, data in (
+        ("schedule.json", schedule),
+        ("standings_history.json", history),
+        ("standings.json", last_table),
+        ("players.json", league.players),
+        ("team_pace.json", league.pace),
+        ("team_xpts.json", league.team_xpts()),
+        ("arenas.json", league.arenas),
+    ):
+        with open(paths[name], "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    return paths
@@ -9,10 +9,68 @@ ODDS_API_REGION = "us"
 # Какие рынки запрашивать
 ODDS_API_MARKETS = ["h2h", "spreads", "totals"]
 
+# Спорт в The Odds API и контора (None — первая в ответе)
+ODDS_API_SPORT = "basketball_nba"
+ODDS_API_BOOKMAKER = None
+
+# === LIVE-ЛИНИИ (run_watch.py) ===
+
+# Источник: "file" — локальный raw_odds.json, "http" — The Odds API
+ODDS_SOURCE = "file"
+ODDS_FILE = "data/raw_odds.json"
+
+# Интервал опроса, сек (и максимальная пауза после ошибок)
+ODDS_POLL_INTERVAL = 15
+ODDS_BACKOFF_MAX = 120
+
+# История движения линий (append-only), None — не записывать
+ODDS_HISTORY_DIR = "data/odds_history"
+
+# Минимальный edge (%) для алерта
+EDGE_ALERT_PERCENT = 3.0
+
 # === ПАПКИ ДЛЯ ФАЙЛОВ ===
 
 DATA_FOLDER = "data"
 OUTPUT_FOLDER = "outputs"
 
+# Экспорт форматов: "thread" — параллельно в потоках, "serial" — по очереди,
+# "process" — по процессу на формат (только явно: копирует таблицу в каждый процесс)
+EXPORT_BACKEND = "thread"
+
+# Распределения в экспорте: "summary" — сводка (квантили + гистограмма),
+# "full" — сводка + полные гистограммы в outputs/value_today.dist.bin,
+# "debug" — сырые сэмплы inline
+EXPORT_PROFILE = "summary"
+
+# === МОДЕЛЬ ===
+
+# Сколько процессов использовать для обработки дня (1 — последовательно)
+WORKERS = 1
+
+# Seed симуляций (None — случайный, число — воспроизводимый прогон)
+SIMULATION_SEED = None
+
+# Метод симуляции: "sample" (Монте-Карло) или "analytic" (закрытая форма)
+SIMULATION_METHOD = "sample"
+
+# Дисковый кеш симуляций (работает только при заданном SIMULATION_SEED), None — выключен
+SIMULATION_CACHE_DIR = "cache/simulations"
+SIMULATION_CACHE_MAX_MB = 256
+
+# Адаптивное число симуляций: пачками, пока станд. ошибка вероятностей
+# победы/форы/тотала не станет <= SIMULATION_TARGET_SE (False — фиксированные 5000)
+SIMULATION_ADAPTIVE = False
+SIMULATION_TARGET_SE = 0.005
+
+# Сэмплер нормалей: "pseudo", "antithetic", "sobol", "halton"
+# (antithetic / QMC дают ту же ошибку меньшим числом симуляций)
+SIMULATION_SAMPLER = "pseudo"
+
+# Профилирование прогона: время/CPU по модулям -> outputs/profile_report.json
+PROFILE = False
+# + пик памяти по модулям (tracemalloc, заметно медленнее)
+PROFILE_MEMORY = False
+
 # Логирование (можно выключить)
 LOGGING = True
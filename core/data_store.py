@@ -0,0 +1,130 @@
+# core/data_store.py
+
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.profiling import PipelineProfiler, section
+from parsers.pace_parser import load_team_pace
+from parsers.players_parser import load_player_impacts
+from parsers.standings_parser import load_standings
+from parsers.xpts_parser import load_team_xpts
+
+
+# Источники по умолчанию: имя -> (путь, загрузчик)
+DEFAULT_SOURCES: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "player_impacts": ("data/players.json", load_player_impacts),
+    "team_pace": ("data/team_pace.json", load_team_pace),
+    "standings": ("data/standings.json", load_standings),
+    "team_xpts": ("data/team_xpts.json", load_team_xpts),
+}
+
+
+class DataStore:
+    """
+    Общее хранилище справочных данных для feature-модулей.
+
+    Каждый источник читается и парсится один раз, дальше отдаётся из кеша.
+    Кеш сбрасывается, если у файла поменялись mtime/размер
+    (проверка не чаще, чем раз в check_interval секунд).
+
+    Один экземпляр разделяется всеми модулями и GameProcessor'ами,
+    в воркеры процессов уходит вместе с уже загруженными данными.
+
+    profiler — замер загрузки каждого источника (этап "load:<имя>").
+    """
+
+    def __init__(self, sources: Optional[Dict[str, Tuple[str, Callable[[str], Any]]]] = None,
+                 check_interval: float = 1.0):
+        self.sources: Dict[str, Tuple[str, Callable[[str], Any]]] = dict(sources or DEFAULT_SOURCES)
+        self.check_interval = check_interval
+
+        # имя -> (сигнатура файла, данные)
+        self._cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        # имя -> время последней проверки файла (monotonic)
+        self._checked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.profiler: Optional[PipelineProfiler] = None
+
+    # -------------------------------------------------------
+
+    def register(self, name: str, path: str, loader: Callable[[str], Any]):
+        """Добавляет или переопределяет источник (например, другой путь)."""
+        with self._lock:
+            self.sources[name] = (path, loader)
+            self._cache.pop(name, None)
+            self._checked.pop(name, None)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Сбрасывает кеш одного источника или всех."""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+                self._checked.clear()
+            else:
+                self._cache.pop(name, None)
+                self._checked.pop(name, None)
+
+    # -------------------------------------------------------
+
+    @staticmethod
+    def _signature(path: str) -> Tuple[int, int]:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, name: str) -> Any:
+        """
+        Данные источника name. Файл перечитывается только если
+        он изменился с момента прошлой загрузки.
+        """
+        if name not in self.sources:
+            raise KeyError(f"DataStore: unknown source '{name}'")
+
+        now = time.monotonic()
+        cached = self._cache.get(name)
+        if cached is not None and now - self._checked.get(name, 0.0) < self.check_interval:
+            return cached[1]
+
+        with self._lock:
+            path, loader = self.sources[name]
+            signature = self._signature(path)
+            cached = self._cache.get(name)
+            if cached is None or cached[0] != signature:
+                with section(self.profiler, f"load:{name}"):
+                    cached = (signature, loader(path))
+                self._cache[name] = cached
+            self._checked[name] = now
+            return cached[1]
+
+    # -------------------------------------------------------
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        # время проверки в другом процессе не имеет смысла
+        state["_checked"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+# ========================================
+# SHARED DEFAULT STORE
+# ========================================
+
+_default_store: Optional[DataStore] = None
+_default_lock = threading.Lock()
+
+
+def get_default_store() -> DataStore:
+    """Хранилище по умолчанию — одно на процесс."""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = DataStore()
+    return _default_store
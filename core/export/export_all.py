@@ -0,0 +1,85 @@
+# core/export/export_all.py
+
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable
+
+from core.export.export_dist import write_distributions
+from core.export.export_html import write_html
+from core.export.export_json import write_json
+from core.export.export_xlsx import write_xlsx
+from core.export.rows import EXPORT_PROFILES, ExportTable, build_export_table
+
+
+# Формат -> функция записи готовой таблицы
+WRITERS: Dict[str, Callable[[ExportTable, str], None]] = {
+    "json": write_json,
+    "html": write_html,
+    "xlsx": write_xlsx,
+    "dist": write_distributions,
+}
+
+BACKENDS = ("process", "thread", "serial")
+
+
+def _write(fmt: str, table: ExportTable, path: str) -> str:
+    WRITERS[fmt](table, path)
+    return path
+
+
+def _dist_path(targets: Dict[str, str]) -> str:
+    # value_today.json -> value_today.dist.bin
+    base = targets.get("json") or next(iter(targets.values()))
+    return os.path.splitext(base)[0] + ".dist.bin"
+
+
+def export_all(contexts: Iterable[Any], targets: Dict[str, str],
+               backend: str = "thread", profile: str = "summary") -> Dict[str, str]:
+    """
+    Экспорт во все форматы за один проход по контекстам.
+
+    targets — {"json": path, "html": path, "xlsx": path, "dist": path}
+    (любое подмножество).
+    Контексты расплющиваются в ExportTable один раз, затем форматы пишутся
+    параллельно: время экспорта ~ самый медленный формат, а не сумма.
+
+    backend:
+      "thread"  — пул потоков (по умолчанию, без копирования таблицы);
+      "process" — по процессу на формат (запись в JSON/XLSX упирается в GIL,
+                  но таблица копируется в каждый процесс) — включается явно;
+      "serial"  — по очереди.
+
+    profile — как выгружать распределения (см. EXPORT_PROFILES):
+      "summary" — сводка вместо тысяч сэмплов (по умолчанию, для дашборда);
+      "full"    — сводка + гистограммы в файле "dist" (если путь не задан —
+                  рядом с JSON: <имя>.dist.bin);
+      "debug"   — всё inline.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"export_all: unknown backend '{backend}'")
+    unknown = set(targets) - set(WRITERS)
+    if unknown:
+        raise ValueError(f"export_all: unknown formats {sorted(unknown)}")
+    if profile not in EXPORT_PROFILES:
+        raise ValueError(f"export_all: unknown profile '{profile}'")
+
+    targets = dict(targets)
+    if profile == "full" and "dist" not in targets and targets:
+        targets["dist"] = _dist_path(targets)
+    sidecar = os.path.basename(targets["dist"]) if "dist" in targets else None
+
+    table = build_export_table(contexts, profile=profile, sidecar=sidecar)
+
+    for path in targets.values():
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    if backend == "serial" or len(targets) <= 1:
+        return {fmt: _write(fmt, table, path) for fmt, path in targets.items()}
+
+    pool_cls = ProcessPoolExecutor if backend == "process" else ThreadPoolExecutor
+    with pool_cls(max_workers=len(targets)) as pool:
+        futures = {fmt: pool.submit(_write, fmt, table, path) for fmt, path in targets.items()}
+        return {fmt: future.result() for fmt, future in futures.items()}
@@ -0,0 +1,27 @@
+# core/export/export_dist.py
+
+from typing import Dict
+
+from core.export.rows import ExportTable
+from core.model.distribution import ScoreDistribution
+from core.model.sim_cache import decode_histograms, encode_histograms
+
+
+def write_distributions(table: ExportTable, path):
+    """
+    Файл распределений для профиля "full": все гистограммы таблицы
+    одним бинарным блоком (формат записи SimulationCache),
+    ключи — "<game_id>/<колонка>", как в ссылках из JSON.
+    """
+    with open(path, "wb") as f:
+        f.write(encode_histograms(table.distributions, {}))
+
+
+def read_distributions(path) -> Dict[str, ScoreDistribution]:
+    """Обратное чтение: ключ -> ScoreDistribution (из гистограммы)."""
+    with open(path, "rb") as f:
+        histograms, _ = decode_histograms(f.read())
+    return {
+        key: ScoreDistribution.from_histogram(offset, counts)
+        for key, (offset, counts) in histograms.items()
+    }
@@ -1,23 +1,9 @@
 # core/export/export_html.py
 
-from core.export.labels_ru import COLUMN_LABELS_RU
+from core.export.rows import ExportTable, build_export_table
 
 
-def export_to_html(contexts, path):
-    columns = [
-        "game_id", "date", "home", "away",
-    ]
-
-    dynamic_keys = set()
-    for ctx in contexts:
-        dynamic_keys.update(ctx.features.keys())
-        dynamic_keys.update(ctx.model_outputs.keys())
-
-    columns.extend(sorted(dynamic_keys))
-
-    # -----------------------------------------
-    # HTML
-    # -----------------------------------------
+def write_html(table: ExportTable, path):
     html = []
     html.append("<html><head><meta charset='utf-8'><title>NBA Модель</title>")
     html.append("""
@@ -33,32 +19,21 @@ def export_to_html(contexts, path):
     html.append("<tr>")
 
     # заголовки
-    for col in columns:
-        name = COLUMN_LABELS_RU.get(col, col)
+    for name in table.header:
         html.append(f"<th>{name}</th>")
     html.append("</tr>")
 
-    # данные
-    for ctx in contexts:
+    # данные (значения уже сериализованы в таблице)
+    for row in table.rows:
         html.append("<tr>")
-        for col in columns:
-            val = (
-                ctx.features.get(col)
-                if col in ctx.features
-                else ctx.model_outputs.get(col)
-            )
-            if col == "game_id":
-                val = ctx.game_id
-            if col == "date":
-                val = str(ctx.date)
-            if col == "home":
-                val = ctx.home
-            if col == "away":
-                val = ctx.away
-
+        for val in table.values(row):
             html.append(f"<td>{val}</td>")
         html.append("</tr>")
     html.append("</table></body></html>")
 
     with open(path, "w", encoding="utf-8") as f:
         f.write("\n".join(html))
+
+
+def export_to_html(contexts, path):
+    write_html(build_export_table(contexts), path)
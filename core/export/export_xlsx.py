@@ -1,19 +1,27 @@
 # core/export/export_xlsx.py
 
+from typing import Any, Dict, Iterable, List, Optional
+
 from openpyxl import Workbook
 from core.export.labels_ru import COLUMN_LABELS_RU
+from core.export.rows import BASE_COLUMNS, ExportTable, build_export_table, flatten_context
 
 
 def _excel_safe(value):
     """
     Excel не принимает списки и сложные структуры.
     Преобразуем:
-      - списки -> строка "a, b, c"
+      - списки и распределения -> строка "a, b, c"
+      - словари -> строка "k=v, ..."
       - None -> ""
       - другие типы оставляем как есть
     """
+    if hasattr(value, "to_serializable"):
+        value = value.to_serializable()
     if value is None:
         return ""
+    if isinstance(value, dict):
+        return ", ".join(f"{k}={v}" for k, v in value.items())
     if isinstance(value, list):
         if len(value) == 0:
             return "-"
@@ -22,57 +30,179 @@ def _excel_safe(value):
     return value
 
 
-def export_to_xlsx(contexts, path):
+def write_xlsx(table: ExportTable, path):
     wb = Workbook()
     ws = wb.active
     ws.title = "NBA Модель"
 
-    # -----------------------------------------
-    # Список всех колонок
-    # -----------------------------------------
-    columns = [
-        "game_id", "date", "home", "away",
-    ]
+    # Заголовки (русские)
+    ws.append(table.header)
 
-    dynamic_keys = set()
-    for ctx in contexts:
-        dynamic_keys.update(ctx.features.keys())
-        dynamic_keys.update(ctx.model_outputs.keys())
+    # Строки данных (значения уже сериализованы в таблице)
+    for row in table.rows:
+        ws.append([_excel_safe(val) for val in table.values(row)])
 
-    columns.extend(sorted(dynamic_keys))
+    wb.save(path)
+
+
+def export_to_xlsx(contexts, path):
+    write_xlsx(build_export_table(contexts), path)
+
+
+# ========================================
+# STREAMING (write-only)
+# ========================================
+
+# Колонки листов в режиме split="market"
+MARKET_SHEETS: Dict[str, List[str]] = {
+    "moneyline": ["odds_home", "odds_away", "win_prob_home", "win_prob_away",
+                  "edge_home", "kelly_home", "edge_away", "kelly_away"],
+    "spread": ["spread_line", "spread_odds_home", "spread_odds_away",
+               "P_spread_home_cover", "P_spread_away_cover",
+               "spread_edge_home", "spread_kelly_home", "spread_edge_away", "spread_kelly_away"],
+    "total": ["total_line", "total_over_odds", "total_under_odds",
+              "P_total_over", "P_total_under",
+              "total_edge_over", "total_kelly_over", "total_edge_under", "total_kelly_under"],
+    "team_totals": ["home_team_total", "home_team_total_over_odds", "home_team_total_under_odds",
+                    "P_home_team_total_over", "P_home_team_total_under",
+                    "home_team_total_edge_over", "home_team_total_kelly_over",
+                    "home_team_total_edge_under", "home_team_total_kelly_under",
+                    "away_team_total", "away_team_total_over_odds", "away_team_total_under_odds",
+                    "P_away_team_total_over", "P_away_team_total_under",
+                    "away_team_total_edge_over", "away_team_total_kelly_over",
+                    "away_team_total_edge_under", "away_team_total_kelly_under"],
+}
+
+# Рынок есть у матча, только если есть его линия или коэффициенты:
+# вероятности (win_prob_*, P_*) модель пишет для каждого матча
+MARKET_PRESENCE: Dict[str, List[str]] = {
+    "moneyline": ["odds_home", "odds_away"],
+    "spread": ["spread_line", "spread_odds_home", "spread_odds_away"],
+    "total": ["total_line", "total_over_odds", "total_under_odds"],
+    "team_totals": ["home_team_total", "home_team_total_over_odds", "home_team_total_under_odds",
+                    "away_team_total", "away_team_total_over_odds", "away_team_total_under_odds"],
+}
+
+SPLITS = ("date", "market", None)
+
+# Колонка для ключей, которых не было в заголовке листа
+EXTRA_COLUMN = "extra"
+
+
+def _stream_row(ctx, profile: str) -> Dict[str, Any]:
+    """
+    Плоская строка для потоковой записи. Сводки распределений
+    раскладываются в числовые колонки <колонка>.mean / .std / .q05 ...
+    (гистограмма не пишется): числа не попадают в таблицу общих строк
+    XLSX, которую openpyxl держит в памяти до конца записи.
+    """
+    row = flatten_context(ctx, profile)
+    for key, value in list(row.items()):
+        if isinstance(value, dict) and "mean" in value:
+            del row[key]
+            for sub, sub_value in value.items():
+                if sub in ("mean", "std") or sub.startswith("q"):
+                    row[f"{key}.{sub}"] = sub_value
+    return row
+
+
+class _StreamSheet:
+    """Лист write-only книги: заголовок фиксируется по первой строке."""
+
+    def __init__(self, wb, title: str, columns: List[str]):
+        self.ws = wb.create_sheet(title=title)
+        self.columns = columns
+        self._known = set(columns)
+        self.rows = 0
+        self.ws.append([COLUMN_LABELS_RU.get(col, col) for col in columns] + [EXTRA_COLUMN])
+
+    @property
+    def closed(self) -> bool:
+        return self.ws.closed
+
+    def append(self, row: Dict[str, Any]):
+        extra = {k: v for k, v in row.items() if k not in self._known}
+        self.ws.append([_excel_safe(row.get(col)) for col in self.columns]
+                       + [_excel_safe(extra) if extra else ""])
+        self.rows += 1
+
+    def close(self):
+        """Дописывает лист и освобождает его буферы (дописать строки уже нельзя)."""
+        if not self.ws.closed:
+            self.ws.close()
+
+
+def stream_xlsx(contexts: Iterable[Any], path, split: Optional[str] = "date",
+                profile: str = "summary",
+                columns: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Потоковый экспорт в XLSX для больших отчётов (сезон бэктеста и т.п.).
+
+    contexts — любой итератор (можно генератор): каждая строка сразу
+    уходит во временный файл листа write-only книги и нигде не копится,
+    поэтому пик памяти не зависит от числа строк (растёт только
+    дедуплицированная таблица строковых значений и небольшой объект
+    на каждый лист).
+
+    split:
+      "date"   — лист на каждую дату. Поток обычно идёт по датам, поэтому
+                 лист закрывается, как только дата сменилась; если дата
+                 встретится снова, строки уйдут на лист "<дата> (2)";
+      "market" — лист на рынок (MARKET_SHEETS), строка — матч с линией
+                 на этот рынок;
+      None     — один лист.
+
+    Заголовок листа берётся из columns или из первой строки листа
+    (game_id, date, home, away + остальные ключи по алфавиту).
+    Ключи, которых в заголовке нет, пишутся в последнюю колонку "extra"
+    как "k=v, ...".
+
+    Возвращает {лист: число строк}.
+    """
+    if split not in SPLITS:
+        raise ValueError(f"stream_xlsx: unknown split '{split}'")
+
+    wb = Workbook(write_only=True)
+    sheets: Dict[str, _StreamSheet] = {}
+    # ключ (дата / рынок) -> лист, в который сейчас идут его строки
+    active: Dict[str, _StreamSheet] = {}
+    last_date: Optional[_StreamSheet] = None
+
+    def sheet(key: str, row: Dict[str, Any], sheet_columns: Optional[List[str]]) -> _StreamSheet:
+        current = active.get(key)
+        if current is None or current.closed:
+            title = key[:31]  # имя листа Excel — не длиннее 31 символа
+            n = 1
+            while title in sheets:
+                n += 1
+                title = f"{key[:25]} ({n})"
+            if sheet_columns is None:
+                sheet_columns = BASE_COLUMNS + sorted(set(row) - set(BASE_COLUMNS))
+            current = _StreamSheet(wb, title, sheet_columns)
+            sheets[title] = current
+            active[key] = current
+        return current
 
-    # -----------------------------------------
-    # Заголовки (русские)
-    # -----------------------------------------
-    header = []
-    for col in columns:
-        header.append(COLUMN_LABELS_RU.get(col, col))
-    ws.append(header)
-
-    # -----------------------------------------
-    # Строки данных
-    # -----------------------------------------
     for ctx in contexts:
-        row = []
-        for col in columns:
-            if col == "game_id":
-                val = ctx.game_id
-            elif col == "date":
-                val = str(ctx.date)
-            elif col == "home":
-                val = ctx.home
-            elif col == "away":
-                val = ctx.away
-            else:
-                if col in ctx.features:
-                    val = ctx.features[col]
-                else:
-                    val = ctx.model_outputs.get(col)
-
-            # Делаем значение "Excel-безопасным"
-            val = _excel_safe(val)
-            row.append(val)
-
-        ws.append(row)
+        row = _stream_row(ctx, profile)
+
+        if split == "market":
+            for market, keys in MARKET_SHEETS.items():
+                if all(row.get(key) is None for key in MARKET_PRESENCE[market]):
+                    continue
+                market_columns = columns or BASE_COLUMNS + keys
+                market_row = {k: row[k] for k in market_columns if k in row}
+                sheet(market, market_row, market_columns).append(market_row)
+        elif split == "date":
+            current = sheet(str(row.get("date", "нет даты")), row, columns)
+            if last_date is not None and last_date is not current:
+                last_date.close()
+            current.append(row)
+            last_date = current
+        else:
+            sheet("NBA Модель", row, columns).append(row)
 
+    if not sheets:
+        wb.create_sheet(title="NBA Модель")
     wb.save(path)
+    return {title: s.rows for title, s in sheets.items()}
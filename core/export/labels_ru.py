@@ -27,6 +27,8 @@ COLUMN_LABELS_RU = {
     "pace_away": "Темп гостей",
     "pace_match": "Темп матча",
     "league_avg_pace": "Средний темп лиги",
+    "pace_shock_sd": "Шок темпа (отн. станд. откл. владений)",
+    "pace_shock_sd_override": "Шок темпа, заданный для матча",
 
     # xPTS / shot quality
     "xpts_off_home": "Ожид. очки нападения (хозяева)",
@@ -45,6 +47,11 @@ COLUMN_LABELS_RU = {
     "mc_win_prob_away": "Вер. победы гостей (симуляция)",
     "mc_expected_total": "Ожидаемый тотал (симуляция)",
     "mc_expected_diff": "Ожидаемый дифф (симуляция)",
+    "mc_diff_std": "Станд. отклонение диффа (симуляция)",
+    "mc_total_std": "Станд. отклонение тотала (симуляция)",
+    "mc_num_simulations": "Число симуляций",
+    "mc_prob_se": "Макс. станд. ошибка вероятностей (симуляция)",
+    "mc_score_correlation": "Корреляция очков команд",
 
     # коэффициенты
     "odds_home": "Коэфф. хозяев",
@@ -55,4 +62,10 @@ COLUMN_LABELS_RU = {
     "edge_away": "Преимущество модели (гости, %)",
     "kelly_home": "Kelly (хозяева)",
     "kelly_away": "Kelly (гости)",
+
+    # альтернативные линии
+    "alt_spread_ladder": "Альт. форы (лестница)",
+    "alt_total_ladder": "Альт. тоталы (лестница)",
+    "alt_home_team_total_ladder": "Альт. инд. тоталы хозяев",
+    "alt_away_team_total_ladder": "Альт. инд. тоталы гостей",
 }
@@ -0,0 +1,146 @@
+# core/export/rows.py
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.export.labels_ru import COLUMN_LABELS_RU
+from core.model.distribution import Distribution, ScoreDistribution
+
+
+BASE_COLUMNS = ["game_id", "date", "home", "away"]
+
+# Профили экспорта распределений (mc_*_distribution):
+#   "summary" — сводка: mean, std, квантили, огрублённая гистограмма
+#   "full"    — сводка + ссылка на полную гистограмму в бинарном файле рядом
+#   "debug"   — всё inline (сырые сэмплы), как раньше
+EXPORT_PROFILES = ("summary", "full", "debug")
+
+# (offset, counts) гистограммы
+Histogram = Tuple[int, np.ndarray]
+
+
+def serialize_value(value, profile: str = "debug"):
+    """
+    Приведение значений к JSON-дружелюбному виду.
+    Даты -> строки. Распределения -> to_serializable() (debug)
+    или summary() (summary / full).
+    Остальное отдаем как есть.
+    """
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if profile != "debug" and isinstance(value, Distribution):
+        return value.summary()
+    if hasattr(value, "to_serializable"):
+        return value.to_serializable()
+    return value
+
+
+def _distribution_key(ctx, column: str) -> str:
+    game_id = ctx.get("game_id") if isinstance(ctx, dict) else getattr(ctx, "game_id", None)
+    return f"{game_id}/{column}"
+
+
+def flatten_context(ctx, profile: str = "debug",
+                    sidecar: Optional[str] = None,
+                    distributions: Optional[Dict[str, Histogram]] = None) -> Dict[str, Any]:
+    """
+    Плоский dict матча: game_id, date, home, away, <features>, <model_outputs>.
+    Работает как с GameContext, так и с dict-ами того же вида
+    (включая уже плоские dict-ы).
+
+    В профиле "full" гистограммы ScoreDistribution складываются
+    в distributions под ключом "<game_id>/<колонка>", а в строку
+    к сводке добавляется ссылка {"sidecar": имя файла, "key": ключ}.
+    """
+    if profile not in EXPORT_PROFILES:
+        raise ValueError(f"flatten_context: unknown profile '{profile}'")
+
+    def serialize(column: str, value):
+        result = serialize_value(value, profile)
+        if (profile == "full" and distributions is not None
+                and isinstance(value, ScoreDistribution) and value):
+            key = _distribution_key(ctx, column)
+            distributions[key] = value.histogram()
+            result["sidecar"] = sidecar
+            result["key"] = key
+        return result
+
+    base: Dict[str, Any] = {}
+
+    if isinstance(ctx, dict):
+        for key in BASE_COLUMNS:
+            if key in ctx:
+                base[key] = serialize_value(ctx[key])
+        features = ctx.get("features", {}) or {}
+        model_outputs = ctx.get("model_outputs", {}) or {}
+    else:
+        for key in BASE_COLUMNS:
+            value = getattr(ctx, key, None)
+            if value is not None:
+                base[key] = serialize_value(value)
+        features = getattr(ctx, "features", {}) or {}
+        model_outputs = getattr(ctx, "model_outputs", {}) or {}
+
+    if isinstance(features, dict):
+        for k, v in features.items():
+            base[k] = serialize(k, v)
+
+    if isinstance(model_outputs, dict):
+        for k, v in model_outputs.items():
+            base[k] = serialize(k, v)
+
+    # если в dict были еще какие-то верхнеуровневые ключи — добавляем их
+    if isinstance(ctx, dict):
+        for k, v in ctx.items():
+            if k in ("features", "model_outputs") or k in base:
+                continue
+            base[k] = serialize(k, v)
+
+    return base
+
+
+@dataclass
+class ExportTable:
+    """
+    Общая модель строк для всех экспортёров: контексты расплющиваются
+    и сериализуются один раз, объединение колонок считается один раз.
+
+    - rows: плоские dict-ы (порядок ключей как в контексте)
+    - columns: game_id, date, home, away + остальные ключи по алфавиту
+    - profile: профиль экспорта распределений (EXPORT_PROFILES)
+    - distributions: гистограммы для файла распределений (только "full")
+    """
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    columns: List[str] = field(default_factory=list)
+    profile: str = "debug"
+    distributions: Dict[str, Histogram] = field(default_factory=dict)
+
+    @property
+    def header(self) -> List[str]:
+        """Русские заголовки колонок."""
+        return [COLUMN_LABELS_RU.get(col, col) for col in self.columns]
+
+    def values(self, row: Dict[str, Any]) -> List[Any]:
+        """Значения строки в порядке columns (None, если ключа нет)."""
+        return [row.get(col) for col in self.columns]
+
+
+def build_export_table(contexts: Iterable[Any], profile: str = "debug",
+                       sidecar: Optional[str] = None) -> ExportTable:
+    """
+    sidecar — имя файла распределений, на который ссылаются строки
+    в профиле "full" (сам файл пишет write_distributions).
+    """
+    distributions: Dict[str, Histogram] = {}
+    rows = [flatten_context(ctx, profile, sidecar, distributions) for ctx in contexts]
+
+    dynamic_keys = set()
+    for row in rows:
+        dynamic_keys.update(row.keys())
+    dynamic_keys.difference_update(BASE_COLUMNS)
+
+    return ExportTable(rows=rows, columns=BASE_COLUMNS + sorted(dynamic_keys),
+                       profile=profile, distributions=distributions)
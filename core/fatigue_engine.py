@@ -6,6 +6,11 @@ from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
+
+
+EARTH_RADIUS_KM = 6371.0
+
 
 @dataclass
 class FatigueConfig:
@@ -18,12 +23,12 @@ class FatigueConfig:
     b2b_penalty: float = -2.0         # штраф за back-to-back
     three_in_four_penalty: float = -1.0  # 3 игры за 4 дня
     four_in_six_penalty: float = -1.5    # 4 игры за 6 дней
-    rest_day_bonus: float = 0.0          # при 2+ днях отдыха, если хочешь бонус
+    rest_day_bonus: float = 0.0          # при 3+ днях отдыха, если хочешь бонус
     max_abs_adjustment: float = 5.0      # защита от экстремумов
 
-    # Пока без travel/timezone, позже можно расширить:
-    travel_penalty_per_1000km: float = 0.0
-    timezone_penalty_per_hour: float = 0.0
+    # Перелёты (нужна матрица расстояний между аренами):
+    travel_penalty_per_1000km: float = 0.0   # например -0.3
+    timezone_penalty_per_hour: float = 0.0   # например -0.25
 
 
 @dataclass
@@ -31,41 +36,110 @@ class TeamGame:
     """
     Универсальное представление игры для одной команды.
     Если твоя структура отличается — адаптируй маппинг в вызове.
+
+    venue — команда-хозяин арены (для домашней игры совпадает с team).
+    Без venue перелёты не учитываются.
     """
     game_id: str
     team: str
     game_date: date
+    venue: Optional[str] = None
 
 
-def _compute_games_in_window(
-    dates: List[date],
-    idx: int,
-    window_days: int,
-) -> int:
+@dataclass
+class FatigueRecord:
     """
-    Сколько игр было у команды в заданное окно (включая текущую)?
-    Например, window_days=4 -> 3-in-4, window_days=6 -> 4-in-6.
+    Предрассчитанное состояние команды на дату матча.
     """
-    current = dates[idx]
-    from_date = current - timedelta(days=window_days - 1)
-    count = 0
-    j = idx
-    while j >= 0 and dates[j] >= from_date:
-        count += 1
-        j -= 1
-    return count
+    rest_days: int
+    three_in_four: bool
+    four_in_six: bool
+    travel_km: float
+    timezone_shift: float
+    adjustment: float
 
 
-def compute_fatigue_for_team_games(
+class ArenaDistanceMatrix:
+    """
+    Предрассчитанные расстояния (км) и сдвиги часовых поясов (ч)
+    между всеми парами арен. Считается один раз векторно (haversine),
+    дальше каждый перелёт — два обращения к матрице.
+    """
+
+    def __init__(self, arenas: Dict[str, Dict[str, float]]):
+        teams = sorted(arenas)
+        self.index: Dict[str, int] = {team: i for i, team in enumerate(teams)}
+
+        lat = np.radians([arenas[t]["lat"] for t in teams])
+        lon = np.radians([arenas[t]["lon"] for t in teams])
+        tz = np.array([arenas[t].get("utc_offset", 0.0) for t in teams], dtype=np.float64)
+
+        dlat = lat[:, None] - lat[None, :]
+        dlon = lon[:, None] - lon[None, :]
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+        self.km: np.ndarray = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+        self.tz_shift: np.ndarray = np.abs(tz[:, None] - tz[None, :])
+
+    def between(self, origin: str, destination: str) -> Tuple[float, float]:
+        """(км, часы сдвига) между аренами; (0, 0) если арена неизвестна."""
+        i = self.index.get(origin)
+        j = self.index.get(destination)
+        if i is None or j is None:
+            return 0.0, 0.0
+        return float(self.km[i, j]), float(self.tz_shift[i, j])
+
+
+def _adjustment(
+    config: FatigueConfig,
+    rest_days: int,
+    three_in_four: bool,
+    four_in_six: bool,
+    travel_km: float,
+    timezone_shift: float,
+) -> float:
+    adj = 0.0
+
+    # B2B
+    if rest_days == 1:
+        adj += config.b2b_penalty
+
+    # 3-in-4
+    if three_in_four:
+        adj += config.three_in_four_penalty
+
+    # 4-in-6
+    if four_in_six:
+        adj += config.four_in_six_penalty
+
+    # бонус за хороший отдых (по желанию)
+    if rest_days >= 3 and config.rest_day_bonus != 0.0:
+        adj += config.rest_day_bonus
+
+    # перелёт и смена часового пояса
+    adj += travel_km / 1000.0 * config.travel_penalty_per_1000km
+    adj += timezone_shift * config.timezone_penalty_per_hour
+
+    # ограничим по модулю
+    if abs(adj) > config.max_abs_adjustment:
+        adj = config.max_abs_adjustment * (1 if adj > 0 else -1)
+
+    return adj
+
+
+def compute_all(
     games: Iterable[TeamGame],
     config: Optional[FatigueConfig] = None,
-) -> Dict[Tuple[str, str], float]:
+    distances: Optional[ArenaDistanceMatrix] = None,
+) -> Dict[Tuple[str, date], FatigueRecord]:
     """
-    Главная функция: считает показатель усталости для каждой
-    (team, game_id).
+    Пакетный расчёт усталости за весь сезон одним проходом.
+
+    Для каждой команды даты сортируются один раз, окна 3-in-4 и 4-in-6
+    ведутся двумя указателями, перелёт считается от арены прошлой игры
+    (перед первой игрой команда считается дома).
 
     Возвращает словарь:
-        {(team, game_id): fatigue_adjustment}
+        {(team, game_date): FatigueRecord}
     """
     if config is None:
         config = FatigueConfig()
@@ -75,48 +149,71 @@ def compute_fatigue_for_team_games(
     for g in games:
         by_team.setdefault(g.team, []).append(g)
 
-    for team, team_games in by_team.items():
-        team_games.sort(key=lambda x: x.game_date)
-
-    result: Dict[Tuple[str, str], float] = {}
+    result: Dict[Tuple[str, date], FatigueRecord] = {}
 
     for team, team_games in by_team.items():
+        team_games.sort(key=lambda x: x.game_date)
         dates = [g.game_date for g in team_games]
 
+        start_4 = 0
+        start_6 = 0
+        prev_venue = team
+
         for idx, game in enumerate(team_games):
-            adj = 0.0
+            current = dates[idx]
 
             # rest_days: разница с прошлой игрой
             if idx > 0:
-                prev_date = dates[idx - 1]
-                rest_days = (game.game_date - prev_date).days
+                rest_days = (current - dates[idx - 1]).days
             else:
                 rest_days = 5  # условно "много отдыха" перед первой игрой
 
-            # B2B
-            if rest_days == 1:
-                adj += config.b2b_penalty
-
-            # 3-in-4
-            games_last_4 = _compute_games_in_window(dates, idx, 4)
-            if games_last_4 >= 3:
-                adj += config.three_in_four_penalty
-
-            # 4-in-6
-            games_last_6 = _compute_games_in_window(dates, idx, 6)
-            if games_last_6 >= 4:
-                adj += config.four_in_six_penalty
+            # сдвигаем начала окон (4 и 6 дней, включая текущий)
+            since_4 = current - timedelta(days=3)
+            while dates[start_4] < since_4:
+                start_4 += 1
+            since_6 = current - timedelta(days=5)
+            while dates[start_6] < since_6:
+                start_6 += 1
+
+            three_in_four = idx - start_4 + 1 >= 3
+            four_in_six = idx - start_6 + 1 >= 4
+
+            # перелёт
+            travel_km, timezone_shift = 0.0, 0.0
+            if distances is not None and game.venue is not None:
+                travel_km, timezone_shift = distances.between(prev_venue, game.venue)
+                prev_venue = game.venue
+
+            key = (team, current)
+            if key not in result:
+                result[key] = FatigueRecord(
+                    rest_days=rest_days,
+                    three_in_four=three_in_four,
+                    four_in_six=four_in_six,
+                    travel_km=travel_km,
+                    timezone_shift=timezone_shift,
+                    adjustment=_adjustment(config, rest_days, three_in_four, four_in_six,
+                                           travel_km, timezone_shift),
+                )
 
-            # бонус за хороший отдых (по желанию)
-            if rest_days >= 3 and config.rest_day_bonus != 0.0:
-                adj += config.rest_day_bonus
-
-            # travel / timezone потом можно добавить здесь
+    return result
 
-            # ограничим по модулю
-            if abs(adj) > config.max_abs_adjustment:
-                adj = config.max_abs_adjustment * (1 if adj > 0 else -1)
 
-            result[(team, game.game_id)] = adj
+def compute_fatigue_for_team_games(
+    games: Iterable[TeamGame],
+    config: Optional[FatigueConfig] = None,
+    distances: Optional[ArenaDistanceMatrix] = None,
+) -> Dict[Tuple[str, str], float]:
+    """
+    Считает показатель усталости для каждой (team, game_id).
 
-    return result
+    Возвращает словарь:
+        {(team, game_id): fatigue_adjustment}
+    """
+    games = list(games)
+    table = compute_all(games, config, distances)
+    return {
+        (g.team, g.game_id): table[(g.team, g.game_date)].adjustment
+        for g in games
+    }
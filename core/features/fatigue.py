@@ -1,44 +1,18 @@
 # core/features/fatigue.py
 
 from __future__ import annotations
-from datetime import date, timedelta
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
-from core.context import GameContext
-
-# ========================================
-# CONFIGURATION
-# ========================================
-
-@dataclass
-class FatigueConfig:
-    b2b_penalty: float = -2.0
-    three_in_four_penalty: float = -1.0
-    four_in_six_penalty: float = -1.5
-    rest_bonus: float = 0.0              # бонус если ≥3 дней отдыха
-    max_abs_adjustment: float = 5.0
-
-
-# ========================================
-# INTERNAL HELPERS
-# ========================================
-
-def count_games_in_window(dates: List[date], idx: int, days: int) -> int:
-    """
-    Считает сколько игр команда сыграла
-    за последние N дней включая текущий матч.
-    """
-    current = dates[idx]
-    since = current - timedelta(days=days - 1)
-
-    count = 0
-    j = idx
-    while j >= 0 and dates[j] >= since:
-        count += 1
-        j -= 1
-
-    return count
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from core.context import GameContext
+from core.slate import Slate
+from core.fatigue_engine import (
+    ArenaDistanceMatrix,
+    FatigueConfig,
+    FatigueRecord,
+    TeamGame,
+    compute_all,
+)
 
 # ========================================
 # MAIN FATIGUE PROCESSOR
@@ -48,8 +22,15 @@ class FatigueModule:
     """
     Полноценный модуль усталости.
     Не использует заглушки — считается по расписанию.
+
+    Сам ничего не считает: вся логика в core.fatigue_engine.compute_all,
+    модуль лишь хранит таблицу на сезон и отдаёт из неё значения за O(1).
     """
 
+    # Зависит только от расписания (не от фич контекста)
+    INPUTS = ()
+    OUTPUTS = ("fatigue_home", "fatigue_away")
+
     def __init__(self, config: FatigueConfig = None):
         self.cfg = config or FatigueConfig()
 
@@ -57,6 +38,9 @@ class FatigueModule:
         # { "LAL": [date1, date2, date3, ...] }
         self.team_schedules: Dict[str, List[date]] = {}
 
+        # Предрассчитанная таблица: { ("LAL", date): FatigueRecord }
+        self.fatigue_table: Dict[Tuple[str, date], FatigueRecord] = {}
+
     # -------------------------------------------------------
 
     def load_schedule(self, schedule: Dict[str, List[date]]):
@@ -66,64 +50,40 @@ class FatigueModule:
             "LAL": [2023-10-21, 2023-10-23, ...],
             "GSW": [...],
         }
-        """
-        self.team_schedules = schedule
 
-    # -------------------------------------------------------
+        Без арен, поэтому перелёты не учитываются — для них см. load_games.
+        """
+        games = [
+            TeamGame(game_id=f"{team}_{d.isoformat()}", team=team, game_date=d)
+            for team, dates in schedule.items()
+            for d in dates
+        ]
+        self.load_games(games)
+
+    def load_games(self, games: Iterable[TeamGame],
+                   distances: Optional[ArenaDistanceMatrix] = None):
+        """
+        Загружает сезон в виде TeamGame (с venue) и строит таблицу
+        усталости одним пакетным проходом, включая перелёты.
+        """
+        games = list(games)
 
-    def compute_team_fatigue(self, team: str, game_date: date) -> float:
+        schedules: Dict[str, List[date]] = {}
+        for g in games:
+            schedules.setdefault(g.team, []).append(g.game_date)
+        for dates in schedules.values():
+            dates.sort()
 
-        if team not in self.team_schedules:
-            return 0.0
+        self.team_schedules = schedules
+        self.fatigue_table = compute_all(games, self.cfg, distances)
 
-        dates = self.team_schedules[team]
-        dates = sorted(dates)
+    # -------------------------------------------------------
 
-        # ищем индекс текущей игры
-        try:
-            idx = dates.index(game_date)
-        except ValueError:
+    def compute_team_fatigue(self, team: str, game_date: date) -> float:
+        record = self.fatigue_table.get((team, game_date))
+        if record is None:
             return 0.0
-
-        # --- предыдущий матч ---
-        if idx > 0:
-            rest_days = (dates[idx] - dates[idx - 1]).days
-        else:
-            rest_days = 5  # старт сезона
-
-        fatigue = 0.0
-
-        # ----------------------------------------------------
-        # B2B
-        # ----------------------------------------------------
-        if rest_days == 1:
-            fatigue += self.cfg.b2b_penalty
-
-        # ----------------------------------------------------
-        # 3-in-4
-        # ----------------------------------------------------
-        last_4 = count_games_in_window(dates, idx, 4)
-        if last_4 >= 3:
-            fatigue += self.cfg.three_in_four_penalty
-
-        # ----------------------------------------------------
-        # 4-in-6
-        # ----------------------------------------------------
-        last_6 = count_games_in_window(dates, idx, 6)
-        if last_6 >= 4:
-            fatigue += self.cfg.four_in_six_penalty
-
-        # ----------------------------------------------------
-        # бонус за отдых
-        # ----------------------------------------------------
-        if rest_days >= 3:
-            fatigue += self.cfg.rest_bonus
-
-        # ограничиваем экстремумы
-        if abs(fatigue) > self.cfg.max_abs_adjustment:
-            fatigue = self.cfg.max_abs_adjustment * (1 if fatigue > 0 else -1)
-
-        return fatigue
+        return record.adjustment
 
     # -------------------------------------------------------
 
@@ -141,3 +101,15 @@ class FatigueModule:
 
         context.add_feature("fatigue_home", home_fatigue)
         context.add_feature("fatigue_away", away_fatigue)
+
+    def process_batch(self, slate: Slate):
+        """То же, что process, но для всего слейта."""
+        if not self.team_schedules:
+            raise ValueError("FatigueModule: team_schedules not loaded!")
+
+        slate.add_feature("fatigue_home", [
+            self.compute_team_fatigue(c.home, c.date) for c in slate.contexts
+        ])
+        slate.add_feature("fatigue_away", [
+            self.compute_team_fatigue(c.away, c.date) for c in slate.contexts
+        ])
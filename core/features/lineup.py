@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from core.context import GameContext
-from parsers.players_parser import load_player_impacts
+from core.slate import Slate
+from core.data_store import DataStore, get_default_store
 
 
 @dataclass
@@ -23,10 +24,17 @@ class LineupModule:
     в очковую корректировку для команды.
     """
 
-    def __init__(self, config: LineupConfig | None = None):
+    INPUTS = ("injuries_home", "injuries_away")
+    OUTPUTS = ("lineup_home", "lineup_away")
+
+    def __init__(self, config: LineupConfig | None = None, store: DataStore | None = None):
         self.cfg = config or LineupConfig()
+        self.store = store or get_default_store()
+
+    @property
+    def player_impacts(self) -> Dict[str, Dict[str, float]]:
         # { "LAL": { "LeBron James": 4.5, ... }, ... }
-        self.player_impacts: Dict[str, Dict[str, float]] = load_player_impacts()
+        return self.store.get("player_impacts")
 
     # -----------------------------------------------------
 
@@ -57,14 +65,7 @@ class LineupModule:
 
     # -----------------------------------------------------
 
-    def process(self, context: GameContext):
-        """
-        Основной вызов модуля из pipeline.
-        Ожидает, что в context.features лежат:
-         - injuries_home: List[str]
-         - injuries_away: List[str]
-        """
-
+    def _context_adjustments(self, context: GameContext) -> Tuple[float, float]:
         injuries_home = context.features.get("injuries_home", [])
         injuries_away = context.features.get("injuries_away", [])
 
@@ -75,7 +76,30 @@ class LineupModule:
 
         home_adj = self._compute_team_lineup_adjustment(context.home, injuries_home)
         away_adj = self._compute_team_lineup_adjustment(context.away, injuries_away)
+        return home_adj, away_adj
+
+    # -----------------------------------------------------
+
+    def process(self, context: GameContext):
+        """
+        Основной вызов модуля из pipeline.
+        Ожидает, что в context.features лежат:
+         - injuries_home: List[str]
+         - injuries_away: List[str]
+        """
+
+        home_adj, away_adj = self._context_adjustments(context)
 
         # lineup_home / lineup_away — это именно корректировка в очках
         context.add_feature("lineup_home", home_adj)
         context.add_feature("lineup_away", away_adj)
+
+    def process_batch(self, slate: Slate):
+        """
+        То же, что process, но для всего слейта.
+        Травмы у каждого матча свои, поэтому счёт поштучный,
+        а в слейт пишутся готовые столбцы.
+        """
+        adjustments = [self._context_adjustments(c) for c in slate.contexts]
+        slate.add_feature("lineup_home", [home for home, _ in adjustments])
+        slate.add_feature("lineup_away", [away for _, away in adjustments])
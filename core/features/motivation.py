@@ -3,10 +3,13 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date
-from typing import Dict
+from typing import Dict, Optional
+
+import numpy as np
 
 from core.context import GameContext
-from parsers.standings_parser import load_standings
+from core.slate import Slate
+from core.data_store import DataStore, get_default_store
 
 
 @dataclass
@@ -27,10 +30,27 @@ class MotivationModule:
     на основе турнирного положения и даты.
     """
 
-    def __init__(self, config: MotivationConfig | None = None):
+    # Зависит только от турнирной таблицы и даты матча
+    INPUTS = ()
+    OUTPUTS = ("motivation_home", "motivation_away")
+
+    def __init__(self, config: MotivationConfig | None = None, store: DataStore | None = None):
         self.cfg = config or MotivationConfig()
+        self.store = store or get_default_store()
+        # явно заданная таблица (например, снимок на дату в бэктесте)
+        self._standings: Optional[Dict[str, Dict[str, int]]] = None
+
+    @property
+    def standings(self) -> Dict[str, Dict[str, int]]:
         # { "LAL": {"conference_rank": 8, "wins": ..., "losses": ...}, ... }
-        self.standings: Dict[str, Dict[str, int]] = load_standings()
+        if self._standings is not None:
+            return self._standings
+        return self.store.get("standings")
+
+    @standings.setter
+    def standings(self, value: Optional[Dict[str, Dict[str, int]]]):
+        """None — вернуться к таблице из хранилища."""
+        self._standings = value
 
     # ----------------------------------------------------------
 
@@ -98,3 +118,53 @@ class MotivationModule:
 
         context.add_feature("motivation_home", home_motivation)
         context.add_feature("motivation_away", away_motivation)
+
+    # ----------------------------------------------------------
+
+    def _team_motivation_batch(self, slate: Slate, rank: np.ndarray, played: np.ndarray,
+                               known: np.ndarray, opp_rank: np.ndarray,
+                               opp_known: np.ndarray) -> np.ndarray:
+        """Векторная версия _compute_team_motivation (те же правила и порядок)."""
+        is_late_season = slate.month >= self.cfg.late_season_month
+
+        mot = np.zeros(len(slate), dtype=np.float64)
+        mot = np.where((rank >= 6) & (rank <= 10), mot + self.cfg.playoff_bubble_boost, mot)
+        mot = np.where(((rank == 1) | (rank == 2)) & is_late_season,
+                       mot + self.cfg.top_seed_relax_penalty, mot)
+        mot = np.where((rank >= 13) & is_late_season, mot + self.cfg.tanking_penalty, mot)
+        mot = np.where(opp_known & (np.abs(opp_rank - rank) <= 2),
+                       mot + self.cfg.rivalry_bonus, mot)
+
+        # нет данных или ранний сезон — мотивация нулевая
+        return np.where(known & (played >= 20), mot, 0.0)
+
+    def process_batch(self, slate: Slate):
+        """
+        То же, что process, но для всего слейта: таблица читается
+        один раз на команду, правила применяются по столбцам.
+        """
+        standings = self.standings
+
+        def rank(team: str) -> float:
+            return float((standings.get(team) or {}).get("conference_rank", 0))
+
+        def played(team: str) -> float:
+            info = standings.get(team) or {}
+            return float(info.get("wins", 0) + info.get("losses", 0))
+
+        def known(team: str) -> float:
+            return 1.0 if standings.get(team) else 0.0
+
+        rank_home, rank_away = slate.team_columns(rank)
+        played_home, played_away = slate.team_columns(played)
+        known_home, known_away = (col > 0 for col in slate.team_columns(known))
+
+        home_motivation = self._team_motivation_batch(
+            slate, rank_home, played_home, known_home, rank_away, known_away,
+        )
+        away_motivation = self._team_motivation_batch(
+            slate, rank_away, played_away, known_away, rank_home, known_home,
+        )
+
+        slate.add_feature("motivation_home", home_motivation)
+        slate.add_feature("motivation_away", away_motivation)
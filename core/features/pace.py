@@ -4,8 +4,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict
 
+import numpy as np
+
 from core.context import GameContext
-from parsers.pace_parser import load_team_pace
+from core.slate import Slate
+from core.data_store import DataStore, get_default_store
 
 
 @dataclass
@@ -18,6 +21,16 @@ class PaceConfig:
     max_pace: float = 110.0
     min_pace: float = 90.0
 
+    # Общий шок темпа: относительное станд. отклонение числа владений
+    # в матче от ожидаемого pace_match при среднем темпе лиги. Владения общие
+    # для обеих команд, поэтому шок делает их очки положительно
+    # коррелированными (SimulationModel переводит его в корреляцию счёта).
+    # Число владений ведёт себя как счётчик (дисперсия ~ среднему), поэтому
+    # для матча шок = pace_shock_sd · sqrt(league_avg_pace / pace_match).
+    # Фича pace_shock_sd_override (Game.pace_shock_sd) задаёт шок матча явно.
+    # 0 — счета независимы.
+    pace_shock_sd: float = 0.04
+
 
 class PaceModule:
     """
@@ -27,10 +40,18 @@ class PaceModule:
     - Считает гармоническое среднее для матча.
     """
 
-    def __init__(self, config: PaceConfig | None = None):
+    # Зависит от справочника темпа и явного шока матча
+    INPUTS = ("pace_shock_sd_override",)
+    OUTPUTS = ("pace_home", "pace_away", "pace_match", "league_avg_pace", "pace_shock_sd")
+
+    def __init__(self, config: PaceConfig | None = None, store: DataStore | None = None):
         self.cfg = config or PaceConfig()
+        self.store = store or get_default_store()
+
+    @property
+    def team_pace(self) -> Dict[str, float]:
         # словарь: { "LAL": 101.3, "GSW": 100.1, ... }
-        self.team_pace: Dict[str, float] = load_team_pace()
+        return self.store.get("team_pace")
 
     def _get_team_pace(self, team: str) -> float:
         pace = self.team_pace.get(team, self.cfg.default_pace)
@@ -45,6 +66,11 @@ class PaceModule:
             return self.cfg.league_avg_pace
         return 2 * (a * b) / (a + b)
 
+    def _pace_shock(self, pace_match):
+        """Относительный шок владений матча (скаляр или столбец)."""
+        ratio = self.cfg.league_avg_pace / np.maximum(pace_match, 1e-9)
+        return self.cfg.pace_shock_sd * np.sqrt(ratio)
+
     def process(self, context: GameContext):
         """
         Основной метод, вызываемый пайплайном.
@@ -59,3 +85,27 @@ class PaceModule:
         context.add_feature("pace_away", pace_away)
         context.add_feature("pace_match", pace_match)
         context.add_feature("league_avg_pace", self.cfg.league_avg_pace)
+        shock = context.features.get("pace_shock_sd_override")
+        if shock is None:
+            shock = float(self._pace_shock(pace_match))
+        context.add_feature("pace_shock_sd", float(shock))
+
+    def process_batch(self, slate: Slate):
+        """
+        То же, что process, но для всего слейта: темп берётся
+        один раз на команду, гармоническое среднее — по столбцам.
+        """
+        pace_home, pace_away = slate.team_columns(self._get_team_pace)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            harmonic = 2 * (pace_home * pace_away) / (pace_home + pace_away)
+        valid = (pace_home > 0) & (pace_away > 0)
+        pace_match = np.where(valid, harmonic, self.cfg.league_avg_pace)
+
+        slate.add_feature("pace_home", pace_home)
+        slate.add_feature("pace_away", pace_away)
+        slate.add_feature("pace_match", pace_match)
+        slate.add_feature("league_avg_pace", self.cfg.league_avg_pace)
+        override = slate.feature("pace_shock_sd_override", np.nan)
+        slate.add_feature("pace_shock_sd",
+                          np.where(np.isnan(override), self._pace_shock(pace_match), override))
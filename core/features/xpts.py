@@ -5,7 +5,8 @@ from dataclasses import dataclass
 from typing import Dict
 
 from core.context import GameContext
-from parsers.xpts_parser import load_team_xpts
+from core.slate import Slate
+from core.data_store import DataStore, get_default_store
 
 
 @dataclass
@@ -30,10 +31,21 @@ class XPTSModule:
     а не считаем их "на лету" по каждым броскам (это отдельная большая задача).
     """
 
-    def __init__(self, config: XPTSConfig | None = None):
+    # Зависит только от справочника xPTS
+    INPUTS = ()
+    OUTPUTS = (
+        "xpts_off_home", "xpts_off_away", "xpts_def_home", "xpts_def_away",
+        "xpts_matchup_home", "xpts_matchup_away", "shot_quality_delta",
+    )
+
+    def __init__(self, config: XPTSConfig | None = None, store: DataStore | None = None):
         self.cfg = config or XPTSConfig()
+        self.store = store or get_default_store()
+
+    @property
+    def team_xpts(self) -> Dict[str, Dict[str, float]]:
         # { "LAL": {"off_xpts_per_game": 115.2, "def_xpts_per_game": 112.3}, ... }
-        self.team_xpts: Dict[str, Dict[str, float]] = load_team_xpts()
+        return self.store.get("team_xpts")
 
     def _get_off_xpts(self, team: str) -> float:
         vals = self.team_xpts.get(team)
@@ -76,3 +88,25 @@ class XPTSModule:
         context.add_feature("xpts_matchup_home", matchup_home)
         context.add_feature("xpts_matchup_away", matchup_away)
         context.add_feature("shot_quality_delta", shot_quality_delta)
+
+    def process_batch(self, slate: Slate):
+        """
+        То же, что process, но для всего слейта: xPTS берутся
+        один раз на команду, матчапы считаются по столбцам.
+        """
+        off_home, off_away = slate.team_columns(self._get_off_xpts)
+        def_home, def_away = slate.team_columns(self._get_def_xpts)
+
+        matchup_home = off_home - def_away
+        matchup_away = off_away - def_home
+
+        shot_quality_delta = (matchup_home - matchup_away) * self.cfg.shot_quality_weight
+
+        slate.add_feature("xpts_off_home", off_home)
+        slate.add_feature("xpts_off_away", off_away)
+        slate.add_feature("xpts_def_home", def_home)
+        slate.add_feature("xpts_def_away", def_away)
+
+        slate.add_feature("xpts_matchup_home", matchup_home)
+        slate.add_feature("xpts_matchup_away", matchup_away)
+        slate.add_feature("shot_quality_delta", shot_quality_delta)
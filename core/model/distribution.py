@@ -0,0 +1,328 @@
+# core/model/distribution.py
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.model_probabilities import normal_cdf
+
+
+Lines = Union[float, Sequence[float], np.ndarray]
+
+# Квантили в сводке распределения (профиль экспорта "summary")
+SUMMARY_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+SUMMARY_MAX_BINS = 24
+
+
+def _compact_dtype(values: np.ndarray) -> np.dtype:
+    """Минимальный целочисленный тип, в который помещаются значения."""
+    if values.size == 0:
+        return np.dtype(np.int16)
+    info = np.iinfo(np.int16)
+    if values.min() >= info.min and values.max() <= info.max:
+        return np.dtype(np.int16)
+    return np.dtype(np.int32)
+
+
+class Distribution(ABC):
+    """
+    Общий интерфейс целочисленного распределения результата матча.
+
+    Потребители (ProbabilityModel, ValueModel, экспорт) работают только
+    через этот интерфейс и не знают, получено распределение сэмплированием
+    или аналитически. Наследник обязан реализовать mean, var, prob_at_most,
+    support и to_serializable — иначе он не создаётся (TypeError).
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def mean(self) -> float:
+        """E[X]."""
+
+    @abstractmethod
+    def var(self) -> float:
+        """Var[X]."""
+
+    def std(self) -> float:
+        return float(np.sqrt(self.var()))
+
+    @abstractmethod
+    def prob_at_most(self, x: Lines):
+        """P(X <= x). Принимает число или массив линий."""
+
+    def prob_over(self, line: Lines):
+        """P(X > line)."""
+        return 1.0 - self.prob_at_most(line)
+
+    def prob_under(self, line: Lines):
+        """P(X < line)."""
+        # X целое: X < line  <=>  X <= ceil(line) - 1
+        return self.prob_at_most(np.ceil(np.asarray(line, dtype=np.float64)) - 1)
+
+    @abstractmethod
+    def support(self) -> Tuple[int, int]:
+        """Диапазон значений [lo, hi], вне которого вероятность пренебрежимо мала."""
+
+    def quantile(self, q: Lines):
+        """Наименьшее целое k с P(X <= k) >= q. Принимает число или массив."""
+        lo, hi = self.support()
+        values = np.arange(lo, hi + 1)
+        cum = np.asarray(self.prob_at_most(values), dtype=np.float64)
+        idx = np.searchsorted(cum, np.asarray(q, dtype=np.float64), side="left")
+        res = values[np.clip(idx, 0, values.size - 1)]
+        return int(res) if res.ndim == 0 else res
+
+    def binned(self, max_bins: int = SUMMARY_MAX_BINS) -> Tuple[int, int, np.ndarray]:
+        """
+        Огрублённая гистограмма: (start, width, probs), где
+            probs[i] = P(start + i*width <= X < start + (i+1)*width).
+        Ширина корзины — целая, корзин не больше max_bins.
+        """
+        lo, hi = self.support()
+        width = max(1, -(-(hi - lo + 1) // max_bins))
+        edges = np.arange(lo - 1, hi + width, width)
+        cum = np.asarray(self.prob_at_most(edges), dtype=np.float64)
+        return lo, width, np.diff(cum)
+
+    def summary(self, quantiles: Sequence[float] = SUMMARY_QUANTILES,
+                max_bins: int = SUMMARY_MAX_BINS) -> Dict[str, Any]:
+        """
+        Компактная сводка для дашборда: среднее, std, квантили и
+        огрублённая гистограмма (доли по корзинам) — десятки чисел
+        вместо тысяч сэмплов.
+        """
+        if not self:
+            return {"mean": self.mean(), "std": self.std()}
+        start, width, probs = self.binned(max_bins)
+        summary: Dict[str, Any] = {"mean": round(self.mean(), 3), "std": round(self.std(), 3)}
+        for q, value in zip(quantiles, self.quantile(quantiles).tolist()):
+            summary[f"q{round(q * 100):02d}"] = value
+        summary["bin_start"] = start
+        summary["bin_width"] = width
+        summary["bins"] = np.round(probs, 4).tolist()
+        return summary
+
+    @abstractmethod
+    def to_serializable(self) -> Any:
+        """Представление для экспорта (JSON-совместимое)."""
+
+
+class ScoreDistribution(Distribution):
+    """
+    Компактное распределение целочисленных результатов Монте-Карло
+    (очки команды, тотал, дифф).
+
+    Вместо списка из N «боксированных» int хранит один типизированный
+    массив int16/int32 — ~2 байта на симуляцию вместо ~36.
+    Гистограмма (offset + counts) и CDF-таблица строятся лениво
+    один раз, после чего любая вероятность over/under/cover — это
+    O(1) обращение к таблице, а не проход по всем сэмплам.
+
+    После compact() (или при создании через from_histogram) сэмплы
+    не хранятся вовсе: память зависит от разброса счёта, а не от
+    количества симуляций.
+    """
+
+    __slots__ = ("_samples", "_n", "_histogram", "_cdf")
+
+    def __init__(self, samples: Sequence[int] | np.ndarray):
+        arr = np.asarray(samples)
+        if arr.dtype.kind not in "iu":
+            arr = np.rint(arr).astype(np.int64)
+        self._samples: np.ndarray | None = arr.astype(_compact_dtype(arr), copy=False)
+        self._n = int(arr.size)
+        self._histogram: Tuple[int, np.ndarray] | None = None
+        self._cdf: np.ndarray | None = None
+
+    @classmethod
+    def from_histogram(cls, offset: int, counts: Sequence[int] | np.ndarray) -> "ScoreDistribution":
+        """Распределение только из гистограммы (без сырых сэмплов)."""
+        dist = cls.__new__(cls)
+        counts = np.asarray(counts, dtype=np.int64)
+        dist._samples = None
+        dist._n = int(counts.sum())
+        dist._histogram = (int(offset), counts)
+        dist._cdf = None
+        return dist
+
+    def compact(self) -> "ScoreDistribution":
+        """Строит гистограмму и освобождает сырые сэмплы."""
+        self.histogram()
+        self._samples = None
+        return self
+
+    # ------------------- БАЗОВОЕ -------------------
+
+    @property
+    def is_compact(self) -> bool:
+        return self._samples is None
+
+    @property
+    def samples(self) -> np.ndarray:
+        """
+        Сырые сэмплы (типизированный массив, только для чтения).
+        Для компактного распределения восстанавливаются из гистограммы
+        в отсортированном порядке.
+        """
+        if self._samples is None:
+            offset, counts = self.histogram()
+            values = np.arange(offset, offset + counts.size)
+            return np.repeat(values, counts).astype(_compact_dtype(values), copy=False)
+        return self._samples
+
+    @property
+    def nbytes(self) -> int:
+        if self._samples is None:
+            return int(self.histogram()[1].nbytes)
+        return int(self._samples.nbytes)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __bool__(self) -> bool:
+        return self._n > 0
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.samples.tolist())
+
+    def __repr__(self) -> str:
+        if not self:
+            return "ScoreDistribution(n=0)"
+        storage = "histogram" if self.is_compact else str(self._samples.dtype)
+        return (f"ScoreDistribution(n={len(self)}, mean={self.mean():.2f}, "
+                f"std={self.std():.2f}, storage={storage})")
+
+    def tolist(self) -> List[int]:
+        return self.samples.tolist()
+
+    def support(self) -> Tuple[int, int]:
+        offset, counts = self.histogram()
+        return offset, offset + max(counts.size, 1) - 1
+
+    def to_serializable(self) -> List[int] | Dict[str, Any]:
+        """Представление для JSON/XLSX экспорта."""
+        if self.is_compact:
+            offset, counts = self.histogram()
+            return {"offset": offset, "counts": counts.tolist()}
+        return self.tolist()
+
+    # ------------------- СТАТИСТИКИ -------------------
+
+    def mean(self) -> float:
+        if not self:
+            return 0.0
+        if self._samples is None:
+            offset, counts = self.histogram()
+            values = np.arange(offset, offset + counts.size, dtype=np.float64)
+            return float(np.dot(values, counts) / self._n)
+        return float(self._samples.mean(dtype=np.float64))
+
+    def var(self) -> float:
+        if not self:
+            return 0.0
+        if self._samples is None:
+            offset, counts = self.histogram()
+            values = np.arange(offset, offset + counts.size, dtype=np.float64)
+            centered = values - self.mean()
+            return float(np.dot(centered * centered, counts) / self._n)
+        return float(self._samples.var(dtype=np.float64))
+
+    def histogram(self) -> Tuple[int, np.ndarray]:
+        """
+        Возвращает (offset, counts):
+            counts[i] — сколько симуляций дали значение offset + i.
+        """
+        if self._histogram is None:
+            if not self:
+                self._histogram = (0, np.zeros(0, dtype=np.int64))
+            else:
+                offset = int(self._samples.min())
+                counts = np.bincount(self._samples.astype(np.int64) - offset)
+                self._histogram = (offset, counts)
+        return self._histogram
+
+    # ------------------- CDF / ВЕРОЯТНОСТИ -------------------
+
+    def cdf_table(self) -> Tuple[int, np.ndarray]:
+        """
+        Возвращает (offset, cum):
+            cum[i] = P(X <= offset + i - 1), cum[0] = 0, cum[-1] = 1.
+        """
+        offset, counts = self.histogram()
+        if self._cdf is None:
+            cum = np.zeros(counts.size + 1, dtype=np.float64)
+            if counts.size:
+                np.cumsum(counts, out=cum[1:])
+                cum /= cum[-1]
+            self._cdf = cum
+        return offset, self._cdf
+
+    def prob_at_most(self, x: Lines):
+        """P(X <= x). Принимает число или массив линий."""
+        if not self:
+            return 0.0 if np.ndim(x) == 0 else np.zeros(np.shape(x))
+        offset, cum = self.cdf_table()
+        idx = np.floor(np.asarray(x, dtype=np.float64)).astype(np.int64) - offset + 1
+        res = cum[np.clip(idx, 0, cum.size - 1)]
+        return float(res) if res.ndim == 0 else res
+
+    def prob_over(self, line: Lines):
+        if not self:
+            return 0.0 if np.ndim(line) == 0 else np.zeros(np.shape(line))
+        return super().prob_over(line)
+
+    def prob_under(self, line: Lines):
+        if not self:
+            return 0.0 if np.ndim(line) == 0 else np.zeros(np.shape(line))
+        return super().prob_under(line)
+
+
+_normal_cdf_many = np.vectorize(normal_cdf, otypes=[np.float64])
+
+
+class DiscreteNormalDistribution(Distribution):
+    """
+    Аналитическое распределение: нормальное N(mu, sigma), округлённое
+    до целых. Вероятности считаются в закрытой форме с поправкой
+    на непрерывность:
+        P(X <= k) = Φ((floor(k) + 0.5 − mu) / sigma)
+
+    Используется в analytic-режиме SimulationModel, когда пол
+    MIN_TEAM_SCORE практически не срабатывает.
+    """
+
+    __slots__ = ("mu", "sigma")
+
+    def __init__(self, mu: float, sigma: float):
+        self.mu = float(mu)
+        self.sigma = float(sigma)
+
+    def __bool__(self) -> bool:
+        return self.sigma > 0
+
+    def __repr__(self) -> str:
+        return f"DiscreteNormalDistribution(mu={self.mu:.2f}, sigma={self.sigma:.2f})"
+
+    def mean(self) -> float:
+        return self.mu
+
+    def var(self) -> float:
+        return self.sigma ** 2
+
+    def support(self) -> Tuple[int, int]:
+        # ±4 sigma: за пределами вероятность ~6e-5
+        return (int(np.floor(self.mu - 4 * self.sigma)),
+                int(np.ceil(self.mu + 4 * self.sigma)))
+
+    def prob_at_most(self, x: Lines):
+        k = np.floor(np.asarray(x, dtype=np.float64)) + 0.5
+        if k.ndim == 0:
+            return normal_cdf(float(k), mu=self.mu, sigma=self.sigma)
+        return _normal_cdf_many(k, self.mu, self.sigma)
+
+    def to_serializable(self) -> Dict[str, float]:
+        return {"mean": self.mu, "std": self.sigma}
+
@@ -3,7 +3,10 @@ from dataclasses import dataclass
 from typing import Optional
 import math
 
+import numpy as np
+
 from core.context import GameContext
+from core.slate import Slate
 
 
 @dataclass
@@ -35,6 +38,16 @@ class ExpectedModel:
       темп.
     """
 
+    INPUTS = (
+        "rating_home", "rating_away", "home_court_adv",
+        "fatigue_home", "fatigue_away",
+        "lineup_home", "lineup_away",
+        "motivation_home", "motivation_away",
+        "shot_quality_delta",
+        "pace_match", "league_avg_pace",
+    )
+    OUTPUTS = ("expected_diff",)
+
     def __init__(self, config: Optional[ExpectedConfig] = None):
         self.cfg = config or ExpectedConfig()
 
@@ -96,3 +109,47 @@ class ExpectedModel:
         expected_diff *= pace_factor
 
         context.set_output("expected_diff", expected_diff)
+
+    def process_batch(self, slate: Slate):
+        """
+        То же, что process, но для всего слейта:
+        Elo → очки, поправки и темп считаются по столбцам.
+        """
+        rating_diff = slate.feature("rating_home") - slate.feature("rating_away")
+        home_court = slate.feature("home_court_adv")
+
+        # Elo → дифф очков
+        if self.cfg.elo_point_scale > 0:
+            p_home_elo = 1.0 / (1.0 + np.power(10.0, -rating_diff / self.cfg.elo_point_scale))
+            elo_diff = (p_home_elo - 0.5) * 2.0 * self.cfg.base_point_spread
+        else:
+            elo_diff = rating_diff
+
+        base_diff = elo_diff * self.cfg.rating_scale + home_court
+
+        fatigue_adj = (slate.feature("fatigue_home") - slate.feature("fatigue_away")) \
+            * self.cfg.fatigue_weight
+        lineup_adj = (slate.feature("lineup_home") - slate.feature("lineup_away")) \
+            * self.cfg.lineup_weight
+        motivation_adj = (slate.feature("motivation_home") - slate.feature("motivation_away")) \
+            * self.cfg.motivation_weight
+        shot_quality_adj = slate.feature("shot_quality_delta") * self.cfg.shot_quality_weight
+
+        # ---------- ТЕМП ----------
+        pace_match = slate.feature("pace_match", 100.0)
+        league_pace = slate.feature("league_avg_pace", 100.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative_pace = pace_match / league_pace
+        pace_factor = np.where(league_pace > 0,
+                               1.0 + (relative_pace - 1.0) * self.cfg.pace_weight, 1.0)
+
+        expected_diff = (
+            base_diff
+            + fatigue_adj
+            + lineup_adj
+            + motivation_adj
+            + shot_quality_adj
+        )
+
+        slate.set_output("expected_diff", expected_diff * pace_factor)
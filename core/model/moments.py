@@ -0,0 +1,113 @@
+# core/model/moments.py
+
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class RunningMoments:
+    """
+    Потоковые моменты распределения (Welford / Terriberry).
+
+    Позволяет посчитать mean / var / skewness / kurtosis за один проход,
+    не храня сэмплы:
+      - push(x)          — по одному значению (эталонный цикл)
+      - push_batch(arr)  — целым массивом (векторный движок)
+      - merge(other)     — объединение независимых кусков (Chan / Pébay)
+
+    m2, m3, m4 — суммы центральных степеней (не нормированные на n).
+    """
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    m3: float = 0.0
+    m4: float = 0.0
+
+    # ------------------- ОБНОВЛЕНИЕ -------------------
+
+    def push(self, x: float):
+        n1 = self.n
+        self.n += 1
+        n = self.n
+
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+
+        self.mean += delta_n
+        self.m4 += (term1 * delta_n2 * (n * n - 3 * n + 3)
+                    + 6 * delta_n2 * self.m2 - 4 * delta_n * self.m3)
+        self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+
+    def push_batch(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        mean = float(values.mean())
+        centered = values - mean
+        sq = centered * centered
+        batch = RunningMoments(
+            n=int(values.size),
+            mean=mean,
+            m2=float(sq.sum()),
+            m3=float(np.dot(sq, centered)),
+            m4=float(np.dot(sq, sq)),
+        )
+        self.merge(batch)
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """Добавляет к себе моменты другого куска и возвращает self."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean = other.n, other.mean
+            self.m2, self.m3, self.m4 = other.m2, other.m3, other.m4
+            return self
+
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+
+        m2 = self.m2 + other.m2 + delta2 * na * nb / n
+        m3 = (self.m3 + other.m3
+              + delta * delta2 * na * nb * (na - nb) / (n * n)
+              + 3.0 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4
+              + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / (n ** 3)
+              + 6.0 * delta2 * (na * na * other.m2 + nb * nb * self.m2) / (n * n)
+              + 4.0 * delta * (na * other.m3 - nb * self.m3) / n)
+
+        self.n = n
+        self.mean += delta * nb / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        return self
+
+    # ------------------- СТАТИСТИКИ -------------------
+
+    @property
+    def var(self) -> float:
+        """Дисперсия (популяционная, как у np.var)."""
+        return self.m2 / self.n if self.n else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+    @property
+    def skewness(self) -> float:
+        if self.n == 0 or self.m2 <= 0:
+            return 0.0
+        return math.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+
+    @property
+    def kurtosis(self) -> float:
+        """Эксцесс (для нормального распределения ≈ 0)."""
+        if self.n == 0 or self.m2 <= 0:
+            return 0.0
+        return self.n * self.m4 / (self.m2 * self.m2) - 3.0
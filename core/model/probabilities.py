@@ -4,6 +4,7 @@ from typing import Optional
 import math
 
 from core.context import GameContext
+from core.model.distribution import Distribution
 
 
 @dataclass
@@ -20,6 +21,12 @@ class ProbabilityConfig:
 
 
 class ProbabilityModel:
+    INPUTS = ("expected_diff", "mc_diff_std", "mc_diff_distribution", "mc_win_prob_home")
+    OUTPUTS = (
+        "win_prob_home_logistic", "win_prob_home", "win_prob_away",
+        "diff_std_estimate", "mc_vs_model_gap",
+    )
+
     def __init__(self, config: Optional[ProbabilityConfig] = None):
         self.cfg = config or ProbabilityConfig()
 
@@ -32,9 +39,16 @@ class ProbabilityModel:
         # -----------------------------
         #   Дисперсия по Монте-Карло
         # -----------------------------
+        # SimulationModel публикует std диффа как самостоятельный выход,
+        # повторный проход по сэмплам нужен только для старых контекстов
+        mc_diff_std = context.model_outputs.get("mc_diff_std")
         mc_diffs = context.model_outputs.get("mc_diff_distribution")
         diff_std = None
-        if isinstance(mc_diffs, (list, tuple)) and mc_diffs:
+        if isinstance(mc_diff_std, (int, float)):
+            diff_std = math.sqrt(max(mc_diff_std ** 2, 1e-6))
+        elif isinstance(mc_diffs, Distribution) and mc_diffs:
+            diff_std = math.sqrt(max(mc_diffs.var(), 1e-6))
+        elif isinstance(mc_diffs, (list, tuple)) and mc_diffs:
             m = sum(mc_diffs) / len(mc_diffs)
             var = sum((x - m) ** 2 for x in mc_diffs) / len(mc_diffs)
             diff_std = math.sqrt(max(var, 1e-6))
@@ -0,0 +1,44 @@
+# core/model/rng.py
+
+from __future__ import annotations
+import hashlib
+import random
+import secrets
+from typing import Tuple
+
+import numpy as np
+
+
+def new_master_seed() -> int:
+    """Случайный master seed (63 бита — безопасно для JSON/Excel)."""
+    return secrets.randbits(63)
+
+
+def _game_spawn_key(game_id) -> Tuple[int, ...]:
+    """
+    Стабильный ключ потока для матча.
+
+    hash() в Python солится при каждом запуске, поэтому используем
+    sha256 от game_id: одинаковый ключ в любом процессе и на любой машине.
+    """
+    digest = hashlib.sha256(str(game_id).encode("utf-8")).digest()
+    return tuple(int.from_bytes(digest[i:i + 4], "little") for i in range(0, 16, 4))
+
+
+def game_seed_sequence(master_seed: int, game_id) -> np.random.SeedSequence:
+    """
+    Независимый подпоток матча: SeedSequence(master_seed) с spawn_key от game_id.
+    Зависит только от (master_seed, game_id) — не от порядка обработки.
+    """
+    return np.random.SeedSequence(master_seed, spawn_key=_game_spawn_key(game_id))
+
+
+def game_generator(master_seed: int, game_id) -> np.random.Generator:
+    """numpy-генератор для векторного движка."""
+    return np.random.default_rng(game_seed_sequence(master_seed, game_id))
+
+
+def game_random(master_seed: int, game_id) -> random.Random:
+    """random.Random для эталонного движка (тот же подпоток, что и у numpy)."""
+    state = game_seed_sequence(master_seed, game_id).generate_state(4, dtype=np.uint32)
+    return random.Random(int.from_bytes(state.tobytes(), "little"))
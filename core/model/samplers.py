@@ -0,0 +1,286 @@
+# core/model/samplers.py
+
+from __future__ import annotations
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# ========================================
+# ОБРАТНАЯ ФУНКЦИЯ НОРМАЛЬНОГО РАСПРЕДЕЛЕНИЯ
+# ========================================
+# Рациональная аппроксимация Acklam: относительная ошибка < 1.2e-9
+# на всём (0, 1), без scipy.
+
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+
+_P_LOW = 0.02425
+
+
+def norm_ppf(u: np.ndarray) -> np.ndarray:
+    """Φ⁻¹(u) для массива u из (0, 1)."""
+    u = np.asarray(u, dtype=np.float64)
+    z = np.empty_like(u)
+
+    low = u < _P_LOW
+    high = u > 1.0 - _P_LOW
+    mid = ~(low | high)
+
+    # центральная часть
+    q = u[mid] - 0.5
+    r = q * q
+    num = (((((_A[0] * r + _A[1]) * r + _A[2]) * r + _A[3]) * r + _A[4]) * r + _A[5]) * q
+    den = ((((_B[0] * r + _B[1]) * r + _B[2]) * r + _B[3]) * r + _B[4]) * r + 1.0
+    z[mid] = num / den
+
+    # хвосты (симметрично)
+    for mask, sign, p in ((low, 1.0, u[low]), (high, -1.0, 1.0 - u[high])):
+        q = np.sqrt(-2.0 * np.log(p))
+        num = ((((_C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5]
+        den = (((_D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1.0
+        z[mask] = sign * num / den
+
+    return z
+
+
+# ========================================
+# КВАЗИСЛУЧАЙНЫЕ ПОСЛЕДОВАТЕЛЬНОСТИ (2 измерения)
+# ========================================
+
+_SOBOL_BITS = 32
+
+
+def _sobol_directions() -> np.ndarray:
+    """
+    Направляющие числа Соболя для двух измерений (32 бита):
+      1-е — ван дер Корпут по основанию 2 (m_k = 1),
+      2-е — примитивный многочлен x + 1 (m_1 = 1, m_k = 2 m_{k-1} xor m_{k-1}).
+    """
+    v = np.zeros((2, _SOBOL_BITS), dtype=np.uint64)
+    m = 1
+    for k in range(1, _SOBOL_BITS + 1):
+        v[0, k - 1] = 1 << (_SOBOL_BITS - k)
+        if k > 1:
+            m = (m << 1) ^ m
+        v[1, k - 1] = m << (_SOBOL_BITS - k)
+    return v
+
+
+_SOBOL_V = _sobol_directions()
+
+
+def sobol_points(start: int, n: int, shifts: np.ndarray) -> np.ndarray:
+    """
+    Точки start .. start+n-1 двумерной последовательности Соболя
+    для каждого цифрового сдвига из shifts (r, 2) (uint64, xor).
+    Результат (n · r, 2) в (0, 1), копии чередуются: строка i — копия i % r.
+    """
+    index = np.arange(start, start + n, dtype=np.uint64)
+    bits = np.zeros((n, 2), dtype=np.uint64)
+    for k in range(int(start + n).bit_length()):
+        bit = (index >> np.uint64(k)) & np.uint64(1)
+        bits ^= bit[:, None] * _SOBOL_V[:, k]
+    shifted = bits[:, None, :] ^ shifts[None, :, :]
+    # середина ячейки: никогда не 0 и не 1
+    return (shifted.reshape(-1, 2).astype(np.float64) + 0.5) / float(1 << _SOBOL_BITS)
+
+
+def _radical_inverse(index: np.ndarray, base: int) -> np.ndarray:
+    result = np.zeros(index.shape, dtype=np.float64)
+    f = 1.0 / base
+    i = index.copy()
+    while i.any():
+        result += f * (i % base)
+        i //= base
+        f /= base
+    return result
+
+
+def halton_points(start: int, n: int, shifts: np.ndarray) -> np.ndarray:
+    """
+    Точки двумерной последовательности Холтона (основания 2 и 3),
+    начиная с индекса start + 1 (точка 0 вырождена), для каждого сдвига
+    Крэнли–Паттерсона из shifts (r, 2): (u + shift) mod 1.
+    Результат (n · r, 2) в (0, 1), копии чередуются, как в sobol_points.
+    """
+    index = np.arange(start + 1, start + n + 1, dtype=np.int64)
+    u = np.column_stack((_radical_inverse(index, 2), _radical_inverse(index, 3)))
+    shifted = (u[:, None, :] + shifts[None, :, :]).reshape(-1, 2)
+    shifted -= np.floor(shifted)
+    return np.clip(shifted, 1e-12, 1.0 - 1e-12)
+
+
+# ========================================
+# SAMPLERS
+# ========================================
+# Сэмплер выдаёт пары стандартных нормалей (n, 2) пачками и знает,
+# как оценить стандартную ошибку среднего по своим точкам:
+# у антитетических пар и у QMC точки не независимы, поэтому
+# биномиальная формула sqrt(p (1 - p) / n) для них неверна.
+
+class PseudoSampler:
+    """Обычные псевдослучайные нормали; точки независимы."""
+
+    block = 1
+
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+
+    def draw(self, n: int) -> np.ndarray:
+        return self.rng.standard_normal(size=(n, 2))
+
+    def counter(self) -> "HitCounter":
+        return HitCounter()
+
+
+class AntitheticSampler(PseudoSampler):
+    """
+    Антитетические пары: за z сразу идёт −z.
+    Для монотонных событий (победа, фора, over) половины пары
+    отрицательно коррелированы, и дисперсия среднего падает.
+    """
+
+    block = 2
+
+    def draw(self, n: int) -> np.ndarray:
+        if n % 2:
+            raise ValueError("AntitheticSampler: n must be even")
+        z = self.rng.standard_normal(size=(n // 2, 2))
+        out = np.empty((n, 2), dtype=np.float64)
+        out[0::2] = z
+        out[1::2] = -z
+        return out
+
+    def counter(self) -> "HitCounter":
+        return GroupHitCounter(group=2)
+
+
+class QuasiSampler(PseudoSampler):
+    """
+    Рандомизированный квази-Монте-Карло: replicates независимо сдвинутых
+    копий последовательности (Соболь — цифровой сдвиг, Холтон — сдвиг
+    Крэнли–Паттерсона), точки чередуются: i-я точка — копия i % replicates.
+    Ошибка оценивается по разбросу средних между копиями.
+    Нормали — через norm_ppf.
+    """
+
+    def __init__(self, rng: np.random.Generator, kind: str = "sobol", replicates: int = 8):
+        super().__init__(rng)
+        if kind not in ("sobol", "halton"):
+            raise ValueError(f"QuasiSampler: unknown kind '{kind}'")
+        self.kind = kind
+        self.block = replicates
+        self._position = 0
+        if kind == "sobol":
+            self._shifts = rng.integers(0, 1 << _SOBOL_BITS, size=(replicates, 2), dtype=np.uint64)
+        else:
+            self._shifts = rng.random(size=(replicates, 2))
+
+    def draw(self, n: int) -> np.ndarray:
+        r = self.block
+        if n % r:
+            raise ValueError(f"QuasiSampler: n must be a multiple of {r}")
+        points = sobol_points if self.kind == "sobol" else halton_points
+        u = points(self._position, n // r, self._shifts)
+        self._position += n // r
+        return norm_ppf(u)
+
+    def counter(self) -> "HitCounter":
+        return ReplicateHitCounter(replicates=self.block)
+
+
+SAMPLERS = ("pseudo", "antithetic", "sobol", "halton")
+
+
+def make_sampler(kind: str, rng: np.random.Generator, replicates: int = 8) -> PseudoSampler:
+    if kind == "pseudo":
+        return PseudoSampler(rng)
+    if kind == "antithetic":
+        return AntitheticSampler(rng)
+    if kind in ("sobol", "halton"):
+        return QuasiSampler(rng, kind, replicates)
+    raise ValueError(f"make_sampler: unknown sampler '{kind}'")
+
+
+# ========================================
+# ОЦЕНКА ОШИБКИ
+# ========================================
+
+class HitCounter:
+    """
+    Накопитель «успехов» по событиям (значения 0 / 0.5 / 1 на симуляцию)
+    для независимых точек: SE = sqrt(p (1 - p) / n).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.hits: Dict[str, float] = {}
+
+    def add(self, indicators: Dict[str, np.ndarray]):
+        size = None
+        for name, values in indicators.items():
+            self.hits[name] = self.hits.get(name, 0.0) + float(values.sum())
+            size = values.size
+        self.n += size or 0
+
+    def standard_errors(self) -> Dict[str, float]:
+        n = self.n
+        return {name: float(np.sqrt(max(h / n * (1.0 - h / n), 0.0) / n))
+                for name, h in self.hits.items()}
+
+
+class GroupHitCounter(HitCounter):
+    """Точки идут группами по group (антитетические пары): SE по средним групп."""
+
+    def __init__(self, group: int):
+        super().__init__()
+        self.group = group
+        self._groups = 0
+        self._sq: Dict[str, float] = {}
+
+    def add(self, indicators: Dict[str, np.ndarray]):
+        super().add(indicators)
+        for name, values in indicators.items():
+            means = values.reshape(-1, self.group).mean(axis=1)
+            self._sq[name] = self._sq.get(name, 0.0) + float(np.dot(means, means))
+            groups = means.size
+        self._groups += groups
+
+    def standard_errors(self) -> Dict[str, float]:
+        g = self._groups
+        errors = {}
+        for name, h in self.hits.items():
+            mean = h / self.n
+            var = max(self._sq[name] / g - mean * mean, 0.0) * g / max(g - 1, 1)
+            errors[name] = float(np.sqrt(var / g))
+        return errors
+
+
+class ReplicateHitCounter(HitCounter):
+    """Точка i принадлежит копии i % replicates: SE по разбросу средних копий."""
+
+    def __init__(self, replicates: int):
+        super().__init__()
+        self.replicates = replicates
+        self._per_copy: Dict[str, np.ndarray] = {}
+
+    def add(self, indicators: Dict[str, np.ndarray]):
+        super().add(indicators)
+        for name, values in indicators.items():
+            sums = values.reshape(-1, self.replicates).sum(axis=0)
+            acc: Optional[np.ndarray] = self._per_copy.get(name)
+            self._per_copy[name] = sums if acc is None else acc + sums
+
+    def standard_errors(self) -> Dict[str, float]:
+        per_copy_n = self.n / self.replicates
+        return {
+            name: float(np.std(sums / per_copy_n, ddof=1) / np.sqrt(self.replicates))
+            for name, sums in self._per_copy.items()
+        }
@@ -0,0 +1,230 @@
+# core/model/sim_cache.py
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import struct
+import threading
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Версия формата записи: поменять, если меняется сама симуляция
+# (иначе в кеше останутся результаты старой модели)
+CACHE_FORMAT_VERSION = 2
+
+# (offset, counts) гистограммы
+Histogram = Tuple[int, np.ndarray]
+
+
+def simulation_cache_key(**inputs: Any) -> str:
+    """
+    Ключ записи — sha256 от всех входов симуляции.
+    float сериализуются через repr, т.е. без потери точности.
+    """
+    payload = {"v": CACHE_FORMAT_VERSION}
+    payload.update({k: repr(v) if isinstance(v, float) else v for k, v in inputs.items()})
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ========================================
+# ФОРМАТ ЗАПИСИ
+# ========================================
+#   MAGIC | u32 длина заголовка | заголовок (JSON) | float64 скаляры | counts...
+# Заголовок: {"scalars": [имена], "hist": [[имя, offset, длина, dtype], ...]}
+# Тот же формат у файла распределений экспорта (core/export/export_dist.py).
+
+_MAGIC = b"SIMC"
+_HEADER_LEN = struct.Struct("<I")
+
+
+def encode_histograms(histograms: Dict[str, Histogram], scalars: Dict[str, float]) -> bytes:
+    scalar_names = sorted(scalars)
+    hist_meta = []
+    blobs = []
+    for name in sorted(histograms):
+        offset, counts = histograms[name]
+        counts = np.asarray(counts)
+        dtype = "<u2" if counts.size and counts.max() <= np.iinfo(np.uint16).max else "<u4"
+        hist_meta.append([name, int(offset), int(counts.size), dtype])
+        blobs.append(counts.astype(dtype).tobytes())
+
+    header = json.dumps({"scalars": scalar_names, "hist": hist_meta},
+                        separators=(",", ":")).encode("utf-8")
+    values = np.array([scalars[n] for n in scalar_names], dtype="<f8").tobytes()
+    return b"".join([_MAGIC, _HEADER_LEN.pack(len(header)), header, values] + blobs)
+
+
+def decode_histograms(raw: bytes) -> Tuple[Dict[str, Histogram], Dict[str, float]]:
+    if raw[:4] != _MAGIC:
+        raise ValueError("SimulationCache: bad record")
+    (header_len,) = _HEADER_LEN.unpack_from(raw, 4)
+    pos = 8 + header_len
+    header = json.loads(raw[8:pos])
+
+    scalar_names = header["scalars"]
+    values = np.frombuffer(raw, dtype="<f8", count=len(scalar_names), offset=pos)
+    pos += values.nbytes
+    scalars = dict(zip(scalar_names, values.tolist()))
+
+    histograms: Dict[str, Histogram] = {}
+    for name, offset, size, dtype in header["hist"]:
+        counts = np.frombuffer(raw, dtype=dtype, count=size, offset=pos)
+        pos += counts.nbytes
+        histograms[name] = (offset, counts.astype(np.int64))
+
+    if pos != len(raw):
+        raise ValueError("SimulationCache: truncated record")
+    return histograms, scalars
+
+
+class SimulationCache:
+    """
+    Дисковый кеш результатов симуляции, адресуемый по содержимому.
+
+    Запись — один небольшой бинарный файл с гистограммами (offset + counts)
+    и скалярными выходами, без сырых сэмплов (~1 КБ на матч); чтение —
+    один read и np.frombuffer, заметно быстрее самой симуляции.
+    Имя файла — ключ, поэтому разные процессы могут писать в одну папку
+    (запись атомарная: временный файл + os.replace).
+
+    Вытеснение LRU по размеру: при попадании mtime файла обновляется,
+    при превышении max_bytes удаляются самые давние записи
+    до low_water * max_bytes.
+
+    Ошибка записи (нет места, нет прав) прогон не прерывает: кеш
+    переходит в режим только чтения (writable = False, текст — в write_error).
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, low_water: float = 0.8):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.low_water = low_water
+
+        # приблизительный размер кеша (None — ещё не сканировали папку)
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+        self.writable = True
+        self.write_error: Optional[str] = None
+
+    # -------------------------------------------------------
+
+    def _file(self, key: str) -> str:
+        # два уровня подпапок, чтобы не держать десятки тысяч файлов в одной
+        return os.path.join(self.path, key[:2], f"{key}.bin")
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Histogram], Dict[str, float]]]:
+        """(гистограммы, скаляры) или None, если записи нет / она битая."""
+        file = self._file(key)
+        try:
+            with open(file, "rb") as f:
+                raw = f.read()
+            entry = decode_histograms(raw)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            # недописанная или старая запись — считаем промахом
+            return None
+
+        try:
+            os.utime(file)  # LRU: запись снова «свежая»
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, histograms: Dict[str, Histogram], scalars: Dict[str, float]) -> bool:
+        """Записывает результат; False — запись не удалась (кеш дальше только читается)."""
+        if not self.writable:
+            return False
+
+        file = self._file(key)
+        raw = encode_histograms(histograms, scalars)
+        tmp = f"{file}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(raw)
+            os.replace(tmp, file)
+        except OSError as exc:
+            self.writable = False
+            self.write_error = str(exc)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+
+        self._account(len(raw))
+        return True
+
+    # -------------------------------------------------------
+    # Вытеснение
+    # -------------------------------------------------------
+
+    def _entries(self):
+        """[(mtime, size, path), ...] всех записей кеша."""
+        entries = []
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if not name.endswith(".bin"):
+                    continue
+                file = os.path.join(root, name)
+                try:
+                    st = os.stat(file)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, file))
+        return entries
+
+    def _account(self, added: int):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += added
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.low_water
+
+        for _, size, file in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        self._size = total
+
+    def clear(self):
+        """Удаляет все записи."""
+        with self._lock:
+            for _, _, file in self._entries():
+                try:
+                    os.remove(file)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+
+    # -------------------------------------------------------
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_size"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -1,9 +1,22 @@
 from __future__ import annotations
+import math
 import random
 from dataclasses import dataclass
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from core.context import GameContext
+from core.model.distribution import DiscreteNormalDistribution, ScoreDistribution
+from core.model.moments import RunningMoments
+from core.model_probabilities import normal_cdf
+from core.model.rng import game_generator, game_random, new_master_seed
+from core.model.samplers import SAMPLERS, HitCounter, PseudoSampler, make_sampler
+from core.model.sim_cache import SimulationCache, simulation_cache_key
+
+
+# Минимальный счёт команды в симуляции (защита от «хвостов» гауссианы)
+MIN_TEAM_SCORE = 60
 
 
 @dataclass
@@ -13,6 +26,79 @@ class SimulationConfig:
     pace_factor_weight: float = 0.5
     xpts_weight: float = 0.3
 
+    # Движок симуляции:
+    #   "numpy"  — векторный, все счета генерируются массивами за один проход
+    #   "python" — эталонный поштучный цикл на random.gauss
+    backend: str = "numpy"
+
+    # Master seed. Каждый матч получает собственный поток случайных чисел,
+    # производный от (seed, game_id), поэтому результат не зависит от порядка
+    # обработки и от режима (последовательно / потоки / процессы).
+    # None — seed выбирается случайно при создании модели и пишется в mc_seed.
+    seed: Optional[int] = None
+
+    # Метод расчёта:
+    #   "sample"   — Монте-Карло выбранным backend
+    #   "analytic" — закрытая форма (округлённые нормали, поправка на
+    #                непрерывность); если пол MIN_TEAM_SCORE «съедает» больше
+    #                analytic_floor_tol вероятности, матч досчитывается сэмплированием.
+    #                При массе пола ~2% расхождение с сэмплированием на вероятностях
+    #                победы/форы/тотала — сотые доли процента.
+    method: str = "sample"
+    analytic_floor_tol: float = 0.02
+
+    # Хранить ли сырые сэмплы. False — распределения сжимаются до гистограмм
+    # (ценообразованию нужна только CDF, моменты публикуются отдельно).
+    keep_samples: bool = True
+
+    # Дисковый кеш результатов (гистограммы + скаляры), только при заданном seed:
+    # те же входы и seed дают тот же результат, симуляция пропускается.
+    # В кеше нет сырых сэмплов, поэтому при включённом кеше распределения
+    # всегда компактные (keep_samples не действует): форма выгрузки
+    # не зависит от того, попал матч в кеш или нет.
+    # None — кеш выключен.
+    cache_dir: Optional[str] = None
+    cache_max_mb: float = 256.0
+
+    # Адаптивное число симуляций (только method="sample"):
+    # симулируем пачками по batch_size, пока стандартная ошибка всех
+    # вероятностей, которые оценивает ValueModel (победа, фора, тотал over),
+    # не опустится до target_se, но не больше max_simulations.
+    # Односторонний матч сходится за одну пачку, пик'ем на линии — дольше.
+    # Число симуляций зависит от линий, поэтому только в этом режиме линии —
+    # входы модели и часть ключа кеша (сдвиг линии при reprice перезапускает симуляцию).
+    # Достигнутая точность пишется в mc_num_simulations / mc_prob_se / mc_se_*.
+    # False — ровно num_simulations; результат от линий не зависит, а
+    # mc_se_cover / mc_se_over / mc_prob_se считает SimulationPrecisionModel.
+    adaptive: bool = False
+    target_se: float = 0.005
+    batch_size: int = 2000
+    max_simulations: int = 100000
+
+    # Источник нормалей для backend="numpy" (снижение дисперсии):
+    #   "pseudo"     — обычный PCG64
+    #   "antithetic" — антитетические пары (z, −z)
+    #   "sobol"      — рандомизированный Соболь (qmc_replicates сдвинутых копий)
+    #   "halton"     — рандомизированный Холтон (основания 2, 3)
+    # Та же стандартная ошибка достигается меньшим числом симуляций;
+    # mc_prob_se / mc_se_* оцениваются с учётом зависимости точек
+    # (по парам / по разбросу между копиями), так что адаптивный режим
+    # останавливается раньше. Число симуляций округляется вверх до кратного
+    # размера блока сэмплера (пара / qmc_replicates).
+    sampler: str = "pseudo"
+    qmc_replicates: int = 8
+
+    # Корреляция очков команд от общего шока темпа (фича pace_shock_sd
+    # из PaceModule: по темпу матча или явно через Game.pace_shock_sd):
+    # число владений общее, поэтому
+    # X_h = μ_h (1 + c·s) + ..., X_a = μ_a (1 + c·s) + ..., и
+    # ρ = μ_h μ_a c² / σ² при неизменной дисперсии σ² каждой команды.
+    # Тотал шире (Var = 2σ²(1 + ρ)), дифф уже (Var = 2σ²(1 − ρ)).
+    # Очки каждой команды (командные тоталы) не меняются: σ — откалиброванная
+    # полная дисперсия команды, шок темпа — её общая с соперником часть.
+    # Сэмплирование — те же две нормали + линейное преобразование (Холецкий).
+    max_score_correlation: float = 0.6
+
 
 class SimulationModel:
     """
@@ -28,15 +114,69 @@ class SimulationModel:
       variance_factor.
     """
 
+    INPUTS = ("expected_diff", "xpts_off_home", "xpts_off_away", "pace_match", "league_avg_pace",
+              "pace_shock_sd")
+    OUTPUTS = (
+        "mc_method", "mc_seed",
+        "mc_win_prob_home", "mc_win_prob_away",
+        "mc_diff_distribution", "mc_total_distribution",
+        "mc_home_pts_distribution", "mc_away_pts_distribution",
+        "mc_expected_home_pts", "mc_expected_away_pts", "mc_expected_total", "mc_expected_diff",
+        "mc_diff_std", "mc_diff_skew", "mc_diff_kurtosis",
+        "mc_total_std", "mc_total_skew", "mc_total_kurtosis",
+        "mc_num_simulations", "mc_se_win",
+        "mc_score_correlation",
+    )
+
+    # Адаптивный режим: число симуляций (и вся точность) зависит от линий
+    ADAPTIVE_INPUTS = ("spread_line", "total_line")
+    ADAPTIVE_OUTPUTS = ("mc_prob_se", "mc_se_cover", "mc_se_over")
+
+    # Вероятности под ценообразование: имя -> ключ линии в features (None — победа)
+    PRICED_PROBS = (("win", None), ("cover", "spread_line"), ("over", "total_line"))
+
+    BACKENDS = ("numpy", "python")
+    METHODS = ("sample", "analytic")
+
     def __init__(self, config: SimulationConfig | None = None):
         self.cfg = config or SimulationConfig()
+        if self.cfg.backend not in self.BACKENDS:
+            raise ValueError(f"SimulationModel: unknown backend '{self.cfg.backend}'")
+        if self.cfg.method not in self.METHODS:
+            raise ValueError(f"SimulationModel: unknown method '{self.cfg.method}'")
+        if self.cfg.sampler not in SAMPLERS:
+            raise ValueError(f"SimulationModel: unknown sampler '{self.cfg.sampler}'")
+        if self.cfg.sampler != "pseudo" and self.cfg.backend != "numpy":
+            raise ValueError("SimulationModel: sampler requires backend='numpy'")
+        self.master_seed = self.cfg.seed if self.cfg.seed is not None else new_master_seed()
+        if self.cfg.adaptive:
+            self.INPUTS = self.INPUTS + self.ADAPTIVE_INPUTS
+            self.OUTPUTS = self.OUTPUTS + self.ADAPTIVE_OUTPUTS
 
-    def _sample_team_score(self, mean_score: float, variance_factor: float) -> int:
+        self.cache: Optional[SimulationCache] = None
+        if self.cfg.cache_dir and self.cfg.seed is not None:
+            self.cache = SimulationCache(self.cfg.cache_dir,
+                                         max_bytes=int(self.cfg.cache_max_mb * 1024 * 1024))
+
+    def _sample_team_score(self, rng: random.Random, mean_score: float,
+                           variance_factor: float) -> int:
         sd = self.cfg.score_std * variance_factor
-        val = random.gauss(mean_score, sd)
-        return max(60, int(round(val)))
+        val = rng.gauss(mean_score, sd)
+        return max(MIN_TEAM_SCORE, int(round(val)))
 
-    def process(self, context: GameContext):
+    def _sample_pair(self, rng: random.Random, mean_home: float, mean_away: float,
+                     variance_factor: float, rho: float) -> Tuple[int, int]:
+        """Пара коррелированных счетов (эталон для _simulate_numpy)."""
+        sd = self.cfg.score_std * variance_factor
+        z_home = rng.gauss(0.0, 1.0)
+        z_away = rho * z_home + math.sqrt(1.0 - rho * rho) * rng.gauss(0.0, 1.0)
+        return (max(MIN_TEAM_SCORE, int(round(mean_home + sd * z_home))),
+                max(MIN_TEAM_SCORE, int(round(mean_away + sd * z_away))))
+
+    # ------------------- ПАРАМЕТРЫ -------------------
+
+    def _score_params(self, context: GameContext) -> Tuple[float, float, float]:
+        """Возвращает (mean_home, mean_away, variance_factor)."""
         expected_diff = context.model_outputs.get("expected_diff", 0.0)
 
         # -------- xPTS (качество атаки) ----------
@@ -61,48 +201,389 @@ class SimulationModel:
 
         variance_factor = max(0.8, min(2.0, pace_factor + xpts_factor))
 
-        # --------- ГОТОВИМ РАСПРЕДЕЛЕНИЯ ----------
-        total_distribution: List[int] = []
-        diff_distribution: List[int] = []
-        home_pts_dist: List[int] = []
-        away_pts_dist: List[int] = []
+        return mean_home, mean_away, variance_factor
 
-        home_wins = 0
-        away_wins = 0
+    def _score_correlation(self, context: GameContext, mean_home: float, mean_away: float,
+                           variance_factor: float) -> float:
+        """ρ очков команд от общего шока темпа: μ_h μ_a c² / σ², не больше max_score_correlation."""
+        shock = context.features.get("pace_shock_sd") or 0.0
+        if shock <= 0:
+            return 0.0
+        sd = self.cfg.score_std * variance_factor
+        rho = mean_home * mean_away * shock ** 2 / sd ** 2
+        return float(min(rho, self.cfg.max_score_correlation))
 
-        # ---------- SIMULATIONS -----------
-        for _ in range(self.cfg.num_simulations):
-            h = self._sample_team_score(mean_home, variance_factor)
-            a = self._sample_team_score(mean_away, variance_factor)
+    # ------------------- ДВИЖКИ -------------------
+
+    def _simulate_python(self, rng: random.Random, mean_home: float, mean_away: float,
+                         variance_factor: float, diff_moments: RunningMoments,
+                         total_moments: RunningMoments, n: int,
+                         rho: float = 0.0) -> Tuple[List[int], List[int]]:
+        """Эталонный движок: по одному матчу за итерацию, моменты — на лету."""
+        home_pts_dist: List[int] = []
+        away_pts_dist: List[int] = []
 
-            diff = h - a
-            total = h + a
+        for _ in range(n):
+            if rho:
+                h, a = self._sample_pair(rng, mean_home, mean_away, variance_factor, rho)
+            else:
+                h = self._sample_team_score(rng, mean_home, variance_factor)
+                a = self._sample_team_score(rng, mean_away, variance_factor)
 
             home_pts_dist.append(h)
             away_pts_dist.append(a)
-            diff_distribution.append(diff)
-            total_distribution.append(total)
+            diff_moments.push(h - a)
+            total_moments.push(h + a)
+
+        return home_pts_dist, away_pts_dist
+
+    def _simulate_numpy(self, sampler: PseudoSampler, mean_home: float, mean_away: float,
+                        variance_factor: float, n: int,
+                        rho: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Векторный движок: все симуляции одним вызовом сэмплера."""
+        sd = self.cfg.score_std * variance_factor
+
+        z = sampler.draw(n)
+        if rho:
+            # Холецкий для 2×2: z_a = ρ z_h + sqrt(1 − ρ²) z_a
+            z[:, 1] *= math.sqrt(1.0 - rho * rho)
+            z[:, 1] += rho * z[:, 0]
+
+        # для "pseudo" без корреляции побитово совпадает с rng.normal(loc, sd, (n, 2))
+        raw = z * sd + np.array((mean_home, mean_away))
+
+        # тот же max(60, round()) что и в эталонном движке
+        scores = np.maximum(np.rint(raw), MIN_TEAM_SCORE).astype(np.int64)
+        return scores[:, 0], scores[:, 1]
+
+    # ------------------- МОМЕНТЫ -------------------
+
+    @staticmethod
+    def _set_moments(context: GameContext, name: str, std: float, skew: float, kurtosis: float):
+        """Публикует моменты распределения как самостоятельные выходы."""
+        context.set_output(f"mc_{name}_std", std)
+        context.set_output(f"mc_{name}_skew", skew)
+        context.set_output(f"mc_{name}_kurtosis", kurtosis)
+
+    # ------------------- АНАЛИТИКА -------------------
+
+    def _floor_mass(self, mean_score: float, sd: float) -> float:
+        """Вероятность, что пол MIN_TEAM_SCORE сработает: P(round(X) < 60)."""
+        return normal_cdf(MIN_TEAM_SCORE - 0.5, mu=mean_score, sigma=sd)
+
+    def _process_analytic(self, context: GameContext, mean_home: float, mean_away: float,
+                          sd: float, rho: float = 0.0):
+        """
+        Закрытая форма для двух округлённых нормалей с корреляцией rho.
+        Округление добавляет к каждой команде независимую дисперсию ~1/12.
+        """
+        team_sigma = math.sqrt(sd ** 2 + 1.0 / 12.0)
+        cov = rho * sd ** 2
+        diff_sigma = math.sqrt(2.0 * (team_sigma ** 2 - cov))
+        total_sigma = math.sqrt(2.0 * (team_sigma ** 2 + cov))
+
+        home = DiscreteNormalDistribution(mean_home, team_sigma)
+        away = DiscreteNormalDistribution(mean_away, team_sigma)
+        diff = DiscreteNormalDistribution(mean_home - mean_away, diff_sigma)
+        total = DiscreteNormalDistribution(mean_home + mean_away, total_sigma)
+
+        # ничья делится пополам, как и в сэмплировании
+        p_tie = diff.prob_at_most(0) - diff.prob_at_most(-1)
+        p_home = diff.prob_over(0) + 0.5 * p_tie
+
+        context.set_output("mc_method", "analytic")
+        context.set_output("mc_win_prob_home", p_home)
+        context.set_output("mc_win_prob_away", 1.0 - p_home)
+
+        context.set_output("mc_diff_distribution", diff)
+        context.set_output("mc_total_distribution", total)
+        context.set_output("mc_home_pts_distribution", home)
+        context.set_output("mc_away_pts_distribution", away)
+
+        context.set_output("mc_expected_home_pts", mean_home)
+        context.set_output("mc_expected_away_pts", mean_away)
+        context.set_output("mc_expected_total", mean_home + mean_away)
+        context.set_output("mc_expected_diff", mean_home - mean_away)
+
+        self._set_moments(context, "diff", diff_sigma, 0.0, 0.0)
+        self._set_moments(context, "total", total_sigma, 0.0, 0.0)
+        context.set_output("mc_score_correlation", rho)
 
-            if diff > 0:
-                home_wins += 1
-            elif diff < 0:
-                away_wins += 1
+        # закрытая форма — без ошибки сэмплирования
+        self._publish_precision(context, {"mc_num_simulations": 0, "mc_prob_se": 0.0,
+                                          "mc_se_win": 0.0})
+
+    # ------------------- КЕШ / ПУБЛИКАЦИЯ -------------------
+
+    def _cache_key(self, context: GameContext, mean_home: float, mean_away: float,
+                   variance_factor: float, rho: float) -> str:
+        """Все входы, от которых зависит результат (game_id — поток RNG матча)."""
+        inputs = dict(
+            backend=self.cfg.backend,
+            num_simulations=self.cfg.num_simulations,
+            score_std=float(self.cfg.score_std),
+            seed=self.master_seed,
+            game_id=str(context.game_id),
+            mean_home=float(mean_home),
+            mean_away=float(mean_away),
+            variance_factor=float(variance_factor),
+        )
+        if self.cfg.adaptive:
+            inputs.update(
+                adaptive=True,
+                lines=self._priced_lines(context),
+                target_se=float(self.cfg.target_se),
+                batch_size=self.cfg.batch_size,
+                max_simulations=self.cfg.max_simulations,
+            )
+        if self.cfg.sampler != "pseudo":
+            inputs.update(sampler=self.cfg.sampler, qmc_replicates=self.cfg.qmc_replicates)
+        if rho:
+            inputs.update(score_correlation=float(rho))
+        return simulation_cache_key(**inputs)
+
+    def _publish_sample(self, context: GameContext, distributions, scalars):
+        """Записывает результат сэмплирования (свежий или из кеша) в context."""
+        context.set_output("mc_method", "sample")
+        context.set_output("mc_seed", self.master_seed)
+        context.set_output("mc_win_prob_home", scalars["mc_win_prob_home"])
+        context.set_output("mc_win_prob_away", scalars["mc_win_prob_away"])
+
+        for name in ("diff", "total", "home_pts", "away_pts"):
+            context.set_output(f"mc_{name}_distribution", distributions[name])
+
+        for key in ("mc_expected_home_pts", "mc_expected_away_pts",
+                    "mc_expected_total", "mc_expected_diff"):
+            context.set_output(key, scalars[key])
+
+        for name in ("diff", "total"):
+            self._set_moments(context, name, scalars[f"mc_{name}_std"],
+                              scalars[f"mc_{name}_skew"], scalars[f"mc_{name}_kurtosis"])
+
+        context.set_output("mc_score_correlation", scalars.get("mc_score_correlation", 0.0))
+        self._publish_precision(context, scalars)
+
+    def _publish_precision(self, context: GameContext, precision: Dict[str, float]):
+        """Достигнутая точность: только ключи из OUTPUTS (в фиксированном режиме — без линий)."""
+        context.set_output("mc_num_simulations", int(precision["mc_num_simulations"]))
+        for key in ("mc_prob_se",) + tuple(f"mc_se_{name}" for name, _ in self.PRICED_PROBS):
+            if key in precision and key in self.OUTPUTS:
+                context.set_output(key, precision[key])
+
+    # ------------------- ТОЧНОСТЬ / АДАПТИВНЫЙ РЕЖИМ -------------------
+
+    def _priced_lines(self, context: GameContext) -> Dict[str, Optional[float]]:
+        """Линии вероятностей, которые оценивает ValueModel (None — рынка нет)."""
+        lines: Dict[str, Optional[float]] = {}
+        for name, line_key in self.PRICED_PROBS:
+            if line_key is None:
+                lines[name] = 0.0
             else:
-                home_wins += 0.5
-                away_wins += 0.5
+                line = context.features.get(line_key)
+                lines[name] = float(line) if line is not None else None
+        return lines
+
+    @staticmethod
+    def _priced_indicators(diff: np.ndarray, total: np.ndarray,
+                           lines: Dict[str, Optional[float]]) -> Dict[str, np.ndarray]:
+        """
+        «Успех» каждой симуляции по каждой вероятности (0 / 0.5 / 1):
+          win   — победа хозяев (ничья — половина),
+          cover — diff > spread_line (как prob_over в ValueModel),
+          over  — total > total_line.
+        """
+        indicators = {"win": (diff > 0) + 0.5 * (diff == 0)}
+        if lines.get("cover") is not None:
+            indicators["cover"] = (diff > lines["cover"]).astype(np.float64)
+        if lines.get("over") is not None:
+            indicators["over"] = (total > lines["over"]).astype(np.float64)
+        return indicators
+
+    @staticmethod
+    def _precision(counter: HitCounter) -> Dict[str, float]:
+        """Достигнутая точность для публикации (mc_num_simulations, mc_prob_se, mc_se_*)."""
+        errors = counter.standard_errors()
+        precision = {"mc_num_simulations": float(counter.n), "mc_prob_se": max(errors.values())}
+        for name, se in errors.items():
+            precision[f"mc_se_{name}"] = se
+        return precision
+
+    def _simulate_adaptive(self, simulate: Callable[[int], Tuple[np.ndarray, np.ndarray]],
+                           lines: Dict[str, Optional[float]], counter: HitCounter, block: int
+                           ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Симулирует пачками до target_se по всем вероятностям из PRICED_PROBS.
+
+        После каждой пачки по текущей ошибке считается, сколько всего
+        симуляций нужно: n · (se / target_se)² (для независимых точек это
+        max p (1 - p) / target_se²), и следующая пачка сразу добирает
+        до этой оценки (кратно batch_size), а не идёт по одной пачке
+        за итерацию. Пачки кратны block — размеру блока сэмплера.
+        """
+        cfg = self.cfg
+        batch = -(-max(1, int(cfg.batch_size)) // block) * block
+        limit = max(batch, int(cfg.max_simulations))
+        target_var = cfg.target_se ** 2
+
+        homes: List[np.ndarray] = []
+        aways: List[np.ndarray] = []
+        n = 0
+        step = batch
+
+        while True:
+            h, a = simulate(step)
+            homes.append(h)
+            aways.append(a)
+            counter.add(self._priced_indicators(h - a, h + a, lines))
+            n += step
+
+            worst = max(counter.standard_errors().values())
+            if worst <= cfg.target_se or n >= limit:
+                break
+
+            needed = int(math.ceil(n * worst ** 2 / target_var)) - n
+            step = min(max(batch, -(-needed // batch) * batch), -(-(limit - n) // block) * block)
+
+        home = homes[0] if len(homes) == 1 else np.concatenate(homes)
+        away = aways[0] if len(aways) == 1 else np.concatenate(aways)
+        return home, away
+
+    # ------------------- PROCESS -------------------
+
+    def process(self, context: GameContext):
+        mean_home, mean_away, variance_factor = self._score_params(context)
+        rho = self._score_correlation(context, mean_home, mean_away, variance_factor)
 
-        n = float(self.cfg.num_simulations)
+        if self.cfg.method == "analytic":
+            sd = self.cfg.score_std * variance_factor
+            floor_mass = max(self._floor_mass(mean_home, sd), self._floor_mass(mean_away, sd))
+            if floor_mass <= self.cfg.analytic_floor_tol:
+                self._process_analytic(context, mean_home, mean_away, sd, rho)
+                return
 
-        # ---------- ЗАПИСЫВАЕМ В CONTEXT -----------
-        context.set_output("mc_win_prob_home", home_wins / n)
-        context.set_output("mc_win_prob_away", away_wins / n)
+        # ---------- КЕШ -----------
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(context, mean_home, mean_away, variance_factor, rho)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                histograms, scalars = cached
+                distributions = {
+                    name: ScoreDistribution.from_histogram(offset, counts)
+                    for name, (offset, counts) in histograms.items()
+                }
+                self._publish_sample(context, distributions, scalars)
+                return
+
+        # ---------- SIMULATIONS -----------
+        diff_moments = RunningMoments()
+        total_moments = RunningMoments()
+        # без адаптивного режима результат не зависит от линий: считаем только победу
+        lines = self._priced_lines(context) if self.cfg.adaptive else {"win": 0.0}
+
+        if self.cfg.backend == "python":
+            rng = game_random(self.master_seed, context.game_id)
+            counter = HitCounter()
+            block = 1
+
+            def simulate(n: int) -> Tuple[np.ndarray, np.ndarray]:
+                h, a = self._simulate_python(rng, mean_home, mean_away, variance_factor,
+                                             diff_moments, total_moments, n, rho)
+                return np.asarray(h, dtype=np.int64), np.asarray(a, dtype=np.int64)
+        else:
+            sampler = make_sampler(self.cfg.sampler, game_generator(self.master_seed, context.game_id),
+                                   self.cfg.qmc_replicates)
+            counter = sampler.counter()
+            block = sampler.block
+
+            def simulate(n: int) -> Tuple[np.ndarray, np.ndarray]:
+                h, a = self._simulate_numpy(sampler, mean_home, mean_away, variance_factor, n, rho)
+                diff_moments.push_batch(h - a)
+                total_moments.push_batch(h + a)
+                return h, a
+
+        if self.cfg.adaptive:
+            home, away = self._simulate_adaptive(simulate, lines, counter, block)
+        else:
+            home, away = simulate(-(-self.cfg.num_simulations // block) * block)
+            counter.add(self._priced_indicators(home - away, home + away, lines))
+
+        diff = home - away
+        total = home + away
+        n = float(home.size)
+
+        # ничья в основное время делится пополам (hits["win"] уже с половиной ничьих)
+        home_wins = counter.hits["win"]
+        away_wins = n - home_wins
+
+        distributions = {
+            "diff": ScoreDistribution(diff),
+            "total": ScoreDistribution(total),
+            "home_pts": ScoreDistribution(home),
+            "away_pts": ScoreDistribution(away),
+        }
+        scalars = {
+            "mc_win_prob_home": home_wins / n,
+            "mc_win_prob_away": away_wins / n,
+            "mc_expected_home_pts": float(home.sum()) / n,
+            "mc_expected_away_pts": float(away.sum()) / n,
+            "mc_expected_total": total_moments.mean,
+            "mc_expected_diff": diff_moments.mean,
+            "mc_diff_std": diff_moments.std,
+            "mc_diff_skew": diff_moments.skewness,
+            "mc_diff_kurtosis": diff_moments.kurtosis,
+            "mc_total_std": total_moments.std,
+            "mc_total_skew": total_moments.skewness,
+            "mc_total_kurtosis": total_moments.kurtosis,
+            "mc_score_correlation": rho,
+        }
+        scalars.update(self._precision(counter))
+
+        if cache_key is not None:
+            self.cache.put(cache_key, {name: d.histogram() for name, d in distributions.items()},
+                           scalars)
+
+        if not self.cfg.keep_samples or self.cache is not None:
+            for dist in distributions.values():
+                dist.compact()
+
+        self._publish_sample(context, distributions, scalars)
+
+
+class SimulationPrecisionModel:
+    """
+    Точность вероятностей на линиях при фиксированном числе симуляций:
+      mc_se_cover / mc_se_over — sqrt(p (1 - p) / n) по распределениям
+      SimulationModel на текущих spread_line / total_line,
+      mc_prob_se — максимум из них и mc_se_win.
+    Симуляция от линий не зависит, поэтому при reprice сдвиг линии
+    пересчитывает только этот модуль. Для antithetic / QMC биномиальная
+    ошибка — оценка сверху (mc_se_win учитывает сэмплер точно).
+    В адаптивном режиме не нужен: точность публикует SimulationModel.
+    """
+
+    INPUTS = ("mc_diff_distribution", "mc_total_distribution", "mc_num_simulations", "mc_se_win",
+              "spread_line", "total_line")
+    OUTPUTS = SimulationModel.ADAPTIVE_OUTPUTS
+
+    # имя -> (ключ линии, распределение)
+    LINES = (("cover", "spread_line", "mc_diff_distribution"),
+             ("over", "total_line", "mc_total_distribution"))
+
+    def process(self, context: GameContext):
+        n = context.model_outputs.get("mc_num_simulations") or 0
+        errors = {"win": context.model_outputs.get("mc_se_win", 0.0)}
 
-        context.set_output("mc_diff_distribution", diff_distribution)
-        context.set_output("mc_total_distribution", total_distribution)
-        context.set_output("mc_home_pts_distribution", home_pts_dist)
-        context.set_output("mc_away_pts_distribution", away_pts_dist)
+        for name, line_key, dist_key in self.LINES:
+            line = context.features.get(line_key)
+            dist = context.model_outputs.get(dist_key)
+            if line is None or not dist:
+                continue
+            se = 0.0
+            if n:
+                p = float(dist.prob_over(float(line)))
+                se = math.sqrt(max(p * (1.0 - p), 0.0) / n)
+            errors[name] = se
+            context.set_output(f"mc_se_{name}", se)
 
-        context.set_output("mc_expected_home_pts", sum(home_pts_dist) / n)
-        context.set_output("mc_expected_away_pts", sum(away_pts_dist) / n)
-        context.set_output("mc_expected_total", sum(total_distribution) / n)
-        context.set_output("mc_expected_diff", sum(diff_distribution) / n)
+        context.set_output("mc_prob_se", max(errors.values()))
@@ -1,8 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, Sequence
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from core.context import GameContext
+from core.model.distribution import Distribution, ScoreDistribution
 
 
 @dataclass
@@ -12,14 +15,55 @@ class ValueConfig:
     kelly_fraction: float = 0.25      # Fractional Kelly (¼ Kelly)
 
 
+# Лестницы альтернативных линий:
+#   (фича с рангами, распределение, (сторона «выше», сторона «ниже»), выход, тип рынка)
+ALT_LADDERS = (
+    ("alt_spreads", "mc_diff_distribution", ("home", "away"), "alt_spread_ladder", "spread"),
+    ("alt_totals", "mc_total_distribution", ("over", "under"), "alt_total_ladder", "total"),
+    ("alt_home_team_totals", "mc_home_pts_distribution", ("over", "under"),
+     "alt_home_team_total_ladder", "total"),
+    ("alt_away_team_totals", "mc_away_pts_distribution", ("over", "under"),
+     "alt_away_team_total_ladder", "total"),
+)
+
+
 class ValueModel:
     """Считает edge и Kelly для:
       - Moneyline
       - Totals (Over/Under)
       - Spread (Home/Away)
       - Team Totals (Home/Away)
+      - лестниц альтернативных спредов и тоталов (все ранги за один проход)
+
+    Единственный модуль, зависящий от коэффициентов: при обновлении
+    линий пайплайн перезапускает только его (см. run_incremental).
     """
 
+    INPUTS = (
+        "mc_win_prob_home", "mc_win_prob_away", "win_prob_home", "win_prob_away",
+        "mc_diff_distribution", "mc_total_distribution",
+        "mc_home_pts_distribution", "mc_away_pts_distribution",
+        "odds_home", "odds_away",
+        "spread_line", "spread_odds_home", "spread_odds_away",
+        "total_line", "total_over_odds", "total_under_odds",
+        "home_team_total", "home_team_total_over_odds", "home_team_total_under_odds",
+        "away_team_total", "away_team_total_over_odds", "away_team_total_under_odds",
+    ) + tuple(ladder[0] for ladder in ALT_LADDERS)
+
+    OUTPUTS = (
+        "edge_home", "kelly_home", "edge_away", "kelly_away",
+        "P_total_over", "P_total_under",
+        "total_edge_over", "total_kelly_over", "total_edge_under", "total_kelly_under",
+        "P_spread_home_cover", "P_spread_away_cover",
+        "spread_edge_home", "spread_kelly_home", "spread_edge_away", "spread_kelly_away",
+        "P_home_team_total_over", "P_home_team_total_under",
+        "home_team_total_edge_over", "home_team_total_kelly_over",
+        "home_team_total_edge_under", "home_team_total_kelly_under",
+        "P_away_team_total_over", "P_away_team_total_under",
+        "away_team_total_edge_over", "away_team_total_kelly_over",
+        "away_team_total_edge_under", "away_team_total_kelly_under",
+    ) + tuple(ladder[3] for ladder in ALT_LADDERS)
+
     def __init__(self, config: Optional[ValueConfig] = None):
         self.cfg = config or ValueConfig()
 
@@ -55,11 +99,82 @@ class ValueModel:
 
         return edge, k_fractional
 
+    def _compute_edge_kelly_many(self, p_model: np.ndarray,
+                                 odds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Векторная версия _compute_edge_kelly для массива рангов.
+        Для отсутствующих коэффициентов (NaN) edge/kelly = NaN,
+        для некорректных (≤ 1.0) kelly = 0, как в скалярной версии.
+        """
+        valid = np.isfinite(odds) & (odds > 1.0)
+        safe_odds = np.where(valid, odds, 2.0)
+
+        implied = np.where(valid, 1.0 / safe_odds, 0.0)
+        edge = (p_model - implied) * 100
+
+        b = safe_odds - 1
+        kelly_edge = b * p_model - (1 - p_model)
+        k_full = np.where(kelly_edge > 0, kelly_edge / b, 0.0)
+        k_fractional = np.maximum(0.0, k_full * self.cfg.kelly_fraction)
+        k_fractional[np.abs(edge) < self.cfg.min_edge_percent] = 0.0
+        k_fractional[~valid] = 0.0
+
+        missing = ~np.isfinite(odds)
+        edge[missing] = np.nan
+        k_fractional[missing] = np.nan
+        return edge, k_fractional
+
     @staticmethod
-    def _prob_from_distribution(dist: Sequence[float], predicate) -> float:
-        if not dist:
-            return 0.0
-        return sum(1 for x in dist if predicate(x)) / float(len(dist))
+    def _as_distribution(dist) -> Optional[Distribution]:
+        """
+        Приводит распределение к Distribution: сэмплы — к ScoreDistribution
+        (CDF-таблица строится один раз, дальше каждая линия — O(1)),
+        аналитические распределения используются как есть.
+        """
+        if isinstance(dist, Distribution):
+            return dist if dist else None
+        if isinstance(dist, (list, tuple)) and dist:
+            return ScoreDistribution(dist)
+        return None
+
+    def _price_ladder(self, rungs: List[Dict[str, float]], dist: Distribution,
+                      sides: Tuple[str, str], market: str) -> List[Dict[str, Any]]:
+        """
+        Оценивает все ранги лестницы одним векторным проходом по CDF.
+
+        rungs — [{"line": -6.5, "home": 2.3, "away": 1.6}, ...]
+        Семантика линий та же, что у основных рынков:
+          spread: home cover = diff > line, away cover = diff < line
+          total:  over = X > line, under = 1 − over
+        """
+        upper, lower = sides
+        lines = np.array([r["line"] for r in rungs], dtype=np.float64)
+        odds_upper = np.array([r.get(upper, np.nan) for r in rungs], dtype=np.float64)
+        odds_lower = np.array([r.get(lower, np.nan) for r in rungs], dtype=np.float64)
+
+        p_upper = np.asarray(dist.prob_over(lines), dtype=np.float64)
+        if market == "spread":
+            p_lower = np.asarray(dist.prob_under(lines), dtype=np.float64)
+        else:
+            p_lower = 1.0 - p_upper
+
+        edge_u, kelly_u = self._compute_edge_kelly_many(p_upper, odds_upper)
+        edge_l, kelly_l = self._compute_edge_kelly_many(p_lower, odds_lower)
+
+        ladder: List[Dict[str, Any]] = []
+        for i in range(lines.size):
+            rung: Dict[str, Any] = {"line": float(lines[i])}
+            for side, p, o, e, k in (
+                (upper, p_upper, odds_upper, edge_u, kelly_u),
+                (lower, p_lower, odds_lower, edge_l, kelly_l),
+            ):
+                rung[f"P_{side}"] = float(p[i])
+                if np.isfinite(o[i]):
+                    rung[f"odds_{side}"] = float(o[i])
+                    rung[f"edge_{side}"] = float(e[i])
+                    rung[f"kelly_{side}"] = float(k[i])
+            ladder.append(rung)
+        return ladder
 
     # ------------------- PROCESS -------------------
 
@@ -94,10 +209,10 @@ class ValueModel:
         total_line = context.features.get("total_line")
         total_over_odds = context.features.get("total_over_odds")
         total_under_odds = context.features.get("total_under_odds")
-        total_dist = context.model_outputs.get("mc_total_distribution")
+        total_dist = self._as_distribution(context.model_outputs.get("mc_total_distribution"))
 
         if total_line is not None and total_dist:
-            p_over = self._prob_from_distribution(total_dist, lambda x: x > total_line)
+            p_over = total_dist.prob_over(total_line)
             p_under = 1 - p_over
 
             context.set_output("P_total_over", p_over)
@@ -119,11 +234,11 @@ class ValueModel:
         spread_line = context.features.get("spread_line")
         spread_odds_home = context.features.get("spread_odds_home")
         spread_odds_away = context.features.get("spread_odds_away")
-        diff_dist = context.model_outputs.get("mc_diff_distribution")
+        diff_dist = self._as_distribution(context.model_outputs.get("mc_diff_distribution"))
 
         if spread_line is not None and diff_dist:
-            p_home_cover = self._prob_from_distribution(diff_dist, lambda d: d > spread_line)
-            p_away_cover = self._prob_from_distribution(diff_dist, lambda d: d < spread_line)
+            p_home_cover = diff_dist.prob_over(spread_line)
+            p_away_cover = diff_dist.prob_under(spread_line)
 
             context.set_output("P_spread_home_cover", p_home_cover)
             context.set_output("P_spread_away_cover", p_away_cover)
@@ -144,10 +259,10 @@ class ValueModel:
         home_tt = context.features.get("home_team_total")
         home_tt_over = context.features.get("home_team_total_over_odds")
         home_tt_under = context.features.get("home_team_total_under_odds")
-        home_pts_dist = context.model_outputs.get("mc_home_pts_distribution")
+        home_pts_dist = self._as_distribution(context.model_outputs.get("mc_home_pts_distribution"))
 
         if home_tt is not None and home_pts_dist:
-            p_over = self._prob_from_distribution(home_pts_dist, lambda x: x > home_tt)
+            p_over = home_pts_dist.prob_over(home_tt)
             p_under = 1 - p_over
 
             context.set_output("P_home_team_total_over", p_over)
@@ -169,10 +284,10 @@ class ValueModel:
         away_tt = context.features.get("away_team_total")
         away_tt_over = context.features.get("away_team_total_over_odds")
         away_tt_under = context.features.get("away_team_total_under_odds")
-        away_pts_dist = context.model_outputs.get("mc_away_pts_distribution")
+        away_pts_dist = self._as_distribution(context.model_outputs.get("mc_away_pts_distribution"))
 
         if away_tt is not None and away_pts_dist:
-            p_over = self._prob_from_distribution(away_pts_dist, lambda x: x > away_tt)
+            p_over = away_pts_dist.prob_over(away_tt)
             p_under = 1 - p_over
 
             context.set_output("P_away_team_total_over", p_over)
@@ -187,3 +302,13 @@ class ValueModel:
                 e, k = self._compute_edge_kelly(p_under, away_tt_under)
                 context.set_output("away_team_total_edge_under", e)
                 context.set_output("away_team_total_kelly_under", k)
+
+        # ---------------------------------------------------------
+        # 6) ALT LINES (лестницы спредов и тоталов)
+        # ---------------------------------------------------------
+        for feature_key, dist_key, sides, output_key, market in ALT_LADDERS:
+            rungs = context.features.get(feature_key)
+            dist = self._as_distribution(context.model_outputs.get(dist_key))
+
+            if rungs and dist:
+                context.set_output(output_key, self._price_ladder(rungs, dist, sides, market))
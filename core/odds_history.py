@@ -0,0 +1,307 @@
+# core/odds_history.py
+
+from __future__ import annotations
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from parsers.odds_parser import LADDER_SIDES
+
+
+# Одна запись (тик) — 32 байта:
+#   ts     — время, секунды UTC (epoch)
+#   game   — индекс game_id в словаре games.txt
+#   market — индекс рынка в словаре markets.txt
+#   side   — сторона (SIDES)
+#   line   — линия (NaN для moneyline)
+#   price  — decimal odds
+TICK_DTYPE = np.dtype([
+    ("ts", "<f8"),
+    ("game", "<u4"),
+    ("market", "<u2"),
+    ("side", "u1"),
+    ("_pad", "u1"),
+    ("line", "<f8"),
+    ("price", "<f8"),
+])
+
+SIDES = ("home", "away", "over", "under")
+_SIDE_CODE = {side: i for i, side in enumerate(SIDES)}
+
+# Основные рынки в записи parse_odds_entry:
+#   рынок -> (ключ линии или None, ((сторона, ключ цены), ...))
+MAIN_MARKETS: Dict[str, Tuple[Optional[str], Tuple[Tuple[str, str], ...]]] = {
+    "moneyline": (None, (("home", "home"), ("away", "away"))),
+    "spread": ("spread_line", (("home", "spread_odds_home"), ("away", "spread_odds_away"))),
+    "total": ("total_line", (("over", "total_over_odds"), ("under", "total_under_odds"))),
+    "home_team_total": ("home_team_total", (("over", "home_team_total_over_odds"),
+                                            ("under", "home_team_total_under_odds"))),
+    "away_team_total": ("away_team_total", (("over", "away_team_total_over_odds"),
+                                            ("under", "away_team_total_under_odds"))),
+}
+
+Timestamp = Union[float, datetime, None]
+
+# (рынок, сторона, линия, цена)
+Quote = Tuple[str, str, float, float]
+
+
+def _to_ts(value: Timestamp) -> float:
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def iter_entry_quotes(entry: Dict[str, Any]) -> Iterable[Quote]:
+    """Раскладывает запись parse_odds_entry на котировки (рынок, сторона, линия, цена)."""
+    for market, (line_key, sides) in MAIN_MARKETS.items():
+        if line_key is None:
+            line = float("nan")
+        elif line_key in entry:
+            line = float(entry[line_key])
+        else:
+            continue
+        for side, price_key in sides:
+            if price_key in entry:
+                yield market, side, line, float(entry[price_key])
+
+    # лестницы: рынок = ключ лестницы (alt_spreads, alt_totals, ...)
+    for market, sides in LADDER_SIDES.items():
+        for rung in entry.get(market) or ():
+            for side in sides:
+                if side in rung:
+                    yield market, side, float(rung["line"]), float(rung[side])
+
+
+def _line_value(line: float) -> Optional[float]:
+    # NaN != NaN, поэтому линию moneyline сравниваем как None
+    return None if line != line else line
+
+
+class OddsHistory:
+    """
+    Append-only хранилище движения линий.
+
+    Папка:
+      ticks.bin    — массив записей TICK_DTYPE (читается через np.memmap)
+      games.txt    — словарь game_id (номер строки = индекс)
+      markets.txt  — словарь рынков
+
+    Время тиков не убывает, поэтому выборка по времени — бинарный поиск
+    по столбцу ts. Для выборки по матчу ведётся индекс game -> номера строк:
+    строится один раз при открытии и дополняется при каждой записи.
+
+    По умолчанию пишется только изменение. Серия основного рынка —
+    (матч, рынок, сторона): тик пишется, если (линия, цена) отличается от
+    последнего тика серии, поэтому линия, ушедшая и вернувшаяся, снова
+    попадает в файл. У лестниц ранги существуют одновременно, поэтому
+    серия — (матч, рынок, сторона, линия), сравнивается цена.
+    Поминутный опрос неизменной линии места не занимает.
+    """
+
+    TICKS_FILE = "ticks.bin"
+    GAMES_FILE = "games.txt"
+    MARKETS_FILE = "markets.txt"
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self.games: List[str] = self._load_names(self.GAMES_FILE)
+        self.markets: List[str] = self._load_names(self.MARKETS_FILE)
+        self._game_index = {g: i for i, g in enumerate(self.games)}
+        self._market_index = {m: i for i, m in enumerate(self.markets)}
+
+        self._ticks_path = os.path.join(path, self.TICKS_FILE)
+        self._repair_tail()
+
+        self._lock = threading.Lock()
+        self._view: Optional[np.ndarray] = None
+
+        # номера строк по матчу (в порядке записи, т.е. по времени)
+        self._rows_by_game: Dict[int, List[int]] = {}
+        # последний тик серии: ключ серии -> (линия, цена)
+        self._last: Dict[Tuple, Tuple[Optional[float], float]] = {}
+        self._last_ts = float("-inf")
+        ticks = self.ticks()
+        if ticks.size:
+            self._last_ts = float(ticks["ts"][-1])
+            for row, (g, m, s, line, price) in enumerate(zip(
+                    ticks["game"].tolist(), ticks["market"].tolist(), ticks["side"].tolist(),
+                    ticks["line"].tolist(), ticks["price"].tolist())):
+                self._rows_by_game.setdefault(g, []).append(row)
+                self._last[self._series_key(g, m, s, line)] = (_line_value(line), price)
+
+    # -------------------------------------------------------
+    # Словари
+    # -------------------------------------------------------
+
+    def _load_names(self, name: str) -> List[str]:
+        file = os.path.join(self.path, name)
+        if not os.path.exists(file):
+            return []
+        with open(file, "r", encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f if line.rstrip("\n")]
+
+    def _intern(self, value: str, names: List[str], index: Dict[str, int], file: str) -> int:
+        code = index.get(value)
+        if code is None:
+            code = len(names)
+            names.append(value)
+            index[value] = code
+            with open(os.path.join(self.path, file), "a", encoding="utf-8") as f:
+                f.write(value + "\n")
+        return code
+
+    def _repair_tail(self):
+        """Обрезает недописанную запись в конце файла (после сбоя)."""
+        if not os.path.exists(self._ticks_path):
+            return
+        size = os.path.getsize(self._ticks_path)
+        extra = size % TICK_DTYPE.itemsize
+        if extra:
+            with open(self._ticks_path, "r+b") as f:
+                f.truncate(size - extra)
+
+    def _series_key(self, game: int, market: int, side: int, line: float) -> Tuple:
+        if self.markets[market] in LADDER_SIDES:
+            return game, market, side, _line_value(line)
+        return game, market, side
+
+    # -------------------------------------------------------
+    # Запись
+    # -------------------------------------------------------
+
+    def append_snapshot(self, snapshot: Dict[str, Dict[str, Any]], ts: Timestamp = None,
+                        only_changes: bool = True) -> int:
+        """
+        Записывает снимок линий в формате load_odds: {game_id: запись}.
+        Время одно на весь снимок и не может быть меньше уже записанного.
+        Возвращает число записанных тиков.
+        """
+        return self._append(
+            ((game_id, iter_entry_quotes(entry)) for game_id, entry in snapshot.items()),
+            ts, only_changes,
+        )
+
+    def append_quotes(self, game_id: str, quotes: Iterable[Quote], ts: Timestamp = None,
+                      only_changes: bool = True) -> int:
+        """Записывает котировки (рынок, сторона, линия, цена) одного матча."""
+        return self._append([(game_id, quotes)], ts, only_changes)
+
+    def _append(self, items: Iterable[Tuple[str, Iterable[Quote]]], ts: Timestamp,
+                only_changes: bool) -> int:
+        ts = _to_ts(ts)
+        rows: List[Tuple] = []
+
+        with self._lock:
+            if ts < self._last_ts:
+                raise ValueError(f"OddsHistory: timestamp {ts} is older than last tick {self._last_ts}")
+
+            for game_id, quotes in items:
+                game = self._intern(str(game_id), self.games, self._game_index, self.GAMES_FILE)
+                for market_name, side_name, line, price in quotes:
+                    market = self._intern(market_name, self.markets, self._market_index,
+                                          self.MARKETS_FILE)
+                    side = _SIDE_CODE[side_name]
+                    key = self._series_key(game, market, side, line)
+                    quote = (_line_value(line), price)
+                    if only_changes and self._last.get(key) == quote:
+                        continue
+                    self._last[key] = quote
+                    rows.append((ts, game, market, side, 0, line, price))
+
+            if not rows:
+                return 0
+
+            block = np.array(rows, dtype=TICK_DTYPE)
+            with open(self._ticks_path, "ab") as f:
+                first = f.tell() // TICK_DTYPE.itemsize
+                f.write(block.tobytes())
+
+            for offset, row in enumerate(rows):
+                self._rows_by_game.setdefault(row[1], []).append(first + offset)
+            self._last_ts = ts
+            self._view = None
+
+        return len(rows)
+
+    # -------------------------------------------------------
+    # Чтение
+    # -------------------------------------------------------
+
+    def ticks(self) -> np.ndarray:
+        """Все тики (memmap только для чтения)."""
+        view = self._view
+        if view is None:
+            if not os.path.exists(self._ticks_path) or os.path.getsize(self._ticks_path) == 0:
+                view = np.zeros(0, dtype=TICK_DTYPE)
+            else:
+                view = np.memmap(self._ticks_path, dtype=TICK_DTYPE, mode="r")
+            self._view = view
+        return view
+
+    def __len__(self) -> int:
+        return int(self.ticks().size)
+
+    def range(self, start: Timestamp = None, end: Timestamp = None) -> np.ndarray:
+        """Тики с start <= ts < end (границы None — без ограничения)."""
+        ticks = self.ticks()
+        ts = ticks["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, _to_ts(start), side="left"))
+        hi = ts.size if end is None else int(np.searchsorted(ts, _to_ts(end), side="left"))
+        return ticks[lo:hi]
+
+    def _game_rows(self, game: int) -> np.ndarray:
+        return np.asarray(self._rows_by_game.get(game, ()), dtype=np.int64)
+
+    def game(self, game_id: str, market: Optional[str] = None, side: Optional[str] = None,
+             start: Timestamp = None, end: Timestamp = None) -> np.ndarray:
+        """Тики матча (по возрастанию времени), с фильтрами по рынку/стороне/времени."""
+        code = self._game_index.get(str(game_id))
+        if code is None:
+            return np.zeros(0, dtype=TICK_DTYPE)
+
+        rows = self.ticks()[self._game_rows(code)]
+        mask = np.ones(rows.size, dtype=bool)
+        if market is not None:
+            mask &= rows["market"] == self._market_index.get(market, -1)
+        if side is not None:
+            mask &= rows["side"] == _SIDE_CODE[side]
+        if start is not None:
+            mask &= rows["ts"] >= _to_ts(start)
+        if end is not None:
+            mask &= rows["ts"] < _to_ts(end)
+        return rows[mask]
+
+    def closing(self, game_id: str, market: str, side: str,
+                before: Timestamp = None) -> Optional[Tuple[float, float, float]]:
+        """
+        Последняя котировка рынка до before (по умолчанию — последняя вообще):
+        (ts, line, price) или None. Для CLV: before = время начала матча.
+        """
+        rows = self.game(game_id, market=market, side=side, end=before)
+        if not rows.size:
+            return None
+        last = rows[-1]
+        return float(last["ts"]), float(last["line"]), float(last["price"])
+
+    def to_records(self, ticks: np.ndarray) -> List[Dict[str, Any]]:
+        """Тики в виде словарей с исходными game_id / рынком / стороной."""
+        return [
+            {
+                "ts": float(t["ts"]),
+                "game_id": self.games[int(t["game"])],
+                "market": self.markets[int(t["market"])],
+                "side": SIDES[int(t["side"])],
+                "line": None if np.isnan(t["line"]) else float(t["line"]),
+                "price": float(t["price"]),
+            }
+            for t in ticks
+        ]
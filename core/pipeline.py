@@ -1,9 +1,11 @@
 # core/pipeline.py
 
 from __future__ import annotations
-from typing import List
+from typing import Iterable, List, Set
 
 from core.context import GameContext
+from core.profiling import PipelineProfiler, module_name
+from core.slate import Slate
 
 
 class GameModelPipeline:
@@ -15,12 +17,30 @@ class GameModelPipeline:
 
     - model_modules: модули, которые считают итоговые модели
         (ожидаемая разница, вероятности, симуляции, value и т.д.)
+
+    Модуль может объявить зависимости для инкрементального режима:
+    - INPUTS: ключи фич/выходов, которые он читает
+      (пустой кортеж — зависит только от внешних данных, не от контекста)
+    - OUTPUTS: ключи, которые он пишет
+    Модуль без INPUTS считается зависящим от всего.
+
+    profiler (PipelineProfiler) — замеры времени/памяти по модулям;
+    None — без замеров.
     """
 
     def __init__(self, feature_modules: List[object] | None = None,
-                 model_modules: List[object] | None = None):
+                 model_modules: List[object] | None = None,
+                 profiler: PipelineProfiler | None = None):
         self.feature_modules = feature_modules or []
         self.model_modules = model_modules or []
+        self.profiler = profiler
+
+    def _call(self, module: object, method: str, arg, items: int = 1):
+        profiler = self.profiler
+        if profiler is None:
+            return getattr(module, method)(arg)
+        with profiler.measure(module_name(module), items):
+            return getattr(module, method)(arg)
 
     def run_for_game(self, context: GameContext) -> GameContext:
         """
@@ -30,10 +50,78 @@ class GameModelPipeline:
         # 1. Считаем фичи
         for module in self.feature_modules:
             # каждый модуль должен иметь метод .process(context)
-            module.process(context)
+            self._call(module, "process", context)
 
         # 2. Считаем модельные выводы
         for model in self.model_modules:
-            model.process(context)
+            self._call(model, "process", context)
+
+        return context
+
+    def process_batch(self, contexts: Iterable[GameContext]) -> List[GameContext]:
+        """
+        Прогоняет весь слейт матчей.
+
+        Модули с методом process_batch(slate) считают слейт целиком
+        по столбцам, остальные — как обычно, по одному контексту.
+        Порядок модулей тот же, что и в run_for_game.
+        """
+        slate = Slate(contexts)
+        if not len(slate):
+            return []
+
+        for module in self.feature_modules + self.model_modules:
+            if hasattr(module, "process_batch"):
+                self._call(module, "process_batch", slate, len(slate))
+            else:
+                for context in slate.contexts:
+                    self._call(module, "process", context)
+                # контексты изменились в обход слейта
+                slate.invalidate()
+
+        return slate.contexts
+
+    # -------------------------------------------------------
+    # Инкрементальный режим
+    # -------------------------------------------------------
+
+    def plan_incremental(self, changed: Iterable[str]) -> List[object]:
+        """
+        Какие модули нужно перезапустить, если изменились ключи changed.
+        Изменения распространяются вниз по цепочке через OUTPUTS.
+        """
+        dirty: Set[str] = set(changed)
+        rerun_all = False
+        plan: List[object] = []
+
+        for module in self.feature_modules + self.model_modules:
+            inputs = getattr(module, "INPUTS", None)
+            if not rerun_all and inputs is not None and dirty.isdisjoint(inputs):
+                continue
+
+            plan.append(module)
+            outputs = getattr(module, "OUTPUTS", None)
+            if outputs is None:
+                # неизвестно, что модуль пишет — дальше пересчитываем всё
+                rerun_all = True
+            else:
+                dirty.update(outputs)
+
+        return plan
+
+    def run_incremental(self, context: GameContext, changed: Iterable[str]) -> GameContext:
+        """
+        Пересчитывает уже обработанный контекст после изменения ключей changed.
+
+        Перезапускаются только зависимые модули (например, при новых
+        коэффициентах — только ValueModel поверх закешированных симуляций).
+        Перед запуском старые OUTPUTS модуля удаляются, чтобы не оставалось
+        значений от снятых с линии рынков.
+        """
+        for module in self.plan_incremental(changed):
+            for key in getattr(module, "OUTPUTS", None) or ():
+                context.features.pop(key, None)
+                context.model_outputs.pop(key, None)
+            self._call(module, "process", context)
 
         return context
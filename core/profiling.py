@@ -0,0 +1,204 @@
+# core/profiling.py
+
+from __future__ import annotations
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageStats:
+    """
+    Накопленная статистика одного этапа (модуля пайплайна или секции).
+    - calls: сколько раз этап запускался
+    - items: сколько матчей он обработал (batch-вызов = len(slate))
+    - wall / cpu: суммарное время, сек (cpu — время текущего потока)
+    - alloc_peak: максимальный прирост памяти за один вызов, байт
+      (только при trace_memory)
+    """
+    calls: int = 0
+    items: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    alloc_peak: int = 0
+
+    def merge(self, other: "StageStats"):
+        self.calls += other.calls
+        self.items += other.items
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.alloc_peak = max(self.alloc_peak, other.alloc_peak)
+
+    def to_dict(self, trace_memory: bool) -> Dict[str, Any]:
+        d: Dict[str, Any] = {
+            "calls": self.calls,
+            "items": self.items,
+            "wall_sec": round(self.wall, 6),
+            "cpu_sec": round(self.cpu, 6),
+            "wall_ms_per_item": round(1000 * self.wall / self.items, 4) if self.items else None,
+        }
+        if trace_memory:
+            d["alloc_peak_kb"] = round(self.alloc_peak / 1024, 1)
+        return d
+
+
+class _Frame:
+    __slots__ = ("start_current", "peak")
+
+    def __init__(self, start_current: int):
+        self.start_current = start_current
+        self.peak = start_current
+
+
+class PipelineProfiler:
+    """
+    Сбор времени по модулям пайплайна и по произвольным секциям
+    (загрузка данных, экспорт и т.п.).
+
+    Подключается к GameModelPipeline / DataStore через атрибут profiler;
+    пока он None, пайплайн не делает ничего лишнего (одна проверка
+    на вызов модуля).
+
+    trace_memory=True включает tracemalloc и пишет пик прироста памяти
+    за вызов. Это заметно замедляет прогон, поэтому по умолчанию выключено.
+    Пик памяти корректен при работе в одном потоке: у tracemalloc
+    один общий счётчик пика на процесс.
+
+    Этапы могут быть вложенными (секция "pipeline" содержит модули,
+    модуль — загрузку JSON из DataStore); время внешнего этапа
+    включает время вложенных.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, StageStats] = {}
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    # -------------------------------------------------------
+
+    def _frames(self) -> List[_Frame]:
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    @contextmanager
+    def measure(self, name: str, items: int = 1) -> Iterator[None]:
+        """Замер одного вызова этапа name (items — сколько матчей он обработал)."""
+        frame = None
+        if self.trace_memory:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            frame = _Frame(current)
+            self._frames().append(frame)
+
+        wall0 = time.perf_counter()
+        cpu0 = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.thread_time() - cpu0
+
+            alloc = 0
+            if frame is not None:
+                frames = self._frames()
+                frames.pop()
+                # reset_peak во вложенных этапах сбрасывает общий пик,
+                # поэтому пик внешнего этапа собирается из пиков вложенных
+                frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+                alloc = frame.peak - frame.start_current
+                if frames:
+                    frames[-1].peak = max(frames[-1].peak, frame.peak)
+
+            with self._lock:
+                stats = self.stages.get(name)
+                if stats is None:
+                    stats = self.stages[name] = StageStats()
+                stats.calls += 1
+                stats.items += items
+                stats.wall += wall
+                stats.cpu += cpu
+                stats.alloc_peak = max(stats.alloc_peak, alloc)
+
+    # -------------------------------------------------------
+
+    def merge(self, stages: Dict[str, StageStats]) -> "PipelineProfiler":
+        """Добавляет статистику этапов из другого профайлера (например, из воркера)."""
+        with self._lock:
+            for name, stats in stages.items():
+                self.stages.setdefault(name, StageStats()).merge(stats)
+        return self
+
+    def drain(self) -> Dict[str, StageStats]:
+        """Забирает накопленную статистику и начинает копить заново."""
+        with self._lock:
+            stages, self.stages = self.stages, {}
+        return stages
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+
+    def report(self) -> Dict[str, Any]:
+        """Отчёт прогона: этапы в порядке первого запуска."""
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "elapsed_sec": round(time.perf_counter() - self._started, 6),
+            "trace_memory": self.trace_memory,
+            "stages": {
+                name: stats.to_dict(self.trace_memory)
+                for name, stats in self.stages.items()
+            },
+        }
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def print_summary(self, top: int = 10):
+        """Краткая таблица самых долгих этапов."""
+        ranked = sorted(self.stages.items(), key=lambda item: item[1].wall, reverse=True)
+        for name, stats in ranked[:top]:
+            line = f"  {name:<28} {stats.wall * 1000:9.1f} мс  ({stats.calls} выз., {stats.items} матч.)"
+            if self.trace_memory:
+                line += f"  пик {stats.alloc_peak / 1024:.0f} КБ"
+            print(line)
+
+    # -------------------------------------------------------
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+
+def module_name(module: object) -> str:
+    """Имя этапа для модуля пайплайна."""
+    return type(module).__name__
+
+
+def section(profiler: Optional[PipelineProfiler], name: str, items: int = 1) -> ContextManager:
+    """profiler.measure(...) или пустой контекст, если профайлер не задан."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.measure(name, items)
@@ -0,0 +1,104 @@
+# core/slate.py
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from core.context import GameContext
+
+
+class Slate:
+    """
+    Столбцовое представление набора матчей (struct-of-arrays).
+
+    Числовые фичи и выходы хранятся как массивы длины len(slate),
+    поэтому модули с process_batch считают весь слейт одной
+    векторной операцией вместо цикла по GameContext.
+
+    Команды закодированы индексами: teams — уникальные коды,
+    home_idx / away_idx — позиции в teams. Справочник по командам
+    достаточно построить один раз на teams и раздать индексированием.
+
+    GameContext остаются источником истины: всё, что пишется в слейт,
+    сразу попадает и в контексты (для обычных модулей и экспорта).
+    """
+
+    def __init__(self, contexts: Iterable[GameContext]):
+        self.contexts: List[GameContext] = list(contexts)
+
+        codes = [c.home for c in self.contexts] + [c.away for c in self.contexts]
+        teams, inverse = np.unique(np.array(codes, dtype=object), return_inverse=True)
+        n = len(self.contexts)
+
+        self.teams: List[str] = [str(t) for t in teams]
+        self.home_idx: np.ndarray = inverse[:n].astype(np.intp)
+        self.away_idx: np.ndarray = inverse[n:].astype(np.intp)
+        self.month: np.ndarray = np.fromiter((c.date.month for c in self.contexts),
+                                             dtype=np.int64, count=n)
+
+        # кеш собранных столбцов: ("f" | "o", key) -> массив
+        self._columns: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.contexts)
+
+    # -------------------------------------------------------
+    # Чтение
+    # -------------------------------------------------------
+
+    def _gather(self, source: str, key: str, default: float) -> np.ndarray:
+        cached = self._columns.get((source, key))
+        if cached is not None:
+            return cached
+
+        if source == "f":
+            values = (c.features.get(key, default) for c in self.contexts)
+        else:
+            values = (c.model_outputs.get(key, default) for c in self.contexts)
+        column = np.fromiter(values, dtype=np.float64, count=len(self.contexts))
+
+        self._columns[(source, key)] = column
+        return column
+
+    def feature(self, key: str, default: float = 0.0) -> np.ndarray:
+        """Числовая фича как столбец (default — там, где её нет)."""
+        return self._gather("f", key, default)
+
+    def output(self, key: str, default: float = 0.0) -> np.ndarray:
+        """Числовой выход модели как столбец."""
+        return self._gather("o", key, default)
+
+    def team_columns(self, value: Callable[[str], float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Справочное значение команды -> (столбец хозяев, столбец гостей).
+        value вызывается один раз на команду, а не на матч.
+        """
+        per_team = np.array([value(team) for team in self.teams], dtype=np.float64)
+        return per_team[self.home_idx], per_team[self.away_idx]
+
+    # -------------------------------------------------------
+    # Запись
+    # -------------------------------------------------------
+
+    def _column(self, values: Any) -> np.ndarray:
+        # скаляр растягивается на весь слейт
+        return np.broadcast_to(np.asarray(values, dtype=np.float64), (len(self.contexts),))
+
+    def add_feature(self, key: str, values: Any):
+        """Записывает столбец фичи (или скаляр) в слейт и во все контексты."""
+        column = self._column(values)
+        self._columns[("f", key)] = column
+        for context, value in zip(self.contexts, column.tolist()):
+            context.features[key] = value
+
+    def set_output(self, key: str, values: Any):
+        """Записывает столбец выхода модели (или скаляр) в слейт и во все контексты."""
+        column = self._column(values)
+        self._columns[("o", key)] = column
+        for context, value in zip(self.contexts, column.tolist()):
+            context.model_outputs[key] = value
+
+    def invalidate(self):
+        """Сбрасывает кеш столбцов (контексты менялись в обход слейта)."""
+        self._columns.clear()
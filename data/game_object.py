@@ -13,3 +13,6 @@ class Game:
         self.injuries_home = []
         self.injuries_away = []
         self.odds = {}
+
+        # шок темпа матча (None — из PaceModule по темпу)
+        self.pace_shock_sd = None
@@ -0,0 +1,456 @@
+# engine/backtest.py
+
+from __future__ import annotations
+import bisect
+import json
+import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.context import GameContext
+from core.fatigue_engine import ArenaDistanceMatrix, TeamGame
+from data.game_object import Game
+from engine.game_processor import GameProcessor
+from parsers.odds_parser import parse_odds_entry
+from parsers.standings_parser import load_standings_history
+
+
+# Рынки, по которым делаются ставки в бэктесте:
+#   (рынок, сторона, ключ коэффициента в odds, выход edge, выход kelly,
+#    ключ линии в odds, по какой величине рассчитываем, выигрыш если > или <)
+# Семантика линий совпадает с ValueModel.
+BET_MARKETS = (
+    ("moneyline", "home", "home", "edge_home", "kelly_home", None, "diff", "over"),
+    ("moneyline", "away", "away", "edge_away", "kelly_away", None, "diff", "under"),
+    ("spread", "home", "spread_odds_home", "spread_edge_home", "spread_kelly_home",
+     "spread_line", "diff", "over"),
+    ("spread", "away", "spread_odds_away", "spread_edge_away", "spread_kelly_away",
+     "spread_line", "diff", "under"),
+    ("total", "over", "total_over_odds", "total_edge_over", "total_kelly_over",
+     "total_line", "total", "over"),
+    ("total", "under", "total_under_odds", "total_edge_under", "total_kelly_under",
+     "total_line", "total", "under"),
+    ("home_team_total", "over", "home_team_total_over_odds", "home_team_total_edge_over",
+     "home_team_total_kelly_over", "home_team_total", "home_pts", "over"),
+    ("home_team_total", "under", "home_team_total_under_odds", "home_team_total_edge_under",
+     "home_team_total_kelly_under", "home_team_total", "home_pts", "under"),
+    ("away_team_total", "over", "away_team_total_over_odds", "away_team_total_edge_over",
+     "away_team_total_kelly_over", "away_team_total", "away_pts", "over"),
+    ("away_team_total", "under", "away_team_total_under_odds", "away_team_total_edge_under",
+     "away_team_total_kelly_under", "away_team_total", "away_pts", "under"),
+)
+
+
+@dataclass
+class BacktestConfig:
+    """
+    Настройки бэктеста.
+    - staking: "kelly" — ставка kelly * bankroll, "flat" — фиксированная flat_stake
+      (в обоих случаях ставим только там, где ValueModel дала kelly > 0)
+    - workers: процессы для параллельной обработки дней
+    - days_per_chunk: сколько дней отдаётся воркеру за раз
+      (в памяти одновременно не больше 2 * workers кусков)
+    """
+    staking: str = "kelly"
+    bankroll: float = 100.0
+    flat_stake: float = 1.0
+    calibration_bins: int = 10
+    workers: int = 1
+    days_per_chunk: int = 7
+
+
+# ========================================
+# DATASET
+# ========================================
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def iter_backtest_days(path: str) -> Iterator[Tuple[date, List[Dict[str, Any]]]]:
+    """
+    Потоково читает исторический датасет (JSON Lines, по одной игре в строке,
+    отсортирован по дате) и отдаёт игры по дням.
+
+    Формат строки:
+    {
+      "game_id": "0022300001", "date": "2023-10-24", "home": "DEN", "away": "LAL",
+      "rating_home": 1600, "rating_away": 1550,
+      "injuries_home": [], "injuries_away": ["LeBron James"],
+      "odds": { ...как в raw_odds.json... },
+      "closing_odds": { ...тот же формат, закрытие линии... },
+      "home_pts": 119, "away_pts": 107
+    }
+    """
+    current: Optional[date] = None
+    batch: List[Dict[str, Any]] = []
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            day = _parse_date(record["date"])
+
+            if current is not None and day < current:
+                raise ValueError(f"backtest: dataset must be sorted by date (line {line_no})")
+
+            if day != current and batch:
+                yield current, batch
+                batch = []
+
+            current = day
+            batch.append(record)
+
+    if batch:
+        yield current, batch
+
+
+def load_backtest_schedule(path: str) -> List[TeamGame]:
+    """Расписание сезона из датасета (для таблицы усталости)."""
+    games: List[TeamGame] = []
+    for _, records in iter_backtest_days(path):
+        for r in records:
+            d = _parse_date(r["date"])
+            game_id = str(r["game_id"])
+            games.append(TeamGame(game_id=game_id, team=r["home"], game_date=d, venue=r["home"]))
+            games.append(TeamGame(game_id=game_id, team=r["away"], game_date=d, venue=r["home"]))
+    return games
+
+
+def _record_to_game(record: Dict[str, Any]) -> Game:
+    game = Game(
+        id=str(record["game_id"]),
+        date=_parse_date(record["date"]),
+        home=record["home"],
+        away=record["away"],
+    )
+    game.rating_home = record.get("rating_home", 100)
+    game.rating_away = record.get("rating_away", 100)
+    game.injuries_home = record.get("injuries_home", [])
+    game.injuries_away = record.get("injuries_away", [])
+    game.odds = parse_odds_entry(record.get("odds", {}) or {})
+    return game
+
+
+# ========================================
+# METRICS
+# ========================================
+
+@dataclass
+class BacktestMetrics:
+    """
+    Инкрементальные метрики бэктеста. Хранит только суммы,
+    поэтому память не зависит от длины сезона, а куски, посчитанные
+    в разных процессах, объединяются через merge().
+    """
+    calibration_bins: int = 10
+
+    games: int = 0
+    bets: int = 0
+    wins: int = 0
+    pushes: int = 0
+    staked: float = 0.0
+    pnl: float = 0.0
+
+    clv_sum: float = 0.0
+    clv_count: int = 0
+    clv_positive: int = 0
+
+    calib_n: int = 0
+    brier_sum: float = 0.0
+    log_loss_sum: float = 0.0
+    # [count, sum_p, sum_outcome] по корзинам вероятности
+    bins: List[List[float]] = field(default_factory=list)
+
+    # рынок -> [bets, staked, pnl]
+    by_market: Dict[str, List[float]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.bins:
+            self.bins = [[0, 0.0, 0.0] for _ in range(self.calibration_bins)]
+
+    # -------------------------------------------------------
+
+    def update(self, context: GameContext, record: Dict[str, Any], config: BacktestConfig):
+        """Учитывает одну сыгранную игру."""
+        if "home_pts" not in record or "away_pts" not in record:
+            return
+
+        home_pts = float(record["home_pts"])
+        away_pts = float(record["away_pts"])
+        values = {
+            "diff": home_pts - away_pts,
+            "total": home_pts + away_pts,
+            "home_pts": home_pts,
+            "away_pts": away_pts,
+        }
+
+        self.games += 1
+
+        # ---------- КАЛИБРОВКА (победа хозяев) ----------
+        p_home = context.model_outputs.get("win_prob_home")
+        if isinstance(p_home, (int, float)):
+            y = 1.0 if values["diff"] > 0 else 0.0
+            p = min(max(float(p_home), 1e-9), 1 - 1e-9)
+            self.calib_n += 1
+            self.brier_sum += (p - y) ** 2
+            self.log_loss_sum -= y * math.log(p) + (1 - y) * math.log(1 - p)
+            b = min(int(p * self.calibration_bins), self.calibration_bins - 1)
+            self.bins[b][0] += 1
+            self.bins[b][1] += p
+            self.bins[b][2] += y
+
+        # ---------- СТАВКИ ----------
+        odds = parse_odds_entry(record.get("odds", {}) or {})
+        closing = parse_odds_entry(record.get("closing_odds", {}) or {})
+
+        for market, side, odds_key, _, kelly_key, line_key, value_key, direction in BET_MARKETS:
+            kelly = context.model_outputs.get(kelly_key)
+            price = odds.get(odds_key)
+            if not kelly or kelly <= 0 or not price:
+                continue
+
+            line = 0.0
+            if line_key is not None:
+                if line_key not in odds:
+                    continue
+                line = odds[line_key]
+
+            stake = kelly * config.bankroll if config.staking == "kelly" else config.flat_stake
+
+            value = values[value_key]
+            if value == line:
+                pnl = 0.0
+                self.pushes += 1
+            elif (value > line) == (direction == "over"):
+                pnl = stake * (price - 1)
+                self.wins += 1
+            else:
+                pnl = -stake
+
+            self.bets += 1
+            self.staked += stake
+            self.pnl += pnl
+
+            stats = self.by_market.setdefault(market, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += stake
+            stats[2] += pnl
+
+            # ---------- CLV ----------
+            closing_price = closing.get(odds_key)
+            same_line = line_key is None or closing.get(line_key) == line
+            if closing_price and closing_price > 1.0 and same_line:
+                clv = price / closing_price - 1
+                self.clv_sum += clv
+                self.clv_count += 1
+                if clv > 0:
+                    self.clv_positive += 1
+
+    # -------------------------------------------------------
+
+    def merge(self, other: "BacktestMetrics") -> "BacktestMetrics":
+        for name in ("games", "bets", "wins", "pushes", "staked", "pnl",
+                     "clv_sum", "clv_count", "clv_positive",
+                     "calib_n", "brier_sum", "log_loss_sum"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+        for mine, theirs in zip(self.bins, other.bins):
+            for i in range(3):
+                mine[i] += theirs[i]
+
+        for market, stats in other.by_market.items():
+            mine = self.by_market.setdefault(market, [0, 0.0, 0.0])
+            for i in range(3):
+                mine[i] += stats[i]
+        return self
+
+    # -------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """Итоговый отчёт (JSON-совместимый)."""
+        def ratio(a, b):
+            return a / b if b else None
+
+        calibration = []
+        width = 1.0 / self.calibration_bins
+        for i, (n, sum_p, sum_y) in enumerate(self.bins):
+            if n:
+                calibration.append({
+                    "bin": f"{i * width:.2f}-{(i + 1) * width:.2f}",
+                    "n": int(n),
+                    "mean_p": sum_p / n,
+                    "win_rate": sum_y / n,
+                })
+
+        return {
+            "games": self.games,
+            "bets": self.bets,
+            "wins": self.wins,
+            "pushes": self.pushes,
+            "staked": self.staked,
+            "pnl": self.pnl,
+            "roi": ratio(self.pnl, self.staked),
+            "hit_rate": ratio(self.wins, self.bets - self.pushes),
+            "clv_mean": ratio(self.clv_sum, self.clv_count),
+            "clv_positive_share": ratio(self.clv_positive, self.clv_count),
+            "brier": ratio(self.brier_sum, self.calib_n),
+            "log_loss": ratio(self.log_loss_sum, self.calib_n),
+            "calibration": calibration,
+            "by_market": {
+                market: {
+                    "bets": int(bets),
+                    "staked": staked,
+                    "pnl": pnl,
+                    "roi": ratio(pnl, staked),
+                }
+                for market, (bets, staked, pnl) in sorted(self.by_market.items())
+            },
+        }
+
+
+# ========================================
+# RUNNER
+# ========================================
+
+# (день, игры дня, снимок турнирной таблицы на дату матча; {} — снимка нет)
+DayBatch = Tuple[date, List[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# GameProcessor и настройки внутри процесса-воркера
+_worker_state: Optional[Tuple[GameProcessor, BacktestConfig]] = None
+
+
+def _init_worker(processor: GameProcessor, config: BacktestConfig):
+    global _worker_state
+    _worker_state = (processor, config)
+
+
+def _iter_day_contexts(processor: GameProcessor,
+                       days: Iterable[DayBatch]) -> Iterator[Tuple[GameContext, Dict[str, Any]]]:
+    for _, records, standings in days:
+        if standings is not None:
+            processor.motivation.standings = standings
+        contexts = processor.process_batch([_record_to_game(r) for r in records])
+        yield from zip(contexts, records)
+
+
+def _process_days(processor: GameProcessor, config: BacktestConfig,
+                  days: List[DayBatch]) -> BacktestMetrics:
+    metrics = BacktestMetrics(calibration_bins=config.calibration_bins)
+    for context, record in _iter_day_contexts(processor, days):
+        metrics.update(context, record, config)
+    return metrics
+
+
+def _process_days_in_worker(days: List[DayBatch]) -> BacktestMetrics:
+    processor, config = _worker_state
+    return _process_days(processor, config, days)
+
+
+class BacktestRunner:
+    """
+    Прогон сезона по историческим данным.
+
+    - датасет читается потоково, день за днём;
+    - каждая игра проходит через обычный GameProcessor с рейтингами,
+      травмами и турнирной таблицей на дату матча;
+    - метрики (P&L, CLV, калибровка) копятся инкрементально,
+      контексты матчей не хранятся;
+    - при workers > 1 куски дней считаются в пуле процессов.
+
+    Точка во времени соблюдается для рейтингов, травм, усталости и таблицы.
+    Справочники team_pace / team_xpts / player_impacts берутся из хранилища
+    как есть (текущий сезон): в датасете нет их истории, поэтому для честного
+    прогона прошлых сезонов хранилище нужно подменить снимками тех сезонов.
+    """
+
+    def __init__(self, game_processor: GameProcessor | None = None,
+                 config: BacktestConfig | None = None):
+        self.game_processor = game_processor or GameProcessor()
+        self.cfg = config or BacktestConfig()
+
+    # -------------------------------------------------------
+
+    def _iter_chunks(self, dataset_path: str,
+                     standings_path: Optional[str]) -> Iterator[List[DayBatch]]:
+        history = load_standings_history(standings_path) if standings_path else {}
+        snapshot_dates = sorted(history)
+
+        chunk: List[DayBatch] = []
+        for day, records in iter_backtest_days(dataset_path):
+            # последний снимок таблицы не позже дня матча;
+            # до первого снимка и без --standings таблица пустая: текущая
+            # data/standings.json из хранилища — заглядывание в будущее
+            standings = {}
+            pos = bisect.bisect_right(snapshot_dates, day)
+            if pos:
+                standings = history[snapshot_dates[pos - 1]]
+
+            chunk.append((day, records, standings))
+            if len(chunk) >= self.cfg.days_per_chunk:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    # -------------------------------------------------------
+
+    def run(self, dataset_path: str, standings_path: Optional[str] = None,
+            distances: Optional[ArenaDistanceMatrix] = None) -> BacktestMetrics:
+        # Таблица усталости строится один раз на весь сезон:
+        # она смотрит только назад, поэтому заглядывания в будущее нет.
+        self.game_processor.fatigue.load_games(load_backtest_schedule(dataset_path), distances)
+
+        metrics = BacktestMetrics(calibration_bins=self.cfg.calibration_bins)
+        chunks = self._iter_chunks(dataset_path, standings_path)
+
+        if self.cfg.workers <= 1:
+            try:
+                for chunk in chunks:
+                    metrics.merge(_process_days(self.game_processor, self.cfg, chunk))
+            finally:
+                # возвращаем таблицу из хранилища данных
+                self.game_processor.motivation.standings = None
+            return metrics
+
+        # Ограничиваем число кусков «в полёте», чтобы память не росла
+        # с длиной сезона; результаты сливаем в порядке дат.
+        max_in_flight = 2 * self.cfg.workers
+        pending = deque()
+        with ProcessPoolExecutor(
+            max_workers=self.cfg.workers,
+            initializer=_init_worker,
+            initargs=(self.game_processor, self.cfg),
+        ) as pool:
+            for chunk in chunks:
+                pending.append(pool.submit(_process_days_in_worker, chunk))
+                if len(pending) >= max_in_flight:
+                    metrics.merge(pending.popleft().result())
+            while pending:
+                metrics.merge(pending.popleft().result())
+
+        return metrics
+
+    def iter_contexts(self, dataset_path: str, standings_path: Optional[str] = None,
+                      distances: Optional[ArenaDistanceMatrix] = None,
+                      metrics: Optional[BacktestMetrics] = None) -> Iterator[GameContext]:
+        """
+        Прогон сезона в одном процессе с выдачей контекстов по одному —
+        для потокового экспорта (stream_xlsx). Если передан metrics,
+        он обновляется по ходу, как в run().
+        """
+        self.game_processor.fatigue.load_games(load_backtest_schedule(dataset_path), distances)
+        days = (day for chunk in self._iter_chunks(dataset_path, standings_path) for day in chunk)
+        try:
+            for context, record in _iter_day_contexts(self.game_processor, days):
+                if metrics is not None:
+                    metrics.update(context, record, self.cfg)
+                yield context
+        finally:
+            self.game_processor.motivation.standings = None
@@ -1,10 +1,32 @@
 # engine/day_processor.py
 
 from __future__ import annotations
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from engine.game_processor import GameProcessor
 from core.context import GameContext
+from core.profiling import StageStats
+
+
+# GameProcessor внутри процесса-воркера (создаётся один раз на процесс)
+_worker_processor: GameProcessor | None = None
+
+
+def _init_worker(processor: GameProcessor):
+    global _worker_processor
+    _worker_processor = processor
+    # копия профайлера приезжает с уже накопленными в родителе этапами:
+    # их не отправляем обратно, иначе родитель посчитает их дважды
+    if processor.profiler is not None:
+        processor.profiler.drain()
+
+
+def _process_in_worker(game) -> Tuple[GameContext, Optional[Dict[str, StageStats]]]:
+    context = _worker_processor.process(game)
+    # замеры воркера уходят обратно вместе с результатом
+    profiler = _worker_processor.pipeline.profiler
+    return context, (profiler.drain() if profiler is not None else None)
 
 
 class DayProcessor:
@@ -13,10 +35,25 @@ class DayProcessor:
 
     - На вход: список объектов Game (из run_daily.py)
     - На выход: список GameContext с рассчитанными фичами и моделями
+
+    workers > 1 включает параллельный режим:
+      - backend="process": пул процессов, каждый воркер получает копию
+        настроенного GameProcessor;
+      - backend="thread": пул потоков поверх одного GameProcessor.
+    Поток случайных чисел каждого матча зависит только от
+    (master seed, game_id), поэтому результат побитово совпадает
+    с последовательным режимом при любом backend.
     """
 
-    def __init__(self):
-        self.game_processor = GameProcessor()
+    BACKENDS = ("process", "thread")
+
+    def __init__(self, game_processor: GameProcessor | None = None, workers: int = 1,
+                 backend: str = "process"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"DayProcessor: unknown backend '{backend}'")
+        self.game_processor = game_processor or GameProcessor()
+        self.workers = max(1, int(workers))
+        self.backend = backend
 
     def process_day(self, games: List[object]) -> List[GameContext]:
         """
@@ -28,12 +65,44 @@ class DayProcessor:
             .home
             .away
             (и дополнительные атрибуты: rating_home, injuries, odds)
+
+        Порядок результатов совпадает с порядком games.
         """
-        results: List[GameContext] = []
+        if self.workers == 1 or len(games) <= 1:
+            # последовательно — весь день одним слейтом
+            return self.game_processor.process_batch(games)
+
+        workers = min(self.workers, len(games))
+
+        if self.backend == "thread":
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(self.game_processor.process, games))
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.game_processor,),
+        ) as pool:
+            results = list(pool.map(_process_in_worker, games))
 
-        for game in games:
-            ctx = self.game_processor.process(game)
-            results.append(ctx)
+        profiler = self.game_processor.pipeline.profiler
+        contexts = []
+        for context, stages in results:
+            if profiler is not None and stages:
+                profiler.merge(stages)
+            contexts.append(context)
+        return contexts
 
-        return results
-print("DEBUG RESULT:", result)
+    def reprice_day(self, contexts: List[GameContext],
+                    odds: Dict[str, Dict[str, Any]]) -> List[GameContext]:
+        """
+        Обновление линий в течение дня без пересчёта симуляций.
+
+        odds — {game_id: запись parse_odds_entry}, как возвращает load_odds;
+        матчи без записи остаются как есть.
+        """
+        for context in contexts:
+            entry = odds.get(context.game_id)
+            if entry is not None:
+                self.game_processor.reprice(context, entry)
+        return contexts
@@ -1,7 +1,10 @@
 from __future__ import annotations
+from typing import Any, Dict, Set
 
 from core.context import GameContext
+from core.data_store import DataStore, get_default_store
 from core.pipeline import GameModelPipeline
+from core.profiling import PipelineProfiler
 from core.features.fatigue import FatigueModule
 from core.features.lineup import LineupModule
 from core.features.pace import PaceModule
@@ -9,39 +12,124 @@ from core.features.motivation import MotivationModule
 from core.features.xpts import XPTSModule
 
 from core.model.expected import ExpectedModel
-from core.model.simulation import SimulationModel
+from core.model.simulation import SimulationModel, SimulationConfig, SimulationPrecisionModel
 from core.model.probabilities import ProbabilityModel
 from core.model.value import ValueModel
+from parsers.odds_parser import LADDER_SIDES
+
+
+# Фичи, которые берутся из коэффициентов (всё, что меняется при обновлении линий)
+ODDS_FEATURES = (
+    "odds_home", "odds_away",
+    "spread_line", "spread_odds_home", "spread_odds_away",
+    "total_line", "total_over_odds", "total_under_odds",
+    "home_team_total", "home_team_total_over_odds", "home_team_total_under_odds",
+    "away_team_total", "away_team_total_over_odds", "away_team_total_under_odds",
+) + tuple(LADDER_SIDES)
 
 
 class GameProcessor:
     """
     Создаёт GameContext, добавляет фичи вручную (из объекта Game),
     запускает feature-модули и модельные модули.
+
+    Справочные данные (игроки, темп, таблица, xPTS) берутся из общего
+    DataStore, поэтому новые процессоры не перечитывают JSON.
+
+    profiler — замеры по модулям пайплайна и загрузке справочников
+    (подключается и к пайплайну, и к DataStore). DataStore по умолчанию
+    общий для всех процессоров, поэтому после прогона профайлер нужно
+    отключить: processor.profiler = None.
     """
 
-    def __init__(self):
+    def __init__(self, simulation_config: SimulationConfig | None = None,
+                 store: DataStore | None = None,
+                 profiler: PipelineProfiler | None = None):
+        self.store = store or get_default_store()
         self.fatigue = FatigueModule()
+        self.motivation = MotivationModule(store=self.store)
+
+        simulation = SimulationModel(simulation_config)
+        # при фиксированном числе симуляций точность на линиях считается отдельно,
+        # чтобы сдвиг линии не перезапускал симуляцию
+        precision = [] if simulation.cfg.adaptive else [SimulationPrecisionModel()]
 
         self.pipeline = GameModelPipeline(
             feature_modules=[
                 self.fatigue,
-                LineupModule(),
-                PaceModule(),
-                MotivationModule(),
-                XPTSModule(),
+                LineupModule(store=self.store),
+                PaceModule(store=self.store),
+                self.motivation,
+                XPTSModule(store=self.store),
             ],
             model_modules=[
                 ExpectedModel(),
-                SimulationModel(),
+                simulation,
+                *precision,
                 ProbabilityModel(),
                 ValueModel(),
-            ]
+            ],
         )
+        self.profiler = profiler
+
+    @property
+    def profiler(self) -> PipelineProfiler | None:
+        return self.pipeline.profiler
+
+    @profiler.setter
+    def profiler(self, profiler: PipelineProfiler | None):
+        """Подключает профайлер к пайплайну и DataStore (None — отключает от обоих)."""
+        previous = self.pipeline.profiler
+        self.pipeline.profiler = profiler
+        if profiler is not None:
+            self.store.profiler = profiler
+        elif self.store.profiler is previous:
+            # чужой профайлер хранилища не трогаем
+            self.store.profiler = None
 
     # -------------------------------------------------------
 
-    def process(self, game):
+    @staticmethod
+    def _odds_features(odds: Dict[str, Any]) -> Dict[str, Any]:
+        """Коэффициенты матча (формат parse_odds_entry) -> фичи контекста."""
+        features: Dict[str, Any] = {}
+
+        # Moneyline
+        if "home" in odds:
+            features["odds_home"] = float(odds["home"])
+        if "away" in odds:
+            features["odds_away"] = float(odds["away"])
+
+        # Spread
+        for key in ("spread_line", "spread_odds_home", "spread_odds_away"):
+            if key in odds:
+                features[key] = float(odds[key])
+
+        # Total
+        for key in ("total_line", "total_over_odds", "total_under_odds"):
+            if key in odds:
+                features[key] = float(odds[key])
+
+        # Team totals
+        for key in (
+            "home_team_total",
+            "home_team_total_over_odds",
+            "home_team_total_under_odds",
+            "away_team_total",
+            "away_team_total_over_odds",
+            "away_team_total_under_odds",
+        ):
+            if key in odds:
+                features[key] = float(odds[key])
+
+        # Alt lines: лестницы [{"line": ..., <сторона>: price}, ...]
+        for key in LADDER_SIDES:
+            if key in odds and isinstance(odds[key], list):
+                features[key] = [dict(rung) for rung in odds[key]]
+
+        return features
+
+    def build_context(self, game) -> GameContext:
         """
         game — объект класса Game (data/game_object.py)
         """
@@ -64,41 +152,58 @@ class GameProcessor:
         context.add_feature("injuries_home", game.injuries_home)
         context.add_feature("injuries_away", game.injuries_away)
 
+        pace_shock_sd = getattr(game, "pace_shock_sd", None)
+        if pace_shock_sd is not None:
+            context.add_feature("pace_shock_sd_override", float(pace_shock_sd))
+
         # ---------------------------
         #     ODDS / Lines
         # ---------------------------
         if hasattr(game, "odds") and isinstance(game.odds, dict):
-            odds = game.odds
-
-            # Moneyline
-            if "home" in odds:
-                context.add_feature("odds_home", float(odds["home"]))
-            if "away" in odds:
-                context.add_feature("odds_away", float(odds["away"]))
-
-            # Spread
-            for key in ("spread_line", "spread_odds_home", "spread_odds_away"):
-                if key in odds:
-                    context.add_feature(key, float(odds[key]))
-
-            # Total
-            for key in ("total_line", "total_over_odds", "total_under_odds"):
-                if key in odds:
-                    context.add_feature(key, float(odds[key]))
-
-            # Team totals
-            for key in (
-                "home_team_total",
-                "home_team_total_over_odds",
-                "home_team_total_under_odds",
-                "away_team_total",
-                "away_team_total_over_odds",
-                "away_team_total_under_odds",
-            ):
-                if key in odds:
-                    context.add_feature(key, float(odds[key]))
+            for key, value in self._odds_features(game.odds).items():
+                context.add_feature(key, value)
 
-        # ---------------------------
-        #   Запуск PIPELINE
-        # ---------------------------
-        return self.pipeline.run_for_game(context)
+        return context
+
+    # -------------------------------------------------------
+
+    def process(self, game):
+        """
+        game — объект класса Game (data/game_object.py)
+        """
+        return self.pipeline.run_for_game(self.build_context(game))
+
+    def process_batch(self, games):
+        """
+        Весь слейт за один проход пайплайна (по столбцам).
+        Возвращает контексты в порядке games.
+        """
+        return self.pipeline.process_batch([self.build_context(game) for game in games])
+
+    # -------------------------------------------------------
+
+    def reprice(self, context: GameContext, odds: Dict[str, Any]) -> GameContext:
+        """
+        Новые коэффициенты для уже посчитанного матча.
+
+        odds — запись в формате parse_odds_entry (полный снимок линий матча:
+        рынки, которых нет в odds, считаются снятыми). Пересчитываются только
+        модули, зависящие от изменившихся фич: симуляции берутся из контекста,
+        сдвиг spread_line / total_line пересчитывает и точность mc_se_*
+        (в адаптивном режиме SimulationModel — перезапуском симуляции).
+        """
+        new_features = self._odds_features(odds)
+        changed: Set[str] = set()
+
+        for key in ODDS_FEATURES:
+            if key in new_features:
+                if context.features.get(key) != new_features[key]:
+                    context.add_feature(key, new_features[key])
+                    changed.add(key)
+            elif key in context.features:
+                del context.features[key]
+                changed.add(key)
+
+        if changed:
+            self.pipeline.run_incremental(context, changed)
+        return context
@@ -0,0 +1,369 @@
+# engine/odds_watcher.py
+
+from __future__ import annotations
+import asyncio
+import http.client
+import inspect
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from core.context import GameContext
+from core.model.value import ALT_LADDERS, ValueModel
+from core.odds_history import OddsHistory
+from engine.game_processor import GameProcessor
+from parsers.odds_parser import matchup_key, parse_odds_api_events, parse_odds_entry
+
+
+# Снимок линий: {game_id или matchup_key: запись parse_odds_entry}
+OddsSnapshot = Dict[str, Dict[str, Any]]
+
+
+class OddsSourceError(Exception):
+    """Источник линий ответил ошибкой (HTTP-статус, битый JSON и т.п.)."""
+
+
+@dataclass
+class OddsWatcherConfig:
+    """
+    Настройки опроса линий.
+    - poll_interval: пауза между успешными опросами, сек
+    - backoff_*: экспоненциальная пауза после ошибок (с джиттером ±jitter)
+    """
+    poll_interval: float = 15.0
+    backoff_initial: float = 1.0
+    backoff_factor: float = 2.0
+    backoff_max: float = 120.0
+    jitter: float = 0.1
+
+
+# ========================================
+# SOURCES
+# ========================================
+# Источник — объект с блокирующим fetch() -> OddsSnapshot | None
+# (None — данные не менялись) и close(). Watcher вызывает fetch
+# в отдельном потоке, чтобы не блокировать event loop.
+
+class FileOddsSource:
+    """
+    Локальный файл в формате raw_odds.json (или фикстура для тестов).
+    Файл перечитывается только при смене mtime/размера.
+    """
+
+    def __init__(self, path: str = "data/raw_odds.json"):
+        self.path = path
+        self._signature: Optional[Tuple[int, int]] = None
+
+    def fetch(self) -> Optional[OddsSnapshot]:
+        st = os.stat(self.path)
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return None
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            try:
+                raw = json.load(f)
+            except json.JSONDecodeError as e:
+                # файл могли поймать посреди записи — попробуем в следующий раз
+                raise OddsSourceError(f"FileOddsSource: bad JSON in {self.path}: {e}") from e
+
+        self._signature = signature
+        return {str(game_id): parse_odds_entry(entry) for game_id, entry in raw.items()}
+
+    def close(self):
+        pass
+
+
+class HttpOddsSource:
+    """
+    The Odds API (v4) по HTTPS.
+
+    Одно keep-alive соединение переиспользуется между опросами;
+    после сетевой ошибки оно закрывается и открывается заново
+    на следующей попытке. Ключи снимка — matchup_key(home, away).
+    """
+
+    def __init__(self, api_key: str, regions: str = "us",
+                 markets: Tuple[str, ...] | List[str] = ("h2h", "spreads", "totals"),
+                 sport: str = "basketball_nba", bookmaker: Optional[str] = None,
+                 host: str = "api.the-odds-api.com", timeout: float = 10.0):
+        self.host = host
+        self.timeout = timeout
+        self.bookmaker = bookmaker
+        query = urlencode({
+            "apiKey": api_key,
+            "regions": regions,
+            "markets": ",".join(markets),
+            "oddsFormat": "decimal",
+        })
+        self.path = f"/v4/sports/{sport}/odds?{query}"
+
+        self._conn: Optional[http.client.HTTPSConnection] = None
+        self._etag: Optional[str] = None
+
+        # остаток квоты запросов из заголовков ответа
+        self.requests_remaining: Optional[str] = None
+
+    def _connection(self) -> http.client.HTTPSConnection:
+        if self._conn is None:
+            self._conn = http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        return self._conn
+
+    def fetch(self) -> Optional[OddsSnapshot]:
+        headers = {"Accept": "application/json", "Connection": "keep-alive"}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+
+        conn = self._connection()
+        try:
+            conn.request("GET", self.path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+
+        self.requests_remaining = response.getheader("x-requests-remaining",
+                                                     self.requests_remaining)
+
+        if response.status == 304:
+            return None
+        if response.status != 200:
+            raise OddsSourceError(f"HttpOddsSource: HTTP {response.status} {response.reason}")
+
+        try:
+            events = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise OddsSourceError(f"HttpOddsSource: bad JSON: {e}") from e
+
+        self._etag = response.getheader("ETag")
+        return parse_odds_api_events(events, bookmaker=self.bookmaker)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ========================================
+# DIFF
+# ========================================
+
+def diff_snapshots(previous: OddsSnapshot, current: OddsSnapshot) -> OddsSnapshot:
+    """
+    Матчи, у которых линии появились или изменились.
+    Пропавшие из ленты матчи (обычно уже начались) не возвращаются.
+    """
+    return {
+        key: entry for key, entry in current.items()
+        if previous.get(key) != entry
+    }
+
+
+# ========================================
+# WATCHER
+# ========================================
+
+OnChange = Callable[[OddsSnapshot], Optional[Awaitable[None]]]
+
+
+class OddsWatcher:
+    """
+    Асинхронный опрос источника линий.
+
+    Каждый новый снимок сравнивается с предыдущим, в on_change уходят
+    только изменившиеся матчи. on_change может быть обычной функцией
+    (выполняется в отдельном потоке, как и fetch) или корутиной.
+    После ошибок источника — экспоненциальный backoff, после первого
+    успешного опроса — снова обычный интервал.
+
+    Снимок считается принятым только после успешного on_change: если
+    колбэк упал, ошибка пишется в лог, а те же изменения уходят в
+    on_change на следующем опросе (даже если источник ответит «не менялось»).
+    """
+
+    def __init__(self, source, on_change: OnChange, config: OddsWatcherConfig | None = None):
+        self.source = source
+        self.on_change = on_change
+        self.cfg = config or OddsWatcherConfig()
+
+        self.snapshot: OddsSnapshot = {}
+        # последний полученный, но ещё не принятый снимок
+        self._pending: Optional[OddsSnapshot] = None
+        self.failures = 0
+        self.last_error: Optional[BaseException] = None
+        self._stop = asyncio.Event()
+
+    # -------------------------------------------------------
+
+    async def fetch(self):
+        """Опрашивает источник; новый снимок ждёт apply()."""
+        snapshot = await asyncio.to_thread(self.source.fetch)
+        if snapshot is not None:
+            self._pending = snapshot
+
+    async def apply(self) -> OddsSnapshot:
+        """
+        Передаёт изменения ожидающего снимка в on_change и принимает снимок.
+        Если on_change бросил исключение, снимок остаётся ожидающим.
+        """
+        snapshot = self._pending
+        if snapshot is None:
+            return {}
+
+        changed = diff_snapshots(self.snapshot, snapshot)
+        if changed:
+            result = await asyncio.to_thread(self.on_change, changed)
+            if inspect.isawaitable(result):
+                await result
+
+        self.snapshot = snapshot
+        self._pending = None
+        return changed
+
+    async def poll_once(self) -> OddsSnapshot:
+        """Один опрос: возвращает изменившиеся матчи (и передаёт их в on_change)."""
+        await self.fetch()
+        return await self.apply()
+
+    def _next_delay(self) -> float:
+        if not self.failures:
+            return self.cfg.poll_interval
+        delay = min(self.cfg.backoff_initial * self.cfg.backoff_factor ** (self.failures - 1),
+                    self.cfg.backoff_max)
+        return delay * (1.0 + random.uniform(-self.cfg.jitter, self.cfg.jitter))
+
+    async def run(self):
+        """Опрашивает источник до вызова stop()."""
+        self._stop.clear()
+        try:
+            while not self._stop.is_set():
+                try:
+                    await self.fetch()
+                    self.failures = 0
+                    self.last_error = None
+                except (OSError, http.client.HTTPException, OddsSourceError) as e:
+                    self.failures += 1
+                    self.last_error = e
+                    print(f"⚠ Линии недоступны ({e}), попытка {self.failures}")
+
+                # ошибка колбэка не останавливает опрос: изменения повторятся
+                try:
+                    await self.apply()
+                except Exception as e:
+                    self.last_error = e
+                    print(f"⚠ Ошибка обработки линий ({type(e).__name__}: {e}), "
+                          f"повтор на следующем опросе")
+
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self._next_delay())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await asyncio.to_thread(self.source.close)
+
+    def stop(self):
+        self._stop.set()
+
+
+# ========================================
+# RE-PRICING
+# ========================================
+
+# Выходы ValueModel с edge основных рынков
+EDGE_OUTPUTS = tuple(key for key in ValueModel.OUTPUTS if "edge" in key)
+
+# Лестницы альтернативных линий: (выход, стороны) — edge_<сторона> в каждом ранге
+LADDER_OUTPUTS = tuple((ladder[3], ladder[2]) for ladder in ALT_LADDERS)
+
+
+class LiveRepricer:
+    """
+    Колбэк для OddsWatcher: переоценивает изменившиеся матчи уже
+    посчитанного дня (зависимые модули, см. GameProcessor.reprice)
+    и собирает алерты по рынкам с edge >= min_edge и ненулевым Kelly
+    (основные рынки и ранги лестниц; у рангов в алерте есть line).
+
+    Матчи ищутся по game_id, а для линий из API — по matchup_key.
+    Если задана history, изменения пишутся в неё под game_id матча.
+    """
+
+    def __init__(self, game_processor: GameProcessor, contexts: List[GameContext],
+                 min_edge: float = 3.0,
+                 on_alert: Callable[[List[Dict[str, Any]]], None] | None = None,
+                 history: OddsHistory | None = None):
+        self.game_processor = game_processor
+        self.contexts = contexts
+        self.min_edge = min_edge
+        self.on_alert = on_alert or self.print_alerts
+        self.history = history
+
+        self._index: Dict[str, GameContext] = {}
+        for context in contexts:
+            self._index[str(context.game_id)] = context
+            self._index[matchup_key(context.home, context.away)] = context
+
+    def alerts_for(self, context: GameContext) -> List[Dict[str, Any]]:
+        alerts = []
+        for key in EDGE_OUTPUTS:
+            edge = context.model_outputs.get(key)
+            kelly = context.model_outputs.get(key.replace("edge", "kelly"))
+            if isinstance(edge, (int, float)) and edge >= self.min_edge and kelly:
+                alerts.append({
+                    "game_id": context.game_id,
+                    "matchup": matchup_key(context.home, context.away),
+                    "market": key,
+                    "edge": edge,
+                    "kelly": kelly,
+                })
+
+        for output, sides in LADDER_OUTPUTS:
+            for rung in context.model_outputs.get(output) or ():
+                for side in sides:
+                    edge = rung.get(f"edge_{side}")
+                    kelly = rung.get(f"kelly_{side}")
+                    if isinstance(edge, (int, float)) and edge >= self.min_edge and kelly:
+                        alerts.append({
+                            "game_id": context.game_id,
+                            "matchup": matchup_key(context.home, context.away),
+                            "market": f"{output}_{side}",
+                            "line": rung["line"],
+                            "edge": edge,
+                            "kelly": kelly,
+                        })
+        return alerts
+
+    def __call__(self, changed: OddsSnapshot) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        alerts: List[Dict[str, Any]] = []
+        matched: Dict[str, Dict[str, Any]] = {}
+
+        for key, entry in changed.items():
+            context = self._index.get(key)
+            if context is None:
+                continue
+            self.game_processor.reprice(context, entry)
+            matched[str(context.game_id)] = entry
+            alerts.extend(self.alerts_for(context))
+        repriced = len(matched)
+
+        if self.history is not None and matched:
+            self.history.append_snapshot(matched)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"Линии обновлены: {repriced} матч(ей), {elapsed_ms:.1f} мс")
+
+        if alerts:
+            self.on_alert(alerts)
+        return alerts
+
+    @staticmethod
+    def print_alerts(alerts: List[Dict[str, Any]]):
+        for a in alerts:
+            line = f" {a['line']:+g}" if "line" in a else ""
+            print(f"🔔 {a['matchup']} {a['market']}{line}: "
+                  f"edge {a['edge']:.2f}%, kelly {a['kelly']:.3f}")
@@ -0,0 +1,35 @@
+# parsers/arenas_parser.py
+
+import json
+from typing import Dict
+
+
+def load_arenas(path: str = "data/arenas.json") -> Dict[str, Dict[str, float]]:
+    """
+    Загружает координаты и часовые пояса домашних арен.
+
+    Ожидаемый формат data/arenas.json:
+
+    {
+      "LAL": {"lat": 34.043, "lon": -118.267, "utc_offset": -8},
+      "BOS": {"lat": 42.366, "lon": -71.062, "utc_offset": -5}
+    }
+
+    utc_offset — смещение от UTC в часах (стандартное время).
+    Записи без координат пропускаются.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    result: Dict[str, Dict[str, float]] = {}
+    for team, info in raw.items():
+        try:
+            result[team] = {
+                "lat": float(info["lat"]),
+                "lon": float(info["lon"]),
+                "utc_offset": float(info.get("utc_offset", 0.0)),
+            }
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    return result
@@ -1,5 +1,123 @@
 import json
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# Лестницы альтернативных линий: ключ -> стороны рынка
+LADDER_SIDES: Dict[str, Tuple[str, str]] = {
+    "alt_spreads": ("home", "away"),
+    "alt_totals": ("over", "under"),
+    "alt_home_team_totals": ("over", "under"),
+    "alt_away_team_totals": ("over", "under"),
+}
+
+
+def _spread_threshold(line: float) -> float:
+    """
+    Фора хозяев в записи букмекера -> порог по диффу (home − away), как в ValueModel:
+    фаворит «−4.5» -> 4.5 (хозяева проходят при diff > 4.5), андердог «+3.5» -> −3.5.
+    """
+    return -line + 0.0  # + 0.0: пик'ем без «−0.0»
+
+
+# Лестницы, линии которых — форы хозяев (нормализуются как spread_line)
+_LADDER_LINES: Dict[str, Callable[[float], float]] = {"alt_spreads": _spread_threshold}
+
+
+def _parse_ladder(raw_rungs: Any, sides: Tuple[str, str],
+                  normalize: Callable[[float], float] | None = None) -> List[Dict[str, float]]:
+    """
+    Разбирает лестницу альтернативных линий:
+      [{"line": -6.5, "home": 2.30, "away": 1.60}, ...]
+
+    normalize — перевод линии во внутреннюю конвенцию (для форм — _spread_threshold).
+    Ранги без линии или без единого валидного коэффициента пропускаются.
+    Результат отсортирован по линии.
+    """
+    if not isinstance(raw_rungs, list):
+        return []
+
+    rungs: List[Dict[str, float]] = []
+    for raw in raw_rungs:
+        if not isinstance(raw, dict):
+            continue
+        try:
+            line = float(raw["line"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        rung = {"line": normalize(line) if normalize else line}
+
+        for side in sides:
+            if side in raw:
+                try:
+                    rung[side] = float(raw[side])
+                except (TypeError, ValueError):
+                    continue
+
+        if len(rung) > 1:
+            rungs.append(rung)
+
+    rungs.sort(key=lambda r: r["line"])
+    return rungs
+
+
+def parse_odds_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Разбирает коэффициенты одного матча (формат — см. load_odds).
+    Невалидные значения пропускаются. Форы (spread_line, alt_spreads)
+    переводятся из записи букмекера в порог по диффу — только здесь,
+    поэтому запись нельзя разбирать повторно.
+    """
+    record: Dict[str, Any] = {}
+
+    # Moneyline
+    for key in ("home", "away"):
+        if key in entry:
+            try:
+                record[key] = float(entry[key])
+            except (TypeError, ValueError):
+                continue
+
+    # Spread
+    for key in ("spread_line", "spread_odds_home", "spread_odds_away"):
+        if key in entry:
+            try:
+                record[key] = float(entry[key])
+            except (TypeError, ValueError):
+                continue
+    if "spread_line" in record:
+        record["spread_line"] = _spread_threshold(record["spread_line"])
+
+    # Total
+    for key in ("total_line", "total_over_odds", "total_under_odds"):
+        if key in entry:
+            try:
+                record[key] = float(entry[key])
+            except (TypeError, ValueError):
+                continue
+
+    # Team totals
+    for key in (
+        "home_team_total",
+        "home_team_total_over_odds",
+        "home_team_total_under_odds",
+        "away_team_total",
+        "away_team_total_over_odds",
+        "away_team_total_under_odds",
+    ):
+        if key in entry:
+            try:
+                record[key] = float(entry[key])
+            except (TypeError, ValueError):
+                continue
+
+    # Alt lines
+    for key, sides in LADDER_SIDES.items():
+        if key in entry:
+            ladder = _parse_ladder(entry[key], sides, _LADDER_LINES.get(key))
+            if ladder:
+                record[key] = ladder
+
+    return record
 
 
 def load_odds(path: str = "data/raw_odds.json") -> Dict[str, Dict[str, Any]]:
@@ -27,9 +145,26 @@ def load_odds(path: str = "data/raw_odds.json") -> Dict[str, Dict[str, Any]]:
 
         "away_team_total": 111.5,
         "away_team_total_over_odds": 1.9,
-        "away_team_total_under_odds": 1.9
+        "away_team_total_under_odds": 1.9,
+
+        "alt_spreads": [
+          {"line": -6.5, "home": 2.30, "away": 1.60},
+          {"line": -2.5, "home": 1.65, "away": 2.25}
+        ],
+        "alt_totals": [
+          {"line": 222.5, "over": 1.65, "under": 2.25},
+          {"line": 230.5, "over": 2.25, "under": 1.65}
+        ]
       }
     }
+
+    Фора (spread_line и линии alt_spreads) — фора хозяев, как у букмекера:
+    фаворит-хозяин «−4.5», андердог-хозяин «+3.5». Парсер переводит её
+    в конвенцию ValueModel — порог по диффу (очки хозяев − очки гостей):
+    spread_line = 4.5 и −3.5 соответственно, хозяева проходят при diff > line.
+
+    Лестницы (alt_spreads, alt_totals, alt_home_team_totals,
+    alt_away_team_totals) необязательны и могут содержать любое число рангов.
     """
     with open(path, "r", encoding="utf-8") as f:
         raw = json.load(f)
@@ -37,48 +172,91 @@ def load_odds(path: str = "data/raw_odds.json") -> Dict[str, Dict[str, Any]]:
     odds: Dict[str, Dict[str, Any]] = {}
 
     for game_id, entry in raw.items():
-        record: Dict[str, Any] = {}
+        odds[game_id] = parse_odds_entry(entry)
 
-        # Moneyline
-        for key in ("home", "away"):
-            if key in entry:
-                try:
-                    record[key] = float(entry[key])
-                except (TypeError, ValueError):
-                    continue
+    return odds
 
-        # Spread
-        for key in ("spread_line", "spread_odds_home", "spread_odds_away"):
-            if key in entry:
-                try:
-                    record[key] = float(entry[key])
-                except (TypeError, ValueError):
-                    continue
 
-        # Total
-        for key in ("total_line", "total_over_odds", "total_under_odds"):
-            if key in entry:
-                try:
-                    record[key] = float(entry[key])
-                except (TypeError, ValueError):
-                    continue
+# ========================================
+# THE ODDS API (v4)
+# ========================================
 
-        # Team totals
-        for key in (
-            "home_team_total",
-            "home_team_total_over_odds",
-            "home_team_total_under_odds",
-            "away_team_total",
-            "away_team_total_over_odds",
-            "away_team_total_under_odds",
-        ):
-            if key in entry:
-                try:
-                    record[key] = float(entry[key])
-                except (TypeError, ValueError):
-                    continue
+# Полные названия команд в The Odds API -> коды, как в расписании
+ODDS_API_TEAM_CODES: Dict[str, str] = {
+    "Atlanta Hawks": "ATL", "Boston Celtics": "BOS", "Brooklyn Nets": "BKN",
+    "Charlotte Hornets": "CHA", "Chicago Bulls": "CHI", "Cleveland Cavaliers": "CLE",
+    "Dallas Mavericks": "DAL", "Denver Nuggets": "DEN", "Detroit Pistons": "DET",
+    "Golden State Warriors": "GSW", "Houston Rockets": "HOU", "Indiana Pacers": "IND",
+    "Los Angeles Clippers": "LAC", "Los Angeles Lakers": "LAL", "Memphis Grizzlies": "MEM",
+    "Miami Heat": "MIA", "Milwaukee Bucks": "MIL", "Minnesota Timberwolves": "MIN",
+    "New Orleans Pelicans": "NOP", "New York Knicks": "NYK", "Oklahoma City Thunder": "OKC",
+    "Orlando Magic": "ORL", "Philadelphia 76ers": "PHI", "Phoenix Suns": "PHX",
+    "Portland Trail Blazers": "POR", "Sacramento Kings": "SAC", "San Antonio Spurs": "SAS",
+    "Toronto Raptors": "TOR", "Utah Jazz": "UTA", "Washington Wizards": "WAS",
+}
+
+
+def matchup_key(home: str, away: str) -> str:
+    """Ключ матча, когда game_id неизвестен (линии из внешнего API)."""
+    return f"{away}@{home}"
+
+
+def parse_odds_api_events(events: List[Dict[str, Any]],
+                          bookmaker: str | None = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Разбирает ответ The Odds API (/v4/sports/<sport>/odds, oddsFormat=decimal)
+    в формат load_odds. Ключ — matchup_key(home, away) с кодами команд.
+
+    bookmaker — ключ конторы (например "pinnacle"); None — первая в ответе.
+    Линии как в raw_odds.json (point фор хозяев — запись букмекера),
+    знак форы нормализует parse_odds_entry.
+    """
+    odds: Dict[str, Dict[str, Any]] = {}
+
+    for event in events:
+        home = ODDS_API_TEAM_CODES.get(event.get("home_team", ""))
+        away = ODDS_API_TEAM_CODES.get(event.get("away_team", ""))
+        if home is None or away is None:
+            continue
+
+        books = event.get("bookmakers") or []
+        if bookmaker is not None:
+            books = [b for b in books if b.get("key") == bookmaker]
+        if not books:
+            continue
+
+        entry: Dict[str, Any] = {}
+        for market in books[0].get("markets") or []:
+            key = market.get("key")
+            for outcome in market.get("outcomes") or []:
+                name = outcome.get("name")
+                price = outcome.get("price")
+
+                if key == "h2h":
+                    if name == event["home_team"]:
+                        entry["home"] = price
+                    elif name == event["away_team"]:
+                        entry["away"] = price
+
+                elif key == "spreads":
+                    if name == event["home_team"]:
+                        entry["spread_odds_home"] = price
+                        if outcome.get("point") is not None:
+                            entry["spread_line"] = outcome["point"]
+                    elif name == event["away_team"]:
+                        entry["spread_odds_away"] = price
+
+                elif key == "totals":
+                    if outcome.get("point") is not None:
+                        entry["total_line"] = outcome["point"]
+                    if name == "Over":
+                        entry["total_over_odds"] = price
+                    elif name == "Under":
+                        entry["total_under_odds"] = price
 
-        odds[game_id] = record
+        record = parse_odds_entry(entry)
+        if record:
+            odds[matchup_key(home, away)] = record
 
     return odds
 
@@ -4,6 +4,8 @@ import json
 from datetime import datetime
 from typing import Dict, List
 
+from core.fatigue_engine import TeamGame
+
 
 def load_full_season_schedule(path: str = "data/schedule.json") -> Dict[str, List[datetime.date]]:
     """
@@ -41,6 +43,32 @@ def load_full_season_schedule(path: str = "data/schedule.json") -> Dict[str, Lis
     return schedule
 
 
+def load_season_games(path: str = "data/schedule.json") -> List[TeamGame]:
+    """
+    Загружает полное расписание как список TeamGame для пакетного
+    расчёта усталости (core.fatigue_engine.compute_all).
+
+    Каждая игра даёт две записи — для хозяев и для гостей,
+    venue у обеих — команда-хозяин. Если в записи нет game_id,
+    он строится как "<date>_<away>@<home>".
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        games = json.load(f)
+
+    result: List[TeamGame] = []
+
+    for g in games:
+        d = datetime.strptime(g["date"], "%Y-%m-%d").date()
+        home = g["home"]
+        away = g["away"]
+        game_id = str(g.get("game_id") or f"{g['date']}_{away}@{home}")
+
+        result.append(TeamGame(game_id=game_id, team=home, game_date=d, venue=home))
+        result.append(TeamGame(game_id=game_id, team=away, game_date=d, venue=home))
+
+    return result
+
+
 def load_games_today(path: str = "data/schedule_today.json") -> List[dict]:
     """
     Загружает список игр на сегодня.
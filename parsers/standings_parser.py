@@ -1,6 +1,7 @@
 # parsers/standings_parser.py
 
 import json
+from datetime import date, datetime
 from typing import Dict, Any
 
 
@@ -28,6 +29,13 @@ def load_standings(path: str = "data/standings.json") -> Dict[str, Dict[str, Any
     with open(path, "r", encoding="utf-8") as f:
         raw = json.load(f)
 
+    return parse_standings(raw)
+
+
+def parse_standings(raw: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Нормализует снимок турнирной таблицы (формат — см. load_standings).
+    """
     result: Dict[str, Dict[str, Any]] = {}
     for team, info in raw.items():
         try:
@@ -41,3 +49,24 @@ def load_standings(path: str = "data/standings.json") -> Dict[str, Dict[str, Any
         }
 
     return result
+
+
+def load_standings_history(path: str) -> Dict[date, Dict[str, Dict[str, Any]]]:
+    """
+    Загружает историю турнирной таблицы для бэктеста.
+
+    Формат:
+    {
+      "2024-01-02": { "LAL": {"conference_rank": 8, "wins": 17, "losses": 17}, ... },
+      "2024-01-03": { ... }
+    }
+
+    Снимок с датой D считается актуальным на утро дня D (до игр).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    return {
+        datetime.strptime(day, "%Y-%m-%d").date(): parse_standings(snapshot)
+        for day, snapshot in raw.items()
+    }
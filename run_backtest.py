@@ -0,0 +1,91 @@
+# run_backtest.py
+
+import argparse
+import json
+import os
+import time
+
+import config
+from core.export.export_xlsx import stream_xlsx
+from engine.backtest import BacktestConfig, BacktestMetrics, BacktestRunner
+from engine.game_processor import GameProcessor
+from core.fatigue_engine import ArenaDistanceMatrix
+from core.model.samplers import SAMPLERS
+from core.model.simulation import SimulationConfig
+from parsers.arenas_parser import load_arenas
+
+
+def run_backtest():
+    parser = argparse.ArgumentParser(description="NBA VALUE SYSTEM — бэктест сезона")
+    parser.add_argument("dataset", help="JSON Lines: игры + коэффициенты + результаты")
+    parser.add_argument("--standings", default=None, help="история турнирной таблицы (JSON)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--method", default="sample", choices=("sample", "analytic"))
+    parser.add_argument("--cache-dir", default=config.SIMULATION_CACHE_DIR,
+                        help="кеш симуляций (только вместе с --seed)")
+    parser.add_argument("--staking", default="kelly", choices=("kelly", "flat"))
+    parser.add_argument("--adaptive", action="store_true",
+                        help="адаптивное число симуляций (до --target-se)")
+    parser.add_argument("--target-se", type=float, default=config.SIMULATION_TARGET_SE)
+    parser.add_argument("--sampler", default=config.SIMULATION_SAMPLER, choices=SAMPLERS,
+                        help="сэмплер нормалей (снижение дисперсии)")
+    parser.add_argument("--out", default="outputs/backtest_report.json")
+    parser.add_argument("--xlsx", default=None,
+                        help="потоковая выгрузка всех матчей в XLSX (считается в одном процессе)")
+    parser.add_argument("--xlsx-split", default="date", choices=("date", "market"),
+                        help="лист на дату или на рынок")
+    args = parser.parse_args()
+
+    print("======================================")
+    print("     NBA VALUE SYSTEM — BACKTEST      ")
+    print("======================================")
+
+    processor = GameProcessor(SimulationConfig(
+        seed=args.seed,
+        method=args.method,
+        cache_dir=args.cache_dir,
+        cache_max_mb=config.SIMULATION_CACHE_MAX_MB,
+        adaptive=args.adaptive,
+        target_se=args.target_se,
+        sampler=args.sampler,
+    ))
+    runner = BacktestRunner(processor, BacktestConfig(workers=args.workers, staking=args.staking))
+
+    distances = None
+    try:
+        distances = ArenaDistanceMatrix(load_arenas("data/arenas.json"))
+    except FileNotFoundError:
+        print("⚠ Нет arenas.json — перелёты не учитываются")
+    if not args.standings:
+        print("⚠ Нет --standings — мотивация считается без турнирной таблицы")
+    print("⚠ Темп, xPTS и вклад игроков — из текущих data/*.json, не на дату матча")
+
+    started = time.perf_counter()
+    if args.xlsx:
+        if args.workers > 1:
+            print("⚠ --xlsx: матчи считаются в одном процессе, --workers игнорируется")
+        os.makedirs(os.path.dirname(args.xlsx) or ".", exist_ok=True)
+        metrics = BacktestMetrics(calibration_bins=runner.cfg.calibration_bins)
+        contexts = runner.iter_contexts(args.dataset, args.standings, distances, metrics=metrics)
+        sheets = stream_xlsx(contexts, args.xlsx, split=args.xlsx_split)
+        print(f"XLSX сохранён: {args.xlsx} (листов: {len(sheets)})")
+        report = metrics.summary()
+    else:
+        report = runner.run(args.dataset, args.standings, distances).summary()
+    report["elapsed_sec"] = time.perf_counter() - started
+
+    print(f"Игр: {report['games']}, ставок: {report['bets']}, "
+          f"P&L: {report['pnl']:.2f}, ROI: {report['roi']}, "
+          f"CLV: {report['clv_mean']}, Brier: {report['brier']}")
+    print(f"Время: {report['elapsed_sec']:.2f} с")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"Отчёт сохранён: {args.out}")
+
+
+if __name__ == "__main__":
+    run_backtest()
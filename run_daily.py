@@ -2,41 +2,19 @@
 
 import json
 from datetime import datetime
+import config
 from data.game_object import Game
 from engine.game_processor import GameProcessor
+from engine.day_processor import DayProcessor
+from core.fatigue_engine import ArenaDistanceMatrix
+from core.model.simulation import SimulationConfig
+from core.profiling import PipelineProfiler, section
+from parsers.arenas_parser import load_arenas
 from parsers.odds_parser import load_odds
+from parsers.schedule_parser import load_season_games
 
-def load_schedule_for_fatigue(path="data/schedule.json"):
-    """
-    Формирует словарь:
-    {
-      "LAL": [date1, date2, ...],
-      "GSW": [...],
-      ...
-    }
-    """
-    from datetime import datetime
-    with open(path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
-
-    schedules = {}
-
-    for entry in raw:
-        d = datetime.strptime(entry["date"], "%Y-%m-%d").date()
-        home = entry["home"]
-        away = entry["away"]
-
-        schedules.setdefault(home, []).append(d)
-        schedules.setdefault(away, []).append(d)
-
-    return schedules
-
-
-def run_daily():
-
-    print("======================================")
-    print("     NBA VALUE SYSTEM — DAILY RUN     ")
-    print("======================================")
+def load_games_today():
+    """Матчи дня с рейтингами, травмами и коэффициентами (объекты Game)."""
 
     # --------------------------------------
     # Load schedule_today
@@ -100,42 +78,82 @@ def run_daily():
 
         game_objects.append(game)
 
+    return game_objects
+
+
+def build_processor(profiler=None):
+    """GameProcessor с настройками из config и загруженной усталостью."""
+
     # --------------------------------------
     # GameProcessor
     # --------------------------------------
     print("Создание GameProcessor...")
-    processor = GameProcessor()
+    processor = GameProcessor(SimulationConfig(
+        seed=config.SIMULATION_SEED,
+        method=config.SIMULATION_METHOD,
+        cache_dir=config.SIMULATION_CACHE_DIR,
+        cache_max_mb=config.SIMULATION_CACHE_MAX_MB,
+        adaptive=config.SIMULATION_ADAPTIVE,
+        target_se=config.SIMULATION_TARGET_SE,
+        sampler=config.SIMULATION_SAMPLER,
+    ), profiler=profiler)
 
     # --------------------------------------
     # Load fatigue schedule
     # --------------------------------------
     print("Загрузка расписания для FatigueModule...")
-    schedule_for_fatigue = load_schedule_for_fatigue("data/schedule.json")
-    processor.fatigue.load_schedule(schedule_for_fatigue)
+    distances = None
+    try:
+        distances = ArenaDistanceMatrix(load_arenas("data/arenas.json"))
+    except FileNotFoundError:
+        print("⚠ Нет arenas.json — перелёты не учитываются")
+    processor.fatigue.load_games(load_season_games("data/schedule.json"), distances)
+
+    return processor
+
+
+def run_daily():
+
+    print("======================================")
+    print("     NBA VALUE SYSTEM — DAILY RUN     ")
+    print("======================================")
+
+    profiler = PipelineProfiler(trace_memory=config.PROFILE_MEMORY) if config.PROFILE else None
+
+    with section(profiler, "load_inputs"):
+        game_objects = load_games_today()
+    with section(profiler, "build_processor"):
+        processor = build_processor(profiler)
 
     # --------------------------------------
     # Run models
     # --------------------------------------
     print("Запуск модели...")
 
-    contexts = []
-
-    for game in game_objects:
-        ctx = processor.process(game)
-        contexts.append(ctx)
+    day_processor = DayProcessor(processor, workers=config.WORKERS)
+    with section(profiler, "process_day", len(game_objects)):
+        contexts = day_processor.process_day(game_objects)
 
     # --------------------------------------
     # Exporters (names fixed)
     # --------------------------------------
     print("Сохранение результатов...")
 
-    from core.export.export_json import export_to_json
-    from core.export.export_html import export_to_html
-    from core.export.export_xlsx import export_to_xlsx
-
-    export_to_json(contexts, "outputs/value_today.json")
-    export_to_html(contexts, "outputs/value_today.html")
-    export_to_xlsx(contexts, "outputs/value_today.xlsx")
+    from core.export.export_all import export_all
+
+    with section(profiler, "export", len(contexts)):
+        export_all(contexts, {
+            "json": "outputs/value_today.json",
+            "html": "outputs/value_today.html",
+            "xlsx": "outputs/value_today.xlsx",
+        }, backend=config.EXPORT_BACKEND, profile=config.EXPORT_PROFILE)
+
+    if profiler is not None:
+        # DataStore общий: профайлер не должен оставаться подключённым
+        processor.profiler = None
+        profiler.write("outputs/profile_report.json")
+        print("Профиль прогона (outputs/profile_report.json):")
+        profiler.print_summary()
 
     print("Готово!")
 
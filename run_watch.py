@@ -0,0 +1,67 @@
+# run_watch.py
+
+import asyncio
+
+import config
+from core.odds_history import OddsHistory
+from engine.day_processor import DayProcessor
+from engine.odds_watcher import (
+    FileOddsSource,
+    HttpOddsSource,
+    LiveRepricer,
+    OddsWatcher,
+    OddsWatcherConfig,
+)
+from run_daily import build_processor, load_games_today
+
+
+def build_source():
+    if config.ODDS_SOURCE == "http":
+        return HttpOddsSource(
+            api_key=config.ODDS_API_KEY,
+            regions=config.ODDS_API_REGION,
+            markets=config.ODDS_API_MARKETS,
+            sport=config.ODDS_API_SPORT,
+            bookmaker=config.ODDS_API_BOOKMAKER,
+        )
+    return FileOddsSource(config.ODDS_FILE)
+
+
+async def watch():
+    print("======================================")
+    print("     NBA VALUE SYSTEM — LIVE ODDS     ")
+    print("======================================")
+
+    game_objects = load_games_today()
+    processor = build_processor()
+
+    # Полный прогон один раз: дальше при смене линий симуляции
+    # берутся из контекстов (ValueModel и точность на новой линии)
+    print("Запуск модели...")
+    contexts = DayProcessor(processor, workers=config.WORKERS).process_day(game_objects)
+
+    history = OddsHistory(config.ODDS_HISTORY_DIR) if config.ODDS_HISTORY_DIR else None
+    repricer = LiveRepricer(processor, contexts, min_edge=config.EDGE_ALERT_PERCENT,
+                            history=history)
+    watcher = OddsWatcher(
+        build_source(),
+        repricer,
+        OddsWatcherConfig(
+            poll_interval=config.ODDS_POLL_INTERVAL,
+            backoff_max=config.ODDS_BACKOFF_MAX,
+        ),
+    )
+
+    # Первый опрос сравнивается с пустым снимком: все матчи уходят
+    # в repricer (неизменившиеся линии ничего не пересчитывают),
+    # и по текущим линиям сразу выводятся алерты
+    print(f"Слежение за линиями ({config.ODDS_SOURCE}), интервал {config.ODDS_POLL_INTERVAL} с. "
+          f"Ctrl+C — выход.")
+    await watcher.run()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(watch())
+    except KeyboardInterrupt:
+        print("Остановлено.")
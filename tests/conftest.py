@@ -0,0 +1,46 @@
+# tests/conftest.py
+
+import pytest
+
+from benchmarks.synthetic import write_league
+from core.data_store import DataStore
+from core.fatigue_engine import ArenaDistanceMatrix
+from core.model.simulation import SimulationConfig
+from engine.backtest import _record_to_game, iter_backtest_days, load_backtest_schedule
+from engine.game_processor import GameProcessor
+from parsers.arenas_parser import load_arenas
+from parsers.pace_parser import load_team_pace
+from parsers.players_parser import load_player_impacts
+from parsers.standings_parser import load_standings
+from parsers.xpts_parser import load_team_xpts
+
+
+@pytest.fixture(scope="session")
+def league(tmp_path_factory):
+    """Синтетический вечер (15 матчей): {имя файла: путь}."""
+    return write_league(str(tmp_path_factory.mktemp("league")), "night", seed=7)
+
+
+@pytest.fixture(scope="session")
+def league_games(league):
+    return [_record_to_game(r) for _, records in iter_backtest_days(league["games.jsonl"])
+            for r in records]
+
+
+@pytest.fixture
+def make_processor(league):
+    """Процессор на синтетических справочниках: make_processor(**SimulationConfig)."""
+    def make(**simulation) -> GameProcessor:
+        store = DataStore({
+            "player_impacts": (league["players.json"], load_player_impacts),
+            "team_pace": (league["team_pace.json"], load_team_pace),
+            "standings": (league["standings.json"], load_standings),
+            "team_xpts": (league["team_xpts.json"], load_team_xpts),
+        })
+        simulation.setdefault("seed", 1)
+        simulation.setdefault("num_simulations", 2000)
+        processor = GameProcessor(SimulationConfig(**simulation), store=store)
+        processor.fatigue.load_games(load_backtest_schedule(league["games.jsonl"]),
+                                     ArenaDistanceMatrix(load_arenas(league["arenas.json"])))
+        return processor
+    return make
@@ -0,0 +1,18 @@
+# tests/test_backtest.py
+
+from core.fatigue_engine import ArenaDistanceMatrix
+from engine.backtest import BacktestConfig, BacktestRunner
+from parsers.arenas_parser import load_arenas
+
+
+def _run(make_processor, league, workers):
+    runner = BacktestRunner(make_processor(), BacktestConfig(workers=workers, days_per_chunk=1))
+    distances = ArenaDistanceMatrix(load_arenas(league["arenas.json"]))
+    return runner.run(league["games.jsonl"], league["standings_history.json"], distances).summary()
+
+
+def test_workers_do_not_change_results(make_processor, league):
+    serial = _run(make_processor, league, workers=1)
+    parallel = _run(make_processor, league, workers=3)
+    assert serial["games"] == 15 and serial["bets"]
+    assert parallel == serial
@@ -0,0 +1,23 @@
+# tests/test_batch.py
+
+from core.model.distribution import Distribution
+
+
+def _same(a, b):
+    if isinstance(a, Distribution):
+        return a.histogram()[0] == b.histogram()[0] and (a.histogram()[1] == b.histogram()[1]).all()
+    return a == b
+
+
+def test_process_batch_matches_per_game(make_processor, league_games):
+    single = [make_processor().process(game) for game in league_games]
+    batch = make_processor().process_batch(league_games)
+
+    assert [c.game_id for c in batch] == [c.game_id for c in single]
+    for one, many in zip(single, batch):
+        assert one.features.keys() == many.features.keys()
+        assert one.model_outputs.keys() == many.model_outputs.keys()
+        for key, value in one.features.items():
+            assert _same(value, many.features[key]), key
+        for key, value in one.model_outputs.items():
+            assert _same(value, many.model_outputs[key]), key
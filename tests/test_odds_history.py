@@ -0,0 +1,60 @@
+# tests/test_odds_history.py
+
+from core.odds_history import OddsHistory
+
+
+def _spread(line, price):
+    return [("spread", "home", line, price)]
+
+
+def test_reverted_line_is_recorded(tmp_path):
+    history = OddsHistory(str(tmp_path))
+    assert history.append_quotes("g1", _spread(4.5, 1.91), ts=1.0) == 1
+    assert history.append_quotes("g1", _spread(5.5, 1.91), ts=2.0) == 1
+    assert history.append_quotes("g1", _spread(4.5, 1.91), ts=3.0) == 1
+    assert history.closing("g1", "spread", "home") == (3.0, 4.5, 1.91)
+
+
+def test_unchanged_quote_is_skipped_and_survives_reopen(tmp_path):
+    history = OddsHistory(str(tmp_path))
+    history.append_quotes("g1", _spread(4.5, 1.91), ts=1.0)
+    assert history.append_quotes("g1", _spread(4.5, 1.91), ts=2.0) == 0
+
+    reopened = OddsHistory(str(tmp_path))
+    assert reopened.append_quotes("g1", _spread(4.5, 1.91), ts=3.0) == 0
+    assert reopened.append_quotes("g1", _spread(4.5, 1.95), ts=4.0) == 1
+    assert len(reopened) == 2
+
+
+def test_ladder_rungs_are_separate_series(tmp_path):
+    history = OddsHistory(str(tmp_path))
+    rungs = [("alt_spreads", "home", 2.5, 1.6), ("alt_spreads", "home", 6.5, 2.4)]
+    assert history.append_quotes("g1", rungs, ts=1.0) == 2
+    assert history.append_quotes("g1", rungs, ts=2.0) == 0
+
+
+def test_closing_respects_before_and_game_index(tmp_path):
+    history = OddsHistory(str(tmp_path))
+    history.append_quotes("g1", _spread(4.5, 1.91), ts=1.0)
+    history.append_quotes("g2", _spread(-3.5, 1.87), ts=2.0)
+    history.append_quotes("g1", _spread(5.5, 1.95), ts=3.0)
+
+    assert history.closing("g1", "spread", "home", before=3.0) == (1.0, 4.5, 1.91)
+    assert history.closing("g1", "spread", "home") == (3.0, 5.5, 1.95)
+    assert history.closing("g2", "spread", "home") == (2.0, -3.5, 1.87)
+    assert history.closing("g3", "spread", "home") is None
+    assert OddsHistory(str(tmp_path)).game("g1")["ts"].tolist() == [1.0, 3.0]
+
+
+def test_snapshot_dedupe_and_closing(tmp_path):
+    history = OddsHistory(str(tmp_path))
+    entry = {"home": 1.8, "away": 2.0, "spread_line": 3.5, "spread_odds_home": 1.9,
+             "spread_odds_away": 1.9, "alt_spreads": [{"line": 6.5, "home": 2.4, "away": 1.55}]}
+    assert history.append_snapshot({"g1": entry}, ts=10.0) == 6
+    assert history.append_snapshot({"g1": entry}, ts=20.0) == 0
+
+    moved = dict(entry, home=1.75)
+    assert history.append_snapshot({"g1": moved}, ts=30.0) == 1
+    assert history.closing("g1", "moneyline", "home", before=30.0)[2] == 1.8
+    assert history.closing("g1", "moneyline", "home")[2] == 1.75
+    assert history.closing("g1", "alt_spreads", "away") == (10.0, 6.5, 1.55)
@@ -0,0 +1,40 @@
+# tests/test_odds_parser.py
+
+import json
+
+from parsers.odds_parser import load_odds, parse_odds_api_events
+
+
+def test_load_odds_normalizes_bookmaker_spreads(tmp_path):
+    path = tmp_path / "raw_odds.json"
+    path.write_text(json.dumps({
+        "1": {
+            "spread_line": -4.5, "spread_odds_home": 1.91, "spread_odds_away": 1.91,
+            "alt_spreads": [
+                {"line": -6.5, "home": 2.30, "away": 1.60},
+                {"line": -2.5, "home": 1.65, "away": 2.25},
+                {"line": 0, "home": 1.40, "away": 2.90},
+            ],
+        },
+        "2": {"spread_line": 3.5, "spread_odds_home": 1.87, "spread_odds_away": 1.95},
+    }), encoding="utf-8")
+
+    odds = load_odds(str(path))
+    # фаворит-хозяин −4.5: хозяева проходят при diff > 4.5
+    assert odds["1"]["spread_line"] == 4.5
+    assert odds["2"]["spread_line"] == -3.5
+    assert [(r["line"], r["home"]) for r in odds["1"]["alt_spreads"]] == \
+        [(0.0, 1.40), (2.5, 1.65), (6.5, 2.30)]
+    assert str(odds["1"]["alt_spreads"][0]["line"]) == "0.0"
+
+
+def test_odds_api_spread_matches_file_convention():
+    event = {
+        "home_team": "Boston Celtics",
+        "away_team": "Miami Heat",
+        "bookmakers": [{"key": "book", "markets": [{"key": "spreads", "outcomes": [
+            {"name": "Boston Celtics", "price": 1.91, "point": -4.5},
+            {"name": "Miami Heat", "price": 1.91, "point": 4.5},
+        ]}]}],
+    }
+    assert parse_odds_api_events([event])["MIA@BOS"]["spread_line"] == 4.5
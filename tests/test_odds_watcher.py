@@ -0,0 +1,55 @@
+# tests/test_odds_watcher.py
+
+import asyncio
+from datetime import date
+
+from core.context import GameContext
+from engine.odds_watcher import LiveRepricer, OddsWatcher, OddsWatcherConfig
+
+
+class _Source:
+    """Отдаёт снимки по очереди, дальше — «не менялось»."""
+
+    def __init__(self, *snapshots):
+        self.snapshots = list(snapshots)
+
+    def fetch(self):
+        return self.snapshots.pop(0) if self.snapshots else None
+
+    def close(self):
+        pass
+
+
+def test_failed_callback_keeps_snapshot_and_retries():
+    received = []
+
+    def on_change(changed):
+        received.append(changed)
+        if len(received) == 1:
+            raise RuntimeError("reprice failed")
+
+    snapshot = {"g1": {"home": 1.9, "away": 1.9}}
+    watcher = OddsWatcher(_Source(snapshot), on_change, OddsWatcherConfig(poll_interval=0.0))
+
+    async def run():
+        task = asyncio.create_task(watcher.run())
+        while len(received) < 2:
+            await asyncio.sleep(0.01)
+        watcher.stop()
+        await task
+
+    asyncio.run(run())
+    assert received == [snapshot, snapshot]
+    assert watcher.snapshot == snapshot
+
+
+def test_ladder_rungs_alert():
+    context = GameContext("g1", date(2026, 1, 1), "Home", "Away")
+    context.set_output("alt_spread_ladder", [
+        {"line": -6.5, "edge_home": 5.0, "kelly_home": 0.02, "edge_away": -5.0, "kelly_away": 0.0},
+        {"line": -2.5, "edge_home": 1.0, "kelly_home": 0.01},
+    ])
+    repricer = LiveRepricer(game_processor=None, contexts=[context], min_edge=3.0)
+
+    alerts = repricer.alerts_for(context)
+    assert [(a["market"], a["line"]) for a in alerts] == [("alt_spread_ladder_home", -6.5)]
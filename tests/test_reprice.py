@@ -0,0 +1,89 @@
+# tests/test_reprice.py
+
+import math
+
+from core.model.simulation import SimulationModel, SimulationPrecisionModel
+from core.model.value import ValueModel
+
+
+def _count_calls(processor, cls):
+    return _count_calls_of(next(m for m in processor.pipeline.model_modules if isinstance(m, cls)))
+
+
+def _count_all(processor):
+    modules = processor.pipeline.feature_modules + processor.pipeline.model_modules
+    return {type(m).__name__: _count_calls_of(m) for m in modules}
+
+
+def _count_calls_of(module):
+    calls = []
+    process = module.process
+
+    def counted(context):
+        calls.append(context.game_id)
+        process(context)
+
+    module.process = counted
+    return calls
+
+
+def _moved_spread(game, shift):
+    odds = dict(game.odds)
+    odds["spread_line"] = odds["spread_line"] + shift
+    return odds
+
+
+def test_line_move_keeps_fixed_simulation(make_processor, league_games):
+    processor = make_processor()
+    game = next(g for g in league_games if "spread_line" in g.odds)
+    sim_calls = _count_calls(processor, SimulationModel)
+    precision_calls = _count_calls(processor, SimulationPrecisionModel)
+
+    context = processor.process(game)
+    distribution = context.model_outputs["mc_diff_distribution"]
+    se_before = context.model_outputs["mc_se_cover"]
+
+    odds = _moved_spread(game, 7.0)
+    processor.reprice(context, odds)
+    assert len(sim_calls) == 1
+    assert len(precision_calls) == 2
+    assert context.model_outputs["mc_diff_distribution"] is distribution
+
+    n = context.model_outputs["mc_num_simulations"]
+    p = distribution.prob_over(odds["spread_line"])
+    assert math.isclose(context.model_outputs["mc_se_cover"], math.sqrt(p * (1 - p) / n))
+    assert context.model_outputs["mc_se_cover"] != se_before
+    assert context.model_outputs["mc_prob_se"] >= context.model_outputs["mc_se_cover"]
+
+
+def test_line_move_reruns_adaptive_simulation(make_processor, league_games):
+    processor = make_processor(adaptive=True, batch_size=500, max_simulations=4000)
+    game = next(g for g in league_games if "spread_line" in g.odds)
+    assert not any(isinstance(m, SimulationPrecisionModel)
+                   for m in processor.pipeline.model_modules)
+    sim_calls = _count_calls(processor, SimulationModel)
+
+    context = processor.process(game)
+    processor.reprice(context, _moved_spread(game, 7.0))
+    assert len(sim_calls) == 2
+    assert "mc_se_cover" in context.model_outputs
+
+
+def test_price_change_reruns_only_value_model(make_processor, league_games):
+    processor = make_processor()
+    game = next(g for g in league_games if "spread_line" in g.odds)
+    context = processor.process(game)
+    before = dict(context.model_outputs)
+    calls = _count_all(processor)
+
+    odds = dict(game.odds)
+    odds["spread_odds_home"] = odds["spread_odds_home"] + 0.3
+    processor.reprice(context, odds)
+
+    assert {name: len(c) for name, c in calls.items() if c} == {"ValueModel": 1}
+    fresh = make_processor().process(game)
+    processor.reprice(fresh, odds)
+    for key in ValueModel.OUTPUTS:
+        assert context.model_outputs.get(key) == fresh.model_outputs.get(key)
+    assert context.model_outputs["spread_edge_home"] != before["spread_edge_home"]
+    assert context.model_outputs["mc_diff_distribution"] is before["mc_diff_distribution"]
@@ -0,0 +1,121 @@
+# tests/test_samplers.py
+
+import math
+
+import numpy as np
+import pytest
+
+from core.model.samplers import (GroupHitCounter, HitCounter, ReplicateHitCounter, halton_points,
+                                 make_sampler, norm_ppf, sobol_points)
+
+
+def _phi(x: np.ndarray) -> np.ndarray:
+    return np.array([0.5 * math.erfc(-v / math.sqrt(2.0)) for v in x])
+
+
+# ---- norm_ppf ----
+
+def test_norm_ppf_inverts_normal_cdf():
+    x = np.linspace(-6.0, 6.0, 241)
+    assert np.allclose(norm_ppf(_phi(x)), x, rtol=0, atol=1e-8)
+
+
+def test_norm_ppf_symmetry_and_region_edges():
+    u = np.array([1e-12, 0.02425, 0.02426, 0.3, 0.5])
+    z = norm_ppf(u)
+    assert z[-1] == 0.0
+    assert np.allclose(norm_ppf(1.0 - u), -z, atol=1e-8)
+    assert np.all(np.diff(z) > 0)
+
+
+# ---- Соболь / Холтон ----
+
+_NO_SHIFT = np.zeros((1, 2), dtype=np.uint64)
+
+
+def test_sobol_first_points_match_reference():
+    # эталон — первые 8 точек двумерного Соболя (Joe–Kuo), x / 8
+    reference = {(0, 0), (4, 4), (6, 2), (2, 6), (3, 3), (7, 7), (5, 1), (1, 5)}
+    u = sobol_points(0, 8, _NO_SHIFT)
+    cells = {tuple(int(v) for v in row) for row in np.floor(u * 8)}
+    assert cells == reference
+    # без сдвига точки — середины ячеек 2^-32 вокруг двоичных дробей
+    assert np.allclose(u[:4], [[0, 0], [0.5, 0.5], [0.25, 0.75], [0.75, 0.25]], atol=1e-9)
+
+
+def test_sobol_is_a_0_m_2_net():
+    # каждые 2^m первых точек — ровно по одной в каждой ячейке 2^-a × 2^-(m-a)
+    u = sobol_points(0, 256, _NO_SHIFT)
+    for a in range(9):
+        cells = {(int(x * 2 ** a), int(y * 2 ** (8 - a))) for x, y in u}
+        assert len(cells) == 256
+
+
+def test_sobol_and_halton_continue_across_batches():
+    rng = np.random.default_rng(0)
+    shifts = rng.integers(0, 1 << 32, size=(3, 2), dtype=np.uint64)
+    whole = sobol_points(0, 160, shifts)
+    parts = np.vstack([sobol_points(0, 100, shifts), sobol_points(100, 60, shifts)])
+    assert np.array_equal(whole, parts)
+
+    h_shifts = rng.random(size=(3, 2))
+    whole = halton_points(0, 50, h_shifts)
+    parts = np.vstack([halton_points(0, 20, h_shifts), halton_points(20, 30, h_shifts)])
+    assert np.array_equal(whole, parts)
+
+
+def test_halton_first_points():
+    u = halton_points(0, 4, np.zeros((1, 2)))
+    assert np.allclose(u, [[0.5, 1 / 3], [0.25, 2 / 3], [0.75, 1 / 9], [0.125, 4 / 9]])
+
+
+def test_antithetic_pairs():
+    z = make_sampler("antithetic", np.random.default_rng(1)).draw(10)
+    assert np.array_equal(z[1::2], -z[0::2])
+
+
+# ---- оценки ошибки ----
+
+def _event(z: np.ndarray) -> np.ndarray:
+    # монотонное событие вида «cover»: линейная комбинация нормалей выше линии
+    return (z[:, 0] - 0.6 * z[:, 1] > 0.3).astype(np.float64)
+
+
+def test_hit_counter_binomial_formula():
+    counter = HitCounter()
+    counter.add({"win": np.array([1.0, 0.0, 0.5, 1.0])})
+    counter.add({"win": np.array([0.0, 1.0, 1.0, 0.5])})
+    p = 5.0 / 8.0
+    assert counter.n == 8
+    assert counter.standard_errors()["win"] == pytest.approx(math.sqrt(p * (1 - p) / 8))
+
+
+@pytest.mark.parametrize("kind", ["pseudo", "antithetic", "sobol", "halton"])
+def test_reported_se_matches_empirical_spread(kind):
+    """SE сэмплера ≈ разброс оценки между независимыми прогонами (±30%)."""
+    estimates, reported = [], []
+    for seed in range(300):
+        sampler = make_sampler(kind, np.random.default_rng(seed))
+        counter = sampler.counter()
+        for _ in range(2):  # две пачки, как в адаптивном режиме
+            counter.add({"cover": _event(sampler.draw(1024))})
+        estimates.append(counter.hits["cover"] / counter.n)
+        reported.append(counter.standard_errors()["cover"])
+
+    empirical = np.std(estimates, ddof=1)
+    assert np.mean(reported) == pytest.approx(empirical, rel=0.3)
+
+
+def test_group_and_replicate_counters_layout():
+    values = np.array([1.0, 0.0, 1.0, 1.0, 0.0, 0.0, 1.0, 0.0])
+
+    pairs = GroupHitCounter(group=2)
+    pairs.add({"x": values})
+    means = values.reshape(-1, 2).mean(axis=1)
+    assert pairs.standard_errors()["x"] == pytest.approx(np.std(means, ddof=1) / 2.0)
+
+    copies = ReplicateHitCounter(replicates=2)
+    copies.add({"x": values[:4]})
+    copies.add({"x": values[4:]})
+    by_copy = np.array([values[0::2].mean(), values[1::2].mean()])
+    assert copies.standard_errors()["x"] == pytest.approx(np.std(by_copy, ddof=1) / math.sqrt(2))
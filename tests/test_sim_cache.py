@@ -0,0 +1,90 @@
+# tests/test_sim_cache.py
+
+from datetime import date
+
+import numpy as np
+
+from core.context import GameContext
+from core.model.sim_cache import SimulationCache, decode_histograms, encode_histograms
+from core.model.simulation import SimulationConfig, SimulationModel
+
+
+def _histograms():
+    return {
+        "diff": (-40, np.array([0, 3, 7, 12, 7, 1])),
+        "total": (180, np.array([70000, 5, 1])),  # > uint16 — запись в u4
+        "home_pts": (95, np.array([], dtype=np.int64)),
+    }
+
+
+def test_encode_decode_round_trip():
+    scalars = {"mc_win_prob_home": 0.5425, "mc_num_simulations": 5000.0, "mc_diff_skew": -1e-17}
+    histograms, decoded = decode_histograms(encode_histograms(_histograms(), scalars))
+
+    assert decoded == scalars
+    assert set(histograms) == set(_histograms())
+    for name, (offset, counts) in _histograms().items():
+        assert histograms[name][0] == offset
+        assert np.array_equal(histograms[name][1], counts)
+
+
+def test_decode_rejects_bad_and_truncated_records():
+    raw = encode_histograms(_histograms(), {"x": 1.0})
+    for broken in (b"XXXX" + raw[4:], raw[:-2], raw + b"\0"):
+        try:
+            decode_histograms(broken)
+        except ValueError:
+            continue
+        raise AssertionError("broken record decoded")
+
+
+def test_cache_put_get_and_corrupt_entry(tmp_path):
+    cache = SimulationCache(str(tmp_path))
+    assert cache.get("ab" * 32) is None
+
+    assert cache.put("ab" * 32, _histograms(), {"x": 2.0})
+    histograms, scalars = cache.get("ab" * 32)
+    assert scalars == {"x": 2.0}
+    assert np.array_equal(histograms["diff"][1], _histograms()["diff"][1])
+
+    with open(cache._file("ab" * 32), "r+b") as f:
+        f.truncate(10)
+    assert cache.get("ab" * 32) is None
+
+
+def test_cache_write_error_is_not_fatal(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = SimulationCache(str(blocker))
+    assert not cache.put("cd" * 32, _histograms(), {"x": 1.0})
+    assert not cache.writable and cache.write_error
+
+
+def _simulate(cache_dir):
+    model = SimulationModel(SimulationConfig(seed=5, num_simulations=3000, cache_dir=cache_dir))
+    context = GameContext("g1", date(2026, 1, 1), "A", "B")
+    context.set_output("expected_diff", 3.0)
+    model.process(context)
+    return model, context.model_outputs
+
+
+def test_cache_hit_matches_miss(tmp_path):
+    _, miss = _simulate(str(tmp_path))
+    _, hit = _simulate(str(tmp_path))
+
+    assert set(hit) == set(miss)
+    for key, value in miss.items():
+        if key.endswith("_distribution"):
+            assert value.is_compact and hit[key].is_compact
+            assert value.histogram()[0] == hit[key].histogram()[0]
+            assert np.array_equal(value.histogram()[1], hit[key].histogram()[1])
+        else:
+            assert hit[key] == value
+
+
+def test_unwritable_cache_does_not_stop_simulation(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    model, outputs = _simulate(str(blocker))
+    assert outputs["mc_num_simulations"] == 3000
+    assert not model.cache.writable
@@ -0,0 +1,22 @@
+# tests/test_value.py
+
+import numpy as np
+
+from core.model.value import ValueModel
+
+
+def test_edge_kelly_vector_matches_scalar():
+    model = ValueModel()
+    p = np.array([0.7, 0.7, 0.55, 0.3, 0.505, 0.9, 0.6])
+    odds = np.array([1.0, 0.5, 2.1, 1.8, 2.0, 1.15, 1.9])
+
+    edge, kelly = model._compute_edge_kelly_many(p, odds)
+    for i in range(p.size):
+        e, k = model._compute_edge_kelly(float(p[i]), float(odds[i]))
+        assert np.isclose(edge[i], e)
+        assert np.isclose(kelly[i], k)
+
+
+def test_edge_kelly_vector_missing_odds_is_nan():
+    edge, kelly = ValueModel()._compute_edge_kelly_many(np.array([0.6]), np.array([np.nan]))
+    assert np.isnan(edge[0]) and np.isnan(kelly[0])